@@ -0,0 +1,38 @@
+"""
+Command line entry point.
+
+    python -m liftingcastscraper batch urls.txt [--out DIR] [--full-refresh]
+    python -m liftingcastscraper report <meet url> [--out DIR]
+"""
+
+import argparse
+import asyncio
+import sys
+
+from .main import read_meet_urls, run_batch
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m liftingcastscraper")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    batch = commands.add_parser("batch", help="one report per meet URL listed in a file")
+    batch.add_argument("urls_file", help="text file with one LiftingCast meet URL per line")
+    batch.add_argument("--out", help="output directory (default: <project>/output)")
+    batch.add_argument("--full-refresh", action="store_true", help="ignore the meets' previous snapshots")
+
+    report = commands.add_parser("report", help="report for a single meet URL")
+    report.add_argument("meet_url")
+    report.add_argument("--out", help="output directory (default: <project>/output)")
+    report.add_argument("--full-refresh", action="store_true", help="ignore the meet's previous snapshot")
+
+    args = parser.parse_args(argv)
+    meet_urls = read_meet_urls(args.urls_file) if args.command == "batch" else [args.meet_url]
+    if not meet_urls:
+        parser.error("no meet URLs given")
+    failed = asyncio.run(run_batch(meet_urls, output_dir=args.out, full_refresh=args.full_refresh))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,32 @@
+# src/liftingcastscraper/_lazy.py
+"""
+Lazy re-exports for package __init__ modules (PEP 562).
+
+A package lists what it re-exports and from which submodule; the submodule
+is imported the first time one of its names is used. Importing
+`liftingcastscraper.scraper.liftingcast_api` then no longer pulls in
+playwright, and importing `opl_ipf.cache` no longer pulls in bs4.
+
+    __getattr__, __dir__ = lazy_exports(__name__, {"get_roster": ".liftingcast_api", ...})
+"""
+
+import importlib
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """Return (__getattr__, __dir__) for `package`, resolving `exports` {name: relative module} on demand."""
+    namespace = importlib.import_module(package).__dict__
+
+    def __getattr__(name: str) -> Any:
+        module = exports.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module, package), name)
+        namespace[name] = value  # later lookups skip __getattr__
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(exports))
+
+    return __getattr__, __dir__
@@ -0,0 +1,321 @@
+# src/liftingcastscraper/analytics.py
+"""
+Lifter analytics: bests, recent form, DOTS / IPF GL points and class ranks.
+
+Runs once per report, after the lookups (see `pipeline.iter_people`):
+
+1. The meet rows of every lifter that needs computing go into flat numeric
+   columns in one pass. The columns are stdlib `array`s (total, bodyweight,
+   best lifts, date ordinal, ...), and an offset table marks where each
+   lifter's rows start.
+2. Points are computed column-wise for all rows at once.
+3. Per-lifter reductions (bests, recent window, trend) run over each
+   lifter's contiguous slice of the columns.
+4. Lifters are ranked within their weight class at this meet.
+
+The per-lifter numbers are cached in the lookup cache next to the history
+they came from. The finished `LifterStats` also travels with the person into
+snapshots and responses, so renders and API clients only read it. Stats are
+computed again when the history changes, or on a new day (the recent window
+moves).
+"""
+
+import logging
+import math
+import re
+from array import array
+from dataclasses import replace
+from datetime import date
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from . import config
+from .instrumentation import inc
+from .models import Lifter, LifterStats, MeetResult
+from .opl_ipf.cache import LookupCache, get_lookup_cache
+
+logger = logging.getLogger(__name__)
+
+# current IPF classes; the two sets do not overlap
+FEMALE_CLASSES = frozenset({"43", "47", "52", "57", "63", "69", "76", "84", "84+"})
+MALE_CLASSES = frozenset({"53", "59", "66", "74", "83", "93", "105", "120", "120+"})
+_FEMALE_WORDS = re.compile(r"\b(female|women|woman|girls?|ladies)\b", re.IGNORECASE)
+_MALE_WORDS = re.compile(r"\b(male|men|man|boys?)\b", re.IGNORECASE)
+EQUIPPED = frozenset({"single-ply", "multi-ply", "equipped", "unlimited"})
+
+# ---------- points formulas ----------
+
+# DOTS polynomial coefficients (a, b, c, d, e) and bodyweight clamp
+_DOTS = {
+    "M": ((-0.0000010930, 0.0007391293, -0.1918759221, 24.0900756, -307.75076), 210.0),
+    "F": ((-0.0000010706, 0.0005158568, -0.1126655495, 13.6175032, -57.96288), 150.0),
+}
+# IPF GL (2020) coefficients (A, B, C), by (sex, equipped, bench only)
+_IPF_GL = {
+    ("M", False, False): (1199.72839, 1025.18162, 0.00921),
+    ("M", True, False): (1236.25115, 1449.21864, 0.01644),
+    ("F", False, False): (610.32796, 1045.59282, 0.03048),
+    ("F", True, False): (758.63878, 949.31382, 0.02435),
+    ("M", False, True): (320.98041, 281.40258, 0.01008),
+    ("M", True, True): (381.22073, 733.79378, 0.02398),
+    ("F", False, True): (142.40398, 442.52671, 0.04724),
+    ("F", True, True): (221.82209, 357.00377, 0.02937),
+}
+
+
+def dots(total: float, bodyweight: float, sex: Optional[str]) -> float:
+    """DOTS points, 0.0 when an input is missing."""
+    params = _DOTS.get(sex)
+    if params is None or total <= 0 or bodyweight <= 0:
+        return 0.0
+    (a, b, c, d, e), heaviest = params
+    bw = min(max(bodyweight, 40.0), heaviest)
+    return total * 500.0 / ((((a * bw + b) * bw + c) * bw + d) * bw + e)
+
+
+def ipf_gl(total: float, bodyweight: float, sex: Optional[str], equipped: bool = False, bench_only: bool = False) -> float:
+    """IPF GL (Goodlift) points, 0.0 when an input is missing or below the formula's 35 kg floor."""
+    params = _IPF_GL.get((sex, bool(equipped), bool(bench_only)))
+    if params is None or total <= 0 or bodyweight < 35:
+        return 0.0
+    a, b, c = params
+    return total * 100.0 / (a - b * math.exp(-c * bodyweight))
+
+
+# ---------- row helpers ----------
+
+@lru_cache(maxsize=4096)
+def _day(text: str) -> int:
+    """Date ordinal of an ISO date, 0 when it does not parse (meet dates repeat a lot, hence the cache)."""
+    try:
+        return date.fromisoformat(text[:10]).toordinal()
+    except ValueError:
+        return 0
+
+
+def _attempts(row: MeetResult) -> Tuple[int, int]:
+    """(made, taken) over the lifts that list every attempt; a single value is just the best lift."""
+    made = taken = 0
+    for attempts in (row.squat, row.bench, row.deadlift):
+        if len(attempts) > 1:
+            taken += len(attempts)
+            made += sum(1 for a in attempts if a > 0)
+    return made, taken
+
+
+def _out(number: float, digits: int = 1) -> Optional[float]:
+    return round(number, digits) if number > 0 else None
+
+
+def _class_label(weight_class: Optional[str]) -> str:
+    return (weight_class or "").strip().removesuffix("kg").strip()
+
+
+def infer_sex(divisions: Iterable[Dict[str, Optional[str]]], history: Sequence[MeetResult]) -> Optional[str]:
+    """"F" / "M" from the LiftingCast division name or class, else from the IPF classes lifted in."""
+    for entry in divisions:
+        name = entry.get("division") or ""
+        if _FEMALE_WORDS.search(name):
+            return "F"
+        if _MALE_WORDS.search(name):
+            return "M"
+    classes = [_class_label(entry.get("weight_class")) for entry in divisions]
+    classes += [_class_label(row.weight_class) for row in history]
+    for label in classes:
+        if label in FEMALE_CLASSES:
+            return "F"
+        if label in MALE_CLASSES:
+            return "M"
+    return None
+
+
+# ---------- the columnar pass ----------
+
+class _Columns:
+    """
+    Every meet row of a batch of lifters, one array per field (0 = missing);
+    lifter k owns rows offsets[k]:offsets[k + 1].
+    """
+
+    def __init__(self, histories: Sequence[Tuple[Sequence[MeetResult], Optional[str]]]) -> None:
+        rows = [row for history, _ in histories for row in history]
+        offsets = [0]
+        for history, _ in histories:
+            offsets.append(offsets[-1] + len(history))
+        self.offsets = array("l", offsets)
+
+        self.total = array("d", [row.total or 0.0 for row in rows])
+        self.bodyweight = array("d", [row.bodyweight or 0.0 for row in rows])
+        # best made attempt; failed ones are negative
+        self.squat = array("d", [max(row.squat, default=0.0) for row in rows])
+        self.bench = array("d", [max(row.bench, default=0.0) for row in rows])
+        self.deadlift = array("d", [max(row.deadlift, default=0.0) for row in rows])
+        self.day = array("l", [_day(row.date) for row in rows])
+        self.equipped = array("b", [row.equipment.lower() in EQUIPPED for row in rows])
+        self.bench_only = array("b", [bool(row.bench) and not row.squat and not row.deadlift for row in rows])
+        self.sex = [sex for history, sex in histories for _ in history]
+        attempts = [_attempts(row) for row in rows]
+        self.made = array("l", [made for made, _ in attempts])
+        self.taken = array("l", [taken for _, taken in attempts])
+
+
+def _slope_per_year(days: Sequence[int], totals: Sequence[float]) -> Optional[float]:
+    n = len(days)
+    if n < 2 or len(set(days)) < 2:
+        return None
+    mean_x = sum(days) / n
+    mean_y = sum(totals) / n
+    cov = sum((x - mean_x) * (y - mean_y) for x, y in zip(days, totals))
+    var = sum((x - mean_x) ** 2 for x in days)
+    return cov / var * 365.25
+
+
+def compute_stats(
+    histories: Sequence[Tuple[Sequence[MeetResult], Optional[str]]],
+    today: Optional[date] = None,
+) -> List[LifterStats]:
+    """
+    LifterStats (without class rank) for each (meet history, sex) pair, in
+    one columnar pass over all of their rows.
+    """
+    today = today or date.today()
+    as_of = today.isoformat()
+    cutoff = today.toordinal() - config.ANALYTICS_RECENT_DAYS
+    trend_meets = config.ANALYTICS_TREND_MEETS
+
+    cols = _Columns(histories)
+    total, day = cols.total, cols.day
+
+    # points for every row at once
+    dots_col = array("d", map(dots, total, cols.bodyweight, cols.sex))
+    gl_col = array("d", map(ipf_gl, total, cols.bodyweight, cols.sex, cols.equipped, cols.bench_only))
+
+    out: List[LifterStats] = []
+    for k, (history, sex) in enumerate(histories):
+        lo, hi = cols.offsets[k], cols.offsets[k + 1]
+        if lo == hi:
+            out.append(LifterStats(as_of=as_of, sex=sex))
+            continue
+        latest = max(range(lo, hi), key=day.__getitem__)
+        with_total = [i for i in range(lo, hi) if total[i] > 0]
+        recent = [i for i in with_total if day[i] >= cutoff]
+        if recent:
+            form: Optional[int] = max(recent, key=total.__getitem__)
+        else:  # nothing recent: points for the latest total
+            form = max(with_total, key=day.__getitem__, default=None)
+
+        trend_rows = sorted(
+            (i for i in with_total if day[i] and not cols.bench_only[i]), key=day.__getitem__
+        )[-trend_meets:]
+        trend = _slope_per_year([day[i] for i in trend_rows], [total[i] for i in trend_rows])
+
+        made = sum(cols.made[lo:hi])
+        taken = sum(cols.taken[lo:hi])
+        out.append(LifterStats(
+            as_of=as_of,
+            meets=hi - lo,
+            last_meet=history[latest - lo].date,
+            sex=sex,
+            best_squat=_out(max(cols.squat[lo:hi])),
+            best_bench=_out(max(cols.bench[lo:hi])),
+            best_deadlift=_out(max(cols.deadlift[lo:hi])),
+            best_total=_out(max(total[lo:hi])),
+            recent_total=_out(total[form]) if recent else None,
+            recent_bodyweight=_out(cols.bodyweight[form]) if recent else None,
+            dots=_out(dots_col[form], 2) if form is not None else None,
+            ipf_gl=_out(gl_col[form], 2) if form is not None else None,
+            best_ipf_gl=_out(max(gl_col[lo:hi]), 2),
+            attempts_made=made,
+            attempts_taken=taken,
+            success_rate=round(made / taken, 3) if taken else None,
+            trend_kg_per_year=round(trend, 1) if trend is not None else None,
+        ))
+    return out
+
+
+# ---------- ranking ----------
+
+def rank_classes(people: Sequence[Optional[Lifter]]) -> Dict[Tuple[Optional[str], str], int]:
+    """
+    Rank lifters with stats within their weight class at this meet (the
+    LiftingCast class, else the latest one on OpenIPF): by recent total, then
+    best total. Returns {(sex, class): lifters ranked}.
+    """
+    classes: Dict[Tuple[Optional[str], str], List[Lifter]] = {}
+    for person in people:
+        if person is None or person.analytics is None:
+            continue
+        label = next((_class_label(d.get("weight_class")) for d in person.divisions if d.get("weight_class")), "")
+        if not label and person.opl_summary:
+            latest = max(person.opl_summary, key=lambda row: row.date)
+            label = _class_label(latest.weight_class)
+        if label:
+            classes.setdefault((person.analytics.sex, label), []).append(person)
+
+    for (_, label), members in classes.items():
+        members.sort(key=lambda p: (p.analytics.recent_total or 0, p.analytics.best_total or 0), reverse=True)
+        for rank, person in enumerate(members, 1):
+            person.analytics = replace(person.analytics, weight_class=label, class_rank=rank, class_size=len(members))
+    return {key: len(members) for key, members in classes.items()}
+
+
+# ---------- pipeline stage ----------
+
+def _username(profile_url: str) -> str:
+    return profile_url.rstrip("/").rsplit("/", 1)[-1]
+
+
+def analyze(
+    people: Sequence[Optional[Lifter]],
+    today: Optional[date] = None,
+    cache: Optional[LookupCache] = None,
+) -> int:
+    """
+    Attach LifterStats to every person with a meet history (in place) and
+    rank them by class. Stats still valid from the snapshot or the lookup
+    cache are reused; the rest are computed in one batch. Returns how many
+    were computed.
+
+    Blocking (cache reads and writes hit SQLite, one batch each way); the
+    pipeline runs it in a thread.
+    """
+    today = today or date.today()
+    as_of = today.isoformat()
+    cache = cache or get_lookup_cache()
+
+    cached: Dict[str, LifterStats] = {}
+    if cache is not None:
+        cached = cache.get_stats_many(
+            _username(p.opl_profile) for p in people
+            if p is not None and p.opl_summary and p.analytics is None and p.opl_profile
+        )
+
+    pending: List[Lifter] = []
+    for person in people:
+        if person is None or not person.opl_summary:
+            continue
+        stats = person.analytics
+        if stats is None and person.opl_profile:
+            stats = cached.get(_username(person.opl_profile))
+        if stats is not None and stats.as_of == as_of and stats.meets == len(person.opl_summary):
+            person.analytics = replace(stats, weight_class="", class_rank=None, class_size=0)  # ranked below
+        else:
+            person.analytics = None
+            pending.append(person)
+
+    if pending:
+        histories = [(p.opl_summary, infer_sex(p.divisions, p.opl_summary)) for p in pending]
+        computed: Dict[str, LifterStats] = {}
+        for person, stats in zip(pending, compute_stats(histories, today)):
+            person.analytics = stats
+            if person.opl_profile:
+                computed[_username(person.opl_profile)] = stats
+        if cache is not None:
+            cache.put_stats_many(computed)
+    with_stats = sum(1 for p in people if p is not None and p.analytics is not None)
+    inc("lcs_analytics_lifters_total", value=len(pending), result="computed")
+    inc("lcs_analytics_lifters_total", value=with_stats - len(pending), result="reused")
+
+    classes = rank_classes(people)
+    logger.info("Analytics: %d computed, %d classes ranked", len(pending), len(classes))
+    return len(pending)
@@ -0,0 +1,8 @@
+"""
+Offline benchmarks.
+
+    python -m liftingcastscraper.bench --sizes 10,100,500,2000
+
+runs the pipeline against a local LiftingCast / OpenIPF stand-in
+(bench/standin.py) and reports throughput, latency percentiles and peak RSS.
+"""
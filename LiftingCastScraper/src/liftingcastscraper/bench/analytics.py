@@ -0,0 +1,73 @@
+"""
+Benchmark for the lifter analytics stage.
+
+    python -m liftingcastscraper.bench.analytics --lifters 300 --meets 20
+
+On the synthetic `people` from bench.models, times:
+
+    per lifter   compute_stats called once per lifter (columns rebuilt each time)
+    batch        one compute_stats call over the whole roster (what analyze does)
+    analyze      the pipeline stage cold (compute + cache writes + ranking) and
+                 again on the same people (stats reused, only the ranking runs)
+
+and how many bytes the "analytics" objects add to the encoded report.
+"""
+
+import argparse
+import time
+from datetime import date
+from typing import Any, Callable
+
+from ..analytics import analyze, compute_stats, infer_sex
+from ..models import dumps
+from ..opl_ipf.cache import LookupCache
+from .models import build_records
+
+
+def best_of(rounds: int, run: Callable[[], Any]) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lifters", type=int, default=300)
+    parser.add_argument("--meets", type=int, default=20, help="meet rows per lifter")
+    parser.add_argument("--rounds", type=int, default=5, help="repetitions (best is reported)")
+    args = parser.parse_args(argv)
+
+    people = build_records(args.lifters, args.meets)
+    today = date(2024, 6, 1)  # inside the synthetic careers, so the recent window is populated
+    histories = [(p.opl_summary, infer_sex(p.divisions, p.opl_summary)) for p in people]
+    rows = args.lifters * args.meets
+    print(f"{args.lifters} lifters x {args.meets} meets ({rows} rows)")
+
+    per_lifter = best_of(args.rounds, lambda: [compute_stats([h], today) for h in histories])
+    batch = best_of(args.rounds, lambda: compute_stats(histories, today))
+    assert [compute_stats([h], today)[0] for h in histories] == compute_stats(histories, today)
+    print(f"  per lifter      : {per_lifter * 1000:8.1f} ms  ({per_lifter / rows * 1e6:5.1f} us/row)")
+    print(f"  batch           : {batch * 1000:8.1f} ms  ({batch / rows * 1e6:5.1f} us/row)")
+
+    plain = len(dumps(people))
+
+    def cold() -> None:
+        for person in people:
+            person.analytics = None
+        analyze(people, today, LookupCache())
+
+    cold_s = best_of(args.rounds, cold)
+    warm_s = best_of(args.rounds, lambda: analyze(people, today))
+    print(f"  analyze, cold   : {cold_s * 1000:8.1f} ms")
+    print(f"  analyze, reused : {warm_s * 1000:8.1f} ms")
+
+    with_stats = len(dumps(people))
+    print(f"  report JSON     : {plain / 1e6:.2f} MB -> {with_stats / 1e6:.2f} MB with analytics "
+          f"(+{(with_stats - plain) / args.lifters:.0f} B/lifter)")
+
+
+if __name__ == "__main__":
+    main()
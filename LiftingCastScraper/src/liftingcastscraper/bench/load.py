@@ -0,0 +1,167 @@
+"""
+Load test for the API server's admission control.
+
+    python -m liftingcastscraper.bench.load --requests 50 --max-active 2 --max-queue 10 --browser
+
+Starts the stand-in and a uvicorn server pointed at it, fires `--requests`
+concurrent POST /api/report calls for distinct meets (so single-flight does
+not merge them), and reports how many were served, how many were turned away
+with 503 + Retry-After, latency percentiles, the server's peak RSS (with its
+children) and whether /healthz still answers afterwards.
+
+Only browser roster scrapes are admission-controlled; `--browser` turns off
+the direct data read so every roster goes through Chromium (which must be
+installed). Without it the run shows the unthrottled direct path.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+import aiohttp
+import psutil
+
+from .run import free_port, percentile, standin_server
+
+
+async def _wait_healthy(session: aiohttp.ClientSession, url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            async with session.get(url) as resp:
+                if resp.status == 200:
+                    return
+        except aiohttp.ClientError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up")
+
+
+def _tree_rss(proc: psutil.Process) -> int:
+    total = proc.memory_info().rss
+    for child in proc.children(recursive=True):
+        try:
+            total += child.memory_info().rss
+        except psutil.Error:
+            continue
+    return total
+
+
+async def _watch_rss(pid: int, peak: List[int]) -> None:
+    proc = psutil.Process(pid)
+    while True:
+        try:
+            peak[0] = max(peak[0], _tree_rss(proc))
+        except psutil.Error:
+            return
+        await asyncio.sleep(0.05)
+
+
+async def _report(session: aiohttp.ClientSession, api: str, meet_url: str) -> Dict:
+    started = time.perf_counter()
+    try:
+        async with session.post(f"{api}/api/report", json={"meet_url": meet_url}) as resp:
+            await resp.read()
+            return {
+                "status": resp.status,
+                "seconds": time.perf_counter() - started,
+                "retry_after": resp.headers.get("Retry-After"),
+            }
+    except aiohttp.ClientError as e:
+        return {"status": type(e).__name__, "seconds": time.perf_counter() - started, "retry_after": None}
+
+
+async def run(args: argparse.Namespace) -> Dict:
+    async with standin_server(free_port(), latency_ms=args.latency_ms) as base_url:
+        port = free_port()
+        env = {
+            **os.environ,
+            "LCS_OPENIPF_BASE_URL": base_url,
+            "LCS_LIFTINGCAST_BASE_URL": base_url,
+            "LCS_LIFTINGCAST_DATA_URL": base_url + "/db/{meet_id}/_all_docs?include_docs=true",
+            "LCS_LIFTINGCAST_DIRECT": "0" if args.browser else "1",
+            "LCS_BROWSER_LAUNCH_AT_STARTUP": "0",
+            "LCS_CACHE_ENABLED": "0",
+            "LCS_SNAPSHOT_ENABLED": "0",
+            "LCS_HTTP_CACHE_ENABLED": "0",
+            "LCS_FETCH_RATE_PER_HOST": "1000",
+            "LCS_FETCH_BURST": "1000",
+            "LCS_ADMISSION_MAX_ACTIVE": str(args.max_active),
+            "LCS_ADMISSION_MAX_QUEUE": str(args.max_queue),
+            "LCS_ADMISSION_QUEUE_TIMEOUT": str(args.queue_timeout),
+            "LCS_ADMISSION_RSS_LIMIT_MB": str(args.rss_limit_mb),
+        }
+        server = await asyncio.create_subprocess_exec(
+            sys.executable, "-m", "uvicorn", "liftingcastscraper.server.main:app",
+            "--port", str(port), "--log-level", "warning",
+            env=env, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL,
+        )
+        api = f"http://127.0.0.1:{port}"
+        peak = [0]
+        watcher: Optional[asyncio.Task] = None
+        try:
+            timeout = aiohttp.ClientTimeout(total=args.queue_timeout + 120)
+            connector = aiohttp.TCPConnector(limit=0)
+            async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+                await _wait_healthy(session, f"{api}/healthz")
+                watcher = asyncio.create_task(_watch_rss(server.pid, peak))
+
+                meets = [f"{base_url}/meets/n{args.size + i}/roster" for i in range(args.requests)]
+                started = time.perf_counter()
+                results = await asyncio.gather(*(_report(session, api, url) for url in meets))
+                wall = time.perf_counter() - started
+
+                async with session.get(f"{api}/healthz") as resp:
+                    healthy = resp.status == 200
+                async with session.get(f"{api}/debug/admission") as resp:
+                    admission = await resp.json()
+        finally:
+            if watcher is not None:
+                watcher.cancel()
+            server.terminate()
+            await server.wait()
+
+    statuses = Counter(r["status"] for r in results)
+    served = sorted(r["seconds"] for r in results if r["status"] == 200)
+    retry_after = sorted({r["retry_after"] for r in results if r["retry_after"]})
+    return {
+        "requests": args.requests,
+        "wall_s": wall,
+        "statuses": dict(statuses),
+        "p50_s": percentile(served, 50),
+        "p95_s": percentile(served, 95),
+        "retry_after": retry_after,
+        "peak_rss_mb": peak[0] / (1024 * 1024),
+        "healthy_after": healthy,
+        "admission": admission,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Concurrent /api/report load against a local stand-in.")
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--size", type=int, default=40, help="lifters in the smallest meet (each request gets its own)")
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--max-active", type=int, default=2)
+    parser.add_argument("--max-queue", type=int, default=10)
+    parser.add_argument("--queue-timeout", type=float, default=30.0)
+    parser.add_argument("--rss-limit-mb", type=float, default=1200.0)
+    parser.add_argument("--browser", action="store_true", help="scrape rosters with Chromium (admission-controlled)")
+    args = parser.parse_args(argv)
+
+    result = asyncio.run(run(args))
+    print(f"{result['requests']} concurrent reports in {result['wall_s']:.2f}s")
+    print(f"  status codes : {result['statuses']}")
+    print(f"  served p50/p95 : {result['p50_s']:.2f}s / {result['p95_s']:.2f}s")
+    print(f"  Retry-After  : {result['retry_after']}")
+    print(f"  server peak RSS : {result['peak_rss_mb']:.1f} MB")
+    print(f"  /healthz after  : {'ok' if result['healthy_after'] else 'DOWN'}")
+    print(f"  admission    : {result['admission']}")
+
+
+if __name__ == "__main__":
+    main()
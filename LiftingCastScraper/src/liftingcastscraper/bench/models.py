@@ -0,0 +1,109 @@
+"""
+Memory / encode benchmark for the report records.
+
+    python -m liftingcastscraper.bench.models --lifters 2000 --meets 12
+
+Builds the same synthetic `people` twice - once as the old per-row dicts of
+strings, once as Lifter / MeetResult records - and reports the memory each
+takes (tracemalloc) and how long one JSON encode of the whole report takes
+with json.dumps vs models.dumps.
+"""
+
+import argparse
+import gc
+import json
+import random
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from ..models import Lifter, MeetResult, dumps
+
+CLASSES = ("59", "66", "74", "83", "93", "105", "120", "120+")
+
+
+def _wire_row(rng: random.Random, m: int) -> Dict[str, Any]:
+    """One meet row in the old form: every value a string, lifts as string lists."""
+    lifts = [f"{round(rng.uniform(60, 300) / 2.5) * 2.5}" for _ in range(3)]
+    return {
+        "Place": str(rng.randint(1, 8)),
+        "Fed": "APU",
+        "Date": f"{2024 - m // 3}-{(m % 12) + 1:02d}-01",
+        "Location": "Australia-NSW",
+        "Competition": f"Stand-in Open {m}",
+        "Division": "Open",
+        "Age": str(rng.randint(18, 45)),
+        "Equip": "Raw",
+        "Class": rng.choice(CLASSES),
+        "Weight": f"{rng.uniform(55, 125):.1f}",
+        "Squat": [lifts[0]],
+        "Bench": [lifts[1]],
+        "Deadlift": [lifts[2]],
+        "Total": f"{sum(float(v) for v in lifts):.1f}",
+        "GLP": f"{rng.uniform(50, 100):.2f}",
+    }
+
+
+def build_dicts(lifters: int, meets: int) -> List[Dict[str, Any]]:
+    rng = random.Random(1)
+    return [
+        {
+            "name": f"Lifter {i}",
+            "liftingcast_href": f"https://liftingcast.com/meets/bench/lifter/l{i}/info",
+            "divisions": [],
+            "lookup": "refreshed",
+            "opl_profile": f"https://www.openipf.org/u/lifter{i}",
+            "opl_summary": [_wire_row(rng, m) for m in range(meets)],
+        }
+        for i in range(lifters)
+    ]
+
+
+def build_records(lifters: int, meets: int) -> List[Lifter]:
+    # parsed from freshly built strings, as the scraper would
+    return [Lifter.from_wire(person) for person in build_dicts(lifters, meets)]
+
+
+def measure(build: Callable[[], Any]) -> tuple:
+    gc.collect()
+    tracemalloc.start()
+    data = build()
+    gc.collect()
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return data, current
+
+
+def encode_time(encode: Callable[[Any], Any], data: Any, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        encode(data)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lifters", type=int, default=2000)
+    parser.add_argument("--meets", type=int, default=12, help="meet rows per lifter")
+    parser.add_argument("--rounds", type=int, default=5, help="encode repetitions (best is reported)")
+    args = parser.parse_args(argv)
+
+    dicts, dict_bytes = measure(lambda: build_dicts(args.lifters, args.meets))
+    records, record_bytes = measure(lambda: build_records(args.lifters, args.meets))
+    rows = args.lifters * args.meets
+
+    print(f"{args.lifters} lifters x {args.meets} meets ({rows} rows)")
+    print(f"  dicts of strings : {dict_bytes / 1e6:8.1f} MB  ({dict_bytes / rows:6.0f} B/row)")
+    print(f"  MeetResult       : {record_bytes / 1e6:8.1f} MB  ({record_bytes / rows:6.0f} B/row)")
+
+    old = encode_time(json.dumps, dicts, args.rounds)
+    new = encode_time(dumps, records, args.rounds)
+    print(f"  encode dicts with json.dumps   : {old * 1000:8.1f} ms  ({len(json.dumps(dicts)) / 1e6:.1f} MB)")
+    print(f"  encode records with dumps      : {new * 1000:8.1f} ms  ({len(dumps(records)) / 1e6:.1f} MB)")
+    assert isinstance(records[0].opl_summary[0], MeetResult)
+
+
+if __name__ == "__main__":
+    main()
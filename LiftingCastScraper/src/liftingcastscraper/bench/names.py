@@ -0,0 +1,188 @@
+"""
+Offline benchmark for lifter-to-profile name resolution.
+
+    python -m liftingcastscraper.bench.names --lifters 5000 --meets 3
+
+Builds a synthetic OpenIPF population (usernames follow the OPL rule: the
+ASCII-folded name without separators) and rosters that spell the same
+lifters the way meet directors do - accents, apostrophes, middle names,
+"Jr." - plus lifters with no profile yet. Each roster is resolved three
+ways, counting one request per username tried the way lookup.py tries them
+(top guess fetched, the rest probed alongside it; an exact index match is
+fetched alone):
+
+    legacy      the old lowercase / no-space / dashed guesses
+    heuristic   names.username_candidates only
+    indexed     heuristic + a NameIndex that learns from earlier meets
+                (and, with --seed, starts from the whole population)
+
+No network; nothing here touches openipf.org.
+"""
+
+import argparse
+import random
+import time
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from .. import config
+from ..opl_ipf.names import NameIndex, fold, merge_guesses, username_candidates
+
+FIRST = ("John", "Sarah", "José", "Zoë", "Seán", "Björn", "Anaïs", "Michael", "Chloé", "Lukas",
+         "Émilie", "Mateo", "Noa", "Renée", "Jürgen", "Aiko", "Liam", "Søren", "Maja", "Dmitri")
+MIDDLE = ("Anne", "James", "María", "Lee", "Rose", "Paul")
+LAST = ("Smith", "O'Brien", "García", "Müller", "Nguyen", "Dvořák", "Kowalski", "Håkansson", "D'Angelo",
+        "Łukasz", "Øvrebø", "Peña", "Byrne", "Schröder", "Walsh", "Tanaka", "Kim", "Novák", "Costa", "Reyes")
+SUFFIX_RATE = 0.04
+NO_PROFILE_RATE = 0.25
+
+Resolver = Callable[[str], Tuple[Optional[str], int]]
+
+
+def opl_username(name: str, taken: Set[str]) -> str:
+    base = "".join(ch for ch in fold(name) if ch.isalnum())
+    username, n = base, 1
+    while username in taken:  # OPL disambiguates namesakes with a number
+        n += 1
+        username = f"{base}{n}"
+    taken.add(username)
+    return username
+
+
+def population(count: int, rng: random.Random) -> List[Tuple[str, str]]:
+    """[(opl display name, username)]"""
+    taken: Set[str] = set()
+    people = []
+    for i in range(count):
+        roll = rng.random()
+        if roll < 0.15:
+            name = f"{rng.choice(FIRST)} {rng.choice(LAST)}"  # common namesakes
+        elif roll < 0.25:
+            name = f"{rng.choice(FIRST)} {rng.choice(LAST)}-{rng.choice(LAST)}{_suffix_letters(i)}"
+        else:
+            name = f"{rng.choice(FIRST)} {rng.choice(LAST)}{_suffix_letters(i)}"
+        if rng.random() < SUFFIX_RATE:
+            name += " Jr"
+        people.append((name, opl_username(name, taken)))
+    return people
+
+
+def _suffix_letters(i: int) -> str:
+    # a letter-only surname tail ('smithab') so the population is not all namesakes
+    out = ""
+    while i:
+        i, r = divmod(i, 26)
+        out += chr(ord("a") + r)
+    return out
+
+
+def roster_spelling(name: str, rng: random.Random) -> str:
+    """How a meet director might type an OPL name."""
+    roll = rng.random()
+    if roll < 0.15:
+        first, *rest = name.split(" ")
+        return " ".join([first, rng.choice(MIDDLE), *rest])         # middle name added
+    if roll < 0.30:
+        return name.replace(" Jr", ", Jr.") if name.endswith(" Jr") else name.upper()
+    if roll < 0.45:
+        return "".join(ch for ch in fold(name) if ch.isalnum() or ch in " -")  # accents/apostrophes lost
+    return name
+
+
+def legacy_guesses(name: str) -> List[str]:
+    base = name.lower()
+    no_space = base.replace(" ", "")
+    guesses = [no_space.replace("-", ""), no_space, base.replace(" ", "-")]
+    return list(dict.fromkeys(guesses))
+
+
+def resolver(
+    guesses_for: Callable[[str], List[str]],
+    existing: Dict[str, str],
+    index: Optional[NameIndex] = None,
+) -> Resolver:
+    """Returns resolve(name) -> (username found or None, requests spent)."""
+
+    def resolve(name: str) -> Tuple[Optional[str], int]:
+        guesses = guesses_for(name)
+        confident = False
+        if index is not None:
+            candidates = index.search(name, limit=config.NAME_MATCH_CANDIDATES, min_score=config.NAME_MATCH_MIN_SCORE)
+            guesses, confident = merge_guesses(name, guesses, candidates)
+        guesses = guesses[:config.NAME_MAX_GUESSES]
+
+        requests = 0 if confident else len(guesses)  # probes go out together with the top fetch
+        for guess in guesses:
+            if confident:
+                requests += 1  # a stale confident match falls back one guess at a time
+            if guess in existing:
+                if index is not None:
+                    index.add(guess, existing[guess])  # the profile's own spelling, as lookup.py files it
+                return guess, requests
+        return None, requests
+
+    return resolve
+
+
+def run_meets(resolve: Resolver, meets: List[List[Tuple[str, Optional[str]]]]) -> Dict[str, float]:
+    found = wrong = requests = total = 0
+    started = time.perf_counter()
+    for roster in meets:
+        for spelled, truth in roster:
+            username, spent = resolve(spelled)
+            total += 1
+            requests += spent
+            if username is not None and username == truth:
+                found += 1
+            elif username is not None:
+                wrong += 1
+    with_profile = sum(1 for roster in meets for _, truth in roster if truth)
+    return {
+        "hit_rate": found / max(with_profile, 1),
+        "wrong": wrong,
+        "requests_per_lifter": requests / max(total, 1),
+        "ms": (time.perf_counter() - started) * 1000,
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lifters", type=int, default=5000, help="OpenIPF population size")
+    parser.add_argument("--roster", type=int, default=300, help="lifters per meet")
+    parser.add_argument("--meets", type=int, default=3, help="meets resolved in a row (the index learns)")
+    parser.add_argument("--seed", action="store_true", help="start the index from the whole population")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(7)
+    people = population(args.lifters, rng)
+    existing = {username: name for name, username in people}
+    regulars = rng.sample(people, args.roster)  # the same club lifters turn up at every meet
+
+    meets = []
+    for _ in range(args.meets):
+        roster: List[Tuple[str, Optional[str]]] = []
+        for name, username in regulars:
+            if rng.random() < NO_PROFILE_RATE:
+                roster.append((f"{rng.choice(FIRST)} Newcomer{_suffix_letters(rng.randrange(1, 10**6))}", None))
+            else:
+                roster.append((roster_spelling(name, rng), username))
+        meets.append(roster)
+
+    index = NameIndex()
+    if args.seed:
+        index.add_many(((u, n) for n, u in people), source="bulk")
+
+    results = {
+        "legacy": run_meets(resolver(legacy_guesses, existing), meets),
+        "heuristic": run_meets(resolver(username_candidates, existing), meets),
+        "indexed": run_meets(resolver(username_candidates, existing, index), meets),
+    }
+    print(f"{args.meets} meets x {args.roster} lifters, population {args.lifters}"
+          f"{' (index seeded)' if args.seed else ''}")
+    for label, r in results.items():
+        print(f"  {label:<10} hit rate {r['hit_rate']:6.1%}   wrong {r['wrong']:4d}   "
+              f"requests/lifter {r['requests_per_lifter']:.2f}   ({r['ms']:.0f} ms)")
+    print(f"  index: {index.stats()}")
+
+
+if __name__ == "__main__":
+    main()
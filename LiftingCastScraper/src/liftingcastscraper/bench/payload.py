@@ -0,0 +1,81 @@
+"""
+Report payload size / encode-time benchmark.
+
+    python -m liftingcastscraper.bench.payload --sizes 50,300,1000 --meets 12
+
+For synthetic rosters (bench.models, with analytics attached) it encodes the
+report `people` the ways /api/report can send them, and reports for each:
+raw JSON bytes, bytes after gzip and brotli (when installed) at the server's
+settings, and the time to shape + serialize + compress (best of --rounds).
+
+    full          default: every person, full history, one dict per row
+    columns       encoding=columns, same content
+    last 3        history_limit=3
+    last 3, cols  history_limit=3 + encoding=columns
+    popup         the fields / history_fields the extension asks for
+    bests only    fields=name, opl_profile, analytics
+"""
+
+import argparse
+import time
+from datetime import date
+from typing import Callable, Dict, List, Optional
+
+from ..analytics import analyze
+from ..models import dumps
+from ..opl_ipf.cache import LookupCache
+from ..server.compression import available_encodings, compress
+from ..server.encoding import Projection, encode_people
+from .models import build_records
+
+POPUP_FIELDS = ["name", "liftingcast_href", "opl_profile", "opl_summary", "analytics"]
+POPUP_HISTORY_FIELDS = ["Competition", "Date", "Class", "Weight", "Total", "GLP", "Squat", "Bench", "Deadlift"]
+
+VARIANTS: Dict[str, Projection] = {
+    "full": Projection.parse(),
+    "columns": Projection.parse(encoding="columns"),
+    "last 3": Projection.parse(history_limit=3),
+    "last 3, cols": Projection.parse(history_limit=3, encoding="columns"),
+    "popup": Projection.parse(POPUP_FIELDS, history_fields=POPUP_HISTORY_FIELDS),
+    "bests only": Projection.parse(["name", "opl_profile", "analytics"]),
+}
+
+
+def best_of(rounds: int, run: Callable[[], object]) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="50,300,1000", help="comma-separated roster sizes")
+    parser.add_argument("--meets", type=int, default=12, help="meet rows per lifter")
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    encodings = available_encodings()
+    header = f"{'lifters':>7}  {'variant':<13} {'JSON':>9}" + "".join(f" {e:>9}" for e in encodings)
+    print(header + "".join(f" {'ms ' + e:>9}" for e in encodings))
+    for size in (int(s) for s in args.sizes.split(",")):
+        people = build_records(size, args.meets)
+        analyze(people, date(2024, 6, 1), LookupCache())
+        for label, projection in VARIANTS.items():
+            raw = dumps(encode_people(people, projection))
+            sizes = [len(compress(raw, encoding)) for encoding in encodings]
+            times = [
+                best_of(args.rounds, lambda: compress(dumps(encode_people(people, projection)), encoding))
+                for encoding in encodings
+            ]
+            print(
+                f"{size:>7}  {label:<13} {len(raw) / 1024:>7.0f}kB"
+                + "".join(f" {n / 1024:>7.0f}kB" for n in sizes)
+                + "".join(f" {t * 1000:>9.1f}" for t in times)
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+Pipeline benchmark against the local stand-in.
+
+    python -m liftingcastscraper.bench --sizes 10,100,500,2000 --latency-ms 80
+    python -m liftingcastscraper.bench --lookups-only      # roster handed in, time OpenIPF lookups only
+    python -m liftingcastscraper.bench --browser           # roster via Chromium instead of the data API
+    python -m liftingcastscraper.bench --with-cache --repeat 3   # repeat runs reuse the meet snapshot
+
+For each roster size it reports wall time, throughput (lifters/s), p50/p95
+time-to-result per lifter (from the start of the run) and peak RSS of this
+process plus its children (Playwright driver, Chromium, parse workers).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import sys
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional, Tuple
+
+import aiohttp
+import psutil
+
+from .. import config
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@asynccontextmanager
+async def standin_server(port: int, **options):
+    """Run bench/standin.py in a subprocess so its memory is not counted as ours."""
+    args = [sys.executable, "-m", "liftingcastscraper.bench.standin", "--port", str(port)]
+    for key, value in options.items():
+        args += [f"--{key.replace('_', '-')}", str(value)]
+
+    proc = await asyncio.create_subprocess_exec(*args)
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        async with aiohttp.ClientSession() as session:
+            for _ in range(100):
+                try:
+                    async with session.get(f"{base_url}/healthz") as resp:
+                        if resp.status == 200:
+                            break
+                except aiohttp.ClientError:
+                    await asyncio.sleep(0.1)
+            else:
+                raise RuntimeError("stand-in server did not start")
+        yield base_url
+    finally:
+        proc.terminate()
+        await proc.wait()
+
+
+class PeakRSS:
+    """Sample RSS of this process and its children (minus the stand-in) until stopped."""
+
+    def __init__(self, interval: float = 0.025) -> None:
+        self.interval = interval
+        self.peak = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def sample(self) -> int:
+        me = psutil.Process()
+        total = me.memory_info().rss
+        for child in me.children(recursive=True):
+            try:
+                if "liftingcastscraper.bench.standin" not in " ".join(child.cmdline()):
+                    total += child.memory_info().rss
+            except psutil.Error:
+                continue
+        return total
+
+    async def _run(self) -> None:
+        while True:
+            self.peak = max(self.peak, self.sample())
+            await asyncio.sleep(self.interval)
+
+    def __enter__(self) -> "PeakRSS":
+        self.peak = self.sample()
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._task.cancel()
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[int(pct) - 1]
+
+
+async def fetch_roster(base_url: str, size: int) -> List[Tuple[str, str]]:
+    """Roster straight from the stand-in's JSON, for --lookups-only runs."""
+    async with aiohttp.ClientSession() as session:
+        async with session.get(f"{base_url}/meets/n{size}/roster.json") as resp:
+            lifters = await resp.json()
+    return [(f"{l['number']} - {l['name']}", f"/meets/n{size}/lifter/{l['id']}") for l in lifters]
+
+
+async def run_size(base_url: str, size: int, lookups_only: bool, run_no: int = 1) -> Dict[str, float]:
+    from ..pipeline import iter_people
+
+    meet_url = f"{base_url}/meets/n{size}/roster"
+    roster = await fetch_roster(base_url, size) if lookups_only else None
+
+    latencies: List[float] = []
+    found = 0
+    with PeakRSS() as rss:
+        start = time.perf_counter()
+        async for event in iter_people(meet_url, roster=roster):
+            if event["type"] == "lifter":
+                latencies.append(time.perf_counter() - start)
+                found += event["person"].opl_profile is not None
+        wall = time.perf_counter() - start
+
+    return {
+        "size": size,
+        "run": run_no,
+        "wall_s": round(wall, 3),
+        "lifters_per_s": round(size / wall, 1) if wall else 0.0,
+        "p50_s": round(percentile(latencies, 50), 3),
+        "p95_s": round(percentile(latencies, 95), 3),
+        "found": found,
+        "peak_rss_mb": round(rss.peak / (1024 * 1024), 1),
+    }
+
+
+async def run(args: argparse.Namespace) -> List[Dict[str, float]]:
+    from ..http_client import start_http_client, stop_http_client
+    from ..opl_ipf.scheduler import configure_fetch_scheduler
+
+    port = args.port or free_port()
+    options = {
+        "latency_ms": args.latency_ms,
+        "not_found_ratio": args.not_found_ratio,
+        "career_length": args.career_length,
+        "render_chunk": args.render_chunk,
+    }
+    async with standin_server(port, **options) as base_url:
+        # point the pipeline at the stand-in; the lookup cache and meet snapshots would hide repeat work
+        config.OPENIPF_BASE_URL = base_url
+        config.LIFTINGCAST_BASE_URL = base_url
+        config.CACHE_ENABLED = args.with_cache
+        config.SNAPSHOT_ENABLED = args.with_cache
+        config.HTTP_CACHE_ENABLED = args.with_cache
+        config.LIFTINGCAST_DATA_URL = base_url + "/db/{meet_id}/_all_docs?include_docs=true"
+        config.LIFTINGCAST_DIRECT = not args.browser
+
+        # like the server: one keep-alive client across every run
+        client = await start_http_client()
+        results = []
+        for size in args.sizes:
+            for run_no in range(1, args.repeat + 1):
+                configure_fetch_scheduler(
+                    max_concurrency=args.concurrency, rate_per_host=args.rate, burst=args.rate
+                )
+                result = await run_size(base_url, size, args.lookups_only, run_no)
+                results.append(result)
+                print(
+                    f"{result['size']:>6} lifters  run {run_no}  {result['wall_s']:>8.2f}s  "
+                    f"{result['lifters_per_s']:>8.1f}/s  p50 {result['p50_s']:>7.2f}s  "
+                    f"p95 {result['p95_s']:>7.2f}s  found {result['found']:>5}  "
+                    f"peak RSS {result['peak_rss_mb']:>7.1f} MB",
+                    flush=True,
+                )
+        print(f"HTTP client: {client.metrics()}", flush=True)
+        await stop_http_client()
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline against a local stand-in.")
+    parser.add_argument("--sizes", default="10,50,200,1000,2000",
+                        type=lambda s: [int(x) for x in s.split(",")], help="comma-separated roster sizes")
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--not-found-ratio", type=float, default=0.3)
+    parser.add_argument("--career-length", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=config.FETCH_MAX_CONCURRENCY)
+    parser.add_argument("--rate", type=float, default=1000.0, help="per-host requests/s (the live default is far lower)")
+    parser.add_argument("--lookups-only", action="store_true", help="skip loading the roster")
+    parser.add_argument("--browser", action="store_true", help="scrape the roster with Chromium")
+    parser.add_argument("--render-chunk", type=int, default=0, help="stand-in roster rows rendered at a time (0 = all)")
+    parser.add_argument("--with-cache", action="store_true", help="keep the lookup/HTTP caches and meet snapshots enabled")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per roster size")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--json", help="also write results to this file")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(run(args))
+    if args.json:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json)), exist_ok=True)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
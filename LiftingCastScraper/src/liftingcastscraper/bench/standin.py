@@ -0,0 +1,236 @@
+"""
+Local stand-in for LiftingCast and OpenIPF, for offline benchmarks.
+
+    python -m liftingcastscraper.bench.standin --port 8765 --latency-ms 80 --not-found-ratio 0.3
+
+Serves:
+    GET /meets/n<N>/roster   - SPA-style page: an empty shell whose script fetches
+                               /meets/n<N>/roster.json and renders N lifter anchors
+                               under a division heading (--render-chunk rows at a time)
+    GET /meets/n<N>/roster.json
+    GET /db/n<N>/_all_docs   - the same roster as CouchDB documents, like the
+                               LiftingCast data endpoint (LCS_LIFTINGCAST_DATA_URL)
+    GET /u/<username>        - profile page with a career of --career-length meets,
+                               or 404 for roughly --not-found-ratio of usernames;
+                               sends an ETag and answers If-None-Match with 304
+    GET /healthz
+
+Everything is deterministic (seeded by username) so runs are comparable.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+from typing import List
+
+from aiohttp import web
+
+FIRST_NAMES = (
+    "Alex", "Sam", "Jordan", "Taylor", "Casey", "Morgan", "Riley", "Jamie",
+    "Avery", "Quinn", "Harper", "Rowan", "Elliot", "Sasha", "Robin", "Drew",
+)
+LAST_NAMES = (
+    "Smith", "Nguyen", "Brown", "Wilson", "Taylor", "Martin", "Lee", "Walker",
+    "Hall", "Young", "King", "Wright", "Scott", "Green", "Baker", "Adams",
+)
+CLASSES = ("59", "66", "74", "83", "93", "105", "120", "120+", "57", "63", "69", "76")
+
+ROSTER_SHELL = """<!doctype html>
+<html><head><meta charset="utf-8"><title>Stand-in roster</title></head>
+<body><div id="root">Loading…</div>
+<script>
+  setTimeout(async () => {{
+    const lifters = await (await fetch("roster.json")).json();
+    const root = document.getElementById("root");
+    root.innerHTML = "<h3>Open</h3>";
+    const list = root.appendChild(document.createElement("div"));
+    // like a lazily rendered list: {render_chunk} rows per frame (0 = all at once)
+    const chunk = {render_chunk} || lifters.length;
+    let next = 0;
+    const render = () => {{
+      for (const l of lifters.slice(next, next + chunk)) {{
+        const a = document.createElement("a");
+        a.href = `/meets/{meet_id}/lifter/${{l.id}}`;
+        a.textContent = `${{l.number}} - ${{l.name}}`;
+        list.appendChild(a);
+      }}
+      next += chunk;
+      if (next < lifters.length) setTimeout(render, {render_delay_ms});
+    }};
+    render();
+  }}, {render_delay_ms});
+</script></body></html>"""
+
+PROFILE_HEADER = (
+    "Place", "Fed", "Date", "Location", "Competition", "Division", "Age",
+    "Equip", "Class", "Weight", "Squat", "Bench", "Deadlift", "Total", "GLP",
+)
+
+
+def _alpha(n: int) -> str:
+    """0 -> '', 1 -> 'a', 2 -> 'b', ... keeps synthetic names unique but letter-only."""
+    out = ""
+    while n:
+        n, rem = divmod(n - 1, 26)
+        out = chr(ord("a") + rem) + out
+    return out
+
+
+def lifter_name(i: int) -> str:
+    first = FIRST_NAMES[i % len(FIRST_NAMES)]
+    last = LAST_NAMES[(i // len(FIRST_NAMES)) % len(LAST_NAMES)]
+    suffix = _alpha(i // (len(FIRST_NAMES) * len(LAST_NAMES)))
+    return f"{first} {last}{suffix}"
+
+
+def roster(size: int) -> List[dict]:
+    return [{"id": f"l{i}", "number": 100 + i, "name": lifter_name(i)} for i in range(size)]
+
+
+def meet_docs(size: int) -> dict:
+    """CouchDB _all_docs?include_docs=true shape: one division doc plus one doc per lifter."""
+    division = {
+        "_id": "d-open",
+        "name": "Open",
+        "weightClasses": [{"_id": f"wc-{c}", "name": c} for c in CLASSES],
+    }
+    docs = [division]
+    for i, lifter in enumerate(roster(size)):
+        docs.append({
+            "_id": lifter["id"],
+            "name": lifter["name"],
+            "lot": lifter["number"],
+            "divisions": [{"divisionId": "d-open", "weightClassId": f"wc-{CLASSES[i % len(CLASSES)]}"}],
+        })
+    return {"total_rows": len(docs), "rows": [{"id": d["_id"], "key": d["_id"], "doc": d} for d in docs]}
+
+
+def _rng(username: str) -> random.Random:
+    return random.Random(int(hashlib.md5(username.encode()).hexdigest(), 16))
+
+
+def profile_html(username: str, career_length: int) -> str:
+    rng = _rng(username)
+    cls = rng.choice(CLASSES)
+    rows = []
+    for m in range(career_length):
+        squat = [round(rng.uniform(100, 250) / 2.5) * 2.5 for _ in range(3)]
+        bench = [round(rng.uniform(60, 170) / 2.5) * 2.5 for _ in range(3)]
+        dead = [round(rng.uniform(120, 300) / 2.5) * 2.5 for _ in range(3)]
+        total = max(squat) + max(bench) + max(dead)
+        cells = [
+            f"<td>{rng.randint(1, 8)}</td>",
+            "<td>APU</td>",
+            f"<td>{2024 - m // 3}-{(m % 12) + 1:02d}-01</td>",
+            "<td>Australia-NSW</td>",
+            f"<td><a href='/m/{m}'>Stand-in Open {m}</a></td>",
+            "<td>Open</td>",
+            f"<td>{rng.randint(18, 45)}</td>",
+            "<td>Raw</td>",
+            f"<td>{cls}</td>",
+            f"<td>{rng.uniform(55, 125):.1f}</td>",
+            # one cell per lift (the best attempt), like the real profile table
+            f'<td class="squat">{max(squat)}</td>',
+            f'<td class="bench">{max(bench)}</td>',
+            f'<td class="deadlift">{max(dead)}</td>',
+            f"<td>{total}</td>",
+            f"<td>{rng.uniform(50, 100):.2f}</td>",
+        ]
+        rows.append("<tr>" + "".join(cells) + "</tr>")
+
+    header = "".join(f"<th>{h}</th>" for h in PROFILE_HEADER)
+    return (
+        "<!doctype html><html><body>"
+        f"<h1>{username}</h1>"
+        "<table><tr><th>Best</th></tr><tr><td>-</td></tr></table>"
+        f"<table><thead><tr>{header}</tr></thead><tbody>{''.join(rows)}</tbody></table>"
+        "</body></html>"
+    )
+
+
+def make_app(
+    latency_ms: float = 50.0,
+    jitter_ms: float = 20.0,
+    not_found_ratio: float = 0.3,
+    career_length: int = 10,
+    render_delay_ms: int = 200,
+    render_chunk: int = 0,
+) -> web.Application:
+    async def delay() -> None:
+        await asyncio.sleep(max(0.0, latency_ms + random.uniform(-jitter_ms, jitter_ms)) / 1000)
+
+    def meet_size(request: web.Request) -> int:
+        meet_id = request.match_info["meet_id"]
+        if not meet_id.startswith("n") or not meet_id[1:].isdigit():
+            raise web.HTTPNotFound(text="meet ids look like n<size>, e.g. n200")
+        return int(meet_id[1:])
+
+    async def roster_page(request: web.Request) -> web.Response:
+        meet_size(request)
+        await delay()
+        html = ROSTER_SHELL.format(
+            meet_id=request.match_info["meet_id"], render_delay_ms=render_delay_ms, render_chunk=render_chunk
+        )
+        return web.Response(text=html, content_type="text/html")
+
+    async def roster_json(request: web.Request) -> web.Response:
+        size = meet_size(request)
+        await delay()
+        return web.json_response(roster(size))
+
+    async def couch_docs(request: web.Request) -> web.Response:
+        size = meet_size(request)
+        await delay()
+        return web.json_response(meet_docs(size))
+
+    async def profile(request: web.Request) -> web.Response:
+        username = request.match_info["username"]
+        await delay()
+        if _rng(username + ":exists").random() < not_found_ratio:
+            raise web.HTTPNotFound(text="No such lifter")
+        etag = '"' + hashlib.md5(f"{username}:{career_length}".encode()).hexdigest() + '"'
+        if request.headers.get("If-None-Match") == etag:
+            raise web.HTTPNotModified(headers={"ETag": etag})
+        return web.Response(
+            text=profile_html(username, career_length), content_type="text/html", headers={"ETag": etag}
+        )
+
+    async def healthz(request: web.Request) -> web.Response:
+        return web.json_response({"status": "ok"})
+
+    app = web.Application()
+    app.router.add_get("/meets/{meet_id}/roster", roster_page)
+    app.router.add_get("/meets/{meet_id}/roster.json", roster_json)
+    app.router.add_get("/db/{meet_id}/_all_docs", couch_docs)
+    app.router.add_get("/u/{username}", profile)
+    app.router.add_get("/healthz", healthz)
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local LiftingCast / OpenIPF stand-in.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=20.0)
+    parser.add_argument("--not-found-ratio", type=float, default=0.3)
+    parser.add_argument("--career-length", type=int, default=10)
+    parser.add_argument("--render-delay-ms", type=int, default=200)
+    parser.add_argument("--render-chunk", type=int, default=0, help="roster rows rendered per delay (0 = all at once)")
+    args = parser.parse_args()
+
+    app = make_app(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        not_found_ratio=args.not_found_ratio,
+        career_length=args.career_length,
+        render_delay_ms=args.render_delay_ms,
+        render_chunk=args.render_chunk,
+    )
+    web.run_app(app, host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
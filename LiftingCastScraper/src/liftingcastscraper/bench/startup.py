@@ -0,0 +1,157 @@
+"""
+Cold-start benchmark for the API server.
+
+    python -m liftingcastscraper.bench.startup --runs 3
+    python -m liftingcastscraper.bench.startup --modes off,blocking --browser
+
+Two measurements, each in fresh processes:
+
+    import      time to import liftingcastscraper.server.main, and which heavy
+                optional modules (playwright, jinja2, bs4, ...) that pulled in
+    first byte  for each LCS_WARMUP mode: from spawning uvicorn to the first
+                /healthz byte, and to the first byte of the first
+                /api/report against the local stand-in (plus how long that
+                report took once the server was up)
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+import aiohttp
+
+from .run import free_port, standin_server
+
+HEAVY_MODULES = ("playwright", "jinja2", "bs4", "lxml.html", "selectolax.lexbor", "requests", "selenium")
+
+_IMPORT_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import liftingcastscraper.server.main
+print(json.dumps({"seconds": time.perf_counter() - started,
+                  "loaded": [m for m in %r if m in sys.modules]}))
+""" % (HEAVY_MODULES,)
+
+
+def measure_import(runs: int) -> Dict:
+    samples, loaded = [], []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", _IMPORT_PROBE], capture_output=True, text=True, check=True)
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        samples.append(result["seconds"])
+        loaded = result["loaded"]
+    return {"median_s": statistics.median(samples), "min_s": min(samples), "heavy_modules": loaded}
+
+
+async def _first_ok(session: aiohttp.ClientSession, url: str, deadline: float) -> float:
+    """Poll until `url` answers 200; returns the monotonic time of that response."""
+    while time.monotonic() < deadline:
+        try:
+            async with session.get(url) as resp:
+                if resp.status == 200:
+                    return time.monotonic()
+        except aiohttp.ClientError:
+            pass
+        await asyncio.sleep(0.01)
+    raise RuntimeError(f"{url} did not come up")
+
+
+async def _first_report_byte(session: aiohttp.ClientSession, api: str, meet_url: str) -> float:
+    async with session.post(f"{api}/api/report", json={"meet_url": meet_url}) as resp:
+        await resp.content.readany()
+        stamp = time.monotonic()
+        await resp.read()
+        if resp.status != 200:
+            raise RuntimeError(f"report failed with {resp.status}")
+    return stamp
+
+
+async def measure_first_byte(base_url: str, mode: str, meet_url: str, browser: bool) -> Dict:
+    port = free_port()
+    env = {
+        **os.environ,
+        "LCS_WARMUP": mode,
+        "LCS_BROWSER_LAUNCH_AT_STARTUP": "1" if browser else "0",
+        "LCS_OPENIPF_BASE_URL": base_url,
+        "LCS_LIFTINGCAST_BASE_URL": base_url,
+        "LCS_LIFTINGCAST_DATA_URL": base_url + "/db/{meet_id}/_all_docs?include_docs=true",
+        "LCS_CACHE_ENABLED": "0",
+        "LCS_SNAPSHOT_ENABLED": "0",
+        "LCS_HTTP_CACHE_ENABLED": "0",
+        "LCS_FETCH_RATE_PER_HOST": "1000",
+        "LCS_FETCH_BURST": "1000",
+    }
+    started = time.monotonic()
+    server = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "uvicorn", "liftingcastscraper.server.main:app",
+        "--port", str(port), "--log-level", "warning",
+        env=env, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL,
+    )
+    api = f"http://127.0.0.1:{port}"
+    try:
+        async with aiohttp.ClientSession() as session:
+            healthy = await _first_ok(session, f"{api}/healthz", started + 120)
+            report = await _first_report_byte(session, api, meet_url)
+            async with session.get(f"{api}/debug/warmup") as resp:
+                warmup = await resp.json()
+    finally:
+        server.terminate()
+        await server.wait()
+    return {
+        "mode": mode,
+        "healthz_s": healthy - started,
+        "first_report_s": report - started,
+        "report_after_ready_s": report - healthy,
+        "warmup": warmup,
+    }
+
+
+async def run(args: argparse.Namespace) -> List[Dict]:
+    results = []
+    async with standin_server(free_port(), latency_ms=args.latency_ms) as base_url:
+        for mode in args.modes.split(","):
+            samples = [
+                await measure_first_byte(base_url, mode, f"{base_url}/meets/n{args.size + i}/roster", args.browser)
+                for i in range(args.runs)
+            ]
+            best = min(samples, key=lambda r: r["first_report_s"])
+            best["runs"] = len(samples)
+            best["median_first_report_s"] = statistics.median(r["first_report_s"] for r in samples)
+            results.append(best)
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Import time and time-to-first-byte after a cold start.")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--modes", default="off,background,blocking", help="LCS_WARMUP modes to compare")
+    parser.add_argument("--size", type=int, default=20, help="lifters in the first report's meet")
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--browser", action="store_true", help="let the warm-up launch Chromium")
+    args = parser.parse_args(argv)
+
+    imports = measure_import(args.runs)
+    print(f"import server.main : {imports['median_s']:.3f}s median, {imports['min_s']:.3f}s best")
+    print(f"  heavy modules loaded at import: {imports['heavy_modules'] or 'none'}")
+
+    for r in asyncio.run(run(args)):
+        steps = r["warmup"].get("steps") or {}
+        print(
+            f"LCS_WARMUP={r['mode']:<10} /healthz {r['healthz_s']:.2f}s  "
+            f"first report byte {r['first_report_s']:.2f}s (median {r['median_first_report_s']:.2f}s, "
+            f"{r['report_after_ready_s']:.2f}s after ready)"
+        )
+        if steps:
+            print("  warm-up: " + ", ".join(
+                f"{name} {s['seconds']:.2f}s" + (" (failed)" if "error" in s else "") for name, s in steps.items()
+            ))
+
+
+if __name__ == "__main__":
+    main()
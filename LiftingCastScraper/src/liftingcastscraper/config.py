@@ -0,0 +1,139 @@
+"""
+Runtime settings.
+Every knob can be overridden with an environment variable (prefix LCS_),
+which is how the Docker/Render deployment configures the server.
+"""
+
+import os
+
+
+def _env_str(name: str, default: str) -> str:
+    return os.environ.get(name, default)
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    return int(value) if value not in (None, "") else default
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.environ.get(name)
+    return float(value) if value not in (None, "") else default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.environ.get(name)
+    if value in (None, ""):
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# ---- Browser pool (scraper/browser_pool.py) ----
+BROWSER_HEADLESS = _env_bool("LCS_BROWSER_HEADLESS", True)
+BROWSER_MAX_CONTEXTS = _env_int("LCS_BROWSER_MAX_CONTEXTS", 2)         # contexts handed out at once
+BROWSER_CONTEXT_MAX_USES = _env_int("LCS_BROWSER_CONTEXT_MAX_USES", 20)  # recycle a context after N scrapes
+BROWSER_RSS_LIMIT_MB = _env_float("LCS_BROWSER_RSS_LIMIT_MB", 700.0)   # recycle contexts above this Chromium RSS
+BROWSER_LAUNCH_AT_STARTUP = _env_bool("LCS_BROWSER_LAUNCH_AT_STARTUP", True)  # during warm-up, else on the first browser scrape
+BROWSER_BLOCK_RESOURCES = _env_bool("LCS_BROWSER_BLOCK_RESOURCES", True)  # abort images, fonts, media, analytics
+ROSTER_SETTLE_MS = _env_int("LCS_ROSTER_SETTLE_MS", 200)                 # poll interval while the roster renders
+ROSTER_STABLE_POLLS = _env_int("LCS_ROSTER_STABLE_POLLS", 2)             # unchanged lifter counts in a row = done
+
+WARMUP = _env_str("LCS_WARMUP", "background")  # "background", "blocking" (before serving) or "off" (warmup.py)
+
+# ---- OpenIPF lookup cache (opl_ipf/cache.py) ----
+CACHE_ENABLED = _env_bool("LCS_CACHE_ENABLED", True)
+CACHE_MAX_ENTRIES = _env_int("LCS_CACHE_MAX_ENTRIES", 5000)            # in-process LRU tier
+CACHE_PATH = _env_str("LCS_CACHE_PATH", "")                            # SQLite tier; empty = memory only
+CACHE_DISK_MAX_ENTRIES = _env_int("LCS_CACHE_DISK_MAX_ENTRIES", 100000)
+CACHE_PROFILE_TTL = _env_float("LCS_CACHE_PROFILE_TTL", 7 * 24 * 3600)  # seconds
+CACHE_MISS_TTL = _env_float("LCS_CACHE_MISS_TTL", 24 * 3600)
+CACHE_HISTORY_TTL = _env_float("LCS_CACHE_HISTORY_TTL", 12 * 3600)
+
+# ---- OpenIPF fetch scheduler (opl_ipf/scheduler.py) ----
+FETCH_MAX_CONCURRENCY = _env_int("LCS_FETCH_MAX_CONCURRENCY", 16)  # requests in flight, all hosts
+FETCH_RATE_PER_HOST = _env_float("LCS_FETCH_RATE_PER_HOST", 8.0)    # requests / second per host
+FETCH_BURST = _env_float("LCS_FETCH_BURST", 8.0)
+FETCH_MAX_RETRIES = _env_int("LCS_FETCH_MAX_RETRIES", 3)            # on 429 / 5xx / network errors
+FETCH_BACKOFF_BASE = _env_float("LCS_FETCH_BACKOFF_BASE", 0.5)      # seconds, doubled per retry
+FETCH_BACKOFF_MAX = _env_float("LCS_FETCH_BACKOFF_MAX", 8.0)
+FETCH_DEADLINE = _env_float("LCS_FETCH_DEADLINE", 30.0)             # per fetch, retries included
+FETCH_PROBE = _env_bool("LCS_FETCH_PROBE", True)                   # status-only checks of username guesses
+FETCH_PROBE_METHOD = _env_str("LCS_FETCH_PROBE_METHOD", "HEAD")     # HEAD, or GET dropped after the status line
+
+# ---- Offline OpenPowerlifting index (opl_ipf/bulk_index.py) ----
+OPL_INDEX_PATH = _env_str("LCS_OPL_INDEX_PATH", "")                # empty = resolve over HTTP only
+OPL_INDEX_IPF_ONLY = _env_bool("LCS_OPL_INDEX_IPF_ONLY", True)     # match what openipf.org shows
+OPL_INDEX_MMAP_MB = _env_int("LCS_OPL_INDEX_MMAP_MB", 256)
+OPL_INDEX_HTTP_FALLBACK = _env_bool("LCS_OPL_INDEX_HTTP_FALLBACK", True)  # guess URLs for names not in the index
+
+# ---- Name matching for OpenIPF lookups (opl_ipf/names.py) ----
+NAME_INDEX_ENABLED = _env_bool("LCS_NAME_INDEX_ENABLED", True)     # remember confirmed usernames by name
+NAME_INDEX_PATH = _env_str("LCS_NAME_INDEX_PATH", "")              # empty = in memory for this process
+NAME_MATCH_MIN_SCORE = _env_float("LCS_NAME_MATCH_MIN_SCORE", 0.85)  # weaker index matches are ignored
+NAME_MATCH_CANDIDATES = _env_int("LCS_NAME_MATCH_CANDIDATES", 2)    # index candidates tried per name
+NAME_MAX_GUESSES = _env_int("LCS_NAME_MAX_GUESSES", 3)              # usernames tried per name, all sources
+
+# ---- Lifter analytics (analytics.py) ----
+ANALYTICS_ENABLED = _env_bool("LCS_ANALYTICS_ENABLED", True)       # bests, points and class ranks per lifter
+ANALYTICS_RECENT_DAYS = _env_int("LCS_ANALYTICS_RECENT_DAYS", 365)  # window for the "recent" total and points
+ANALYTICS_TREND_MEETS = _env_int("LCS_ANALYTICS_TREND_MEETS", 6)    # latest full-power meets the trend is fitted on
+
+# ---- Background report jobs (server/jobs.py) ----
+JOB_WORKERS = _env_int("LCS_JOB_WORKERS", 2)                        # reports built at once
+JOB_STORE = _env_str("LCS_JOB_STORE", "memory")                     # "memory" or "sqlite"
+JOB_STORE_PATH = _env_str("LCS_JOB_STORE_PATH", "jobs.sqlite")
+JOB_RETENTION = _env_float("LCS_JOB_RETENTION", 6 * 3600)           # keep finished jobs this long (s)
+
+# ---- Admission control for report builds (server/admission.py) ----
+ADMISSION_MAX_ACTIVE = _env_int("LCS_ADMISSION_MAX_ACTIVE", 2)          # browser roster scrapes at once (incl. jobs)
+ADMISSION_MAX_QUEUE = _env_int("LCS_ADMISSION_MAX_QUEUE", 20)           # requests waiting for a slot
+ADMISSION_QUEUE_TIMEOUT = _env_float("LCS_ADMISSION_QUEUE_TIMEOUT", 30.0)  # give up waiting -> 503 (s)
+ADMISSION_RSS_LIMIT_MB = _env_float("LCS_ADMISSION_RSS_LIMIT_MB", 1200.0)  # shed new requests above this RSS (0 = off)
+ADMISSION_CPU_LIMIT = _env_float("LCS_ADMISSION_CPU_LIMIT", 95.0)      # shed above this host CPU % (0 = off)
+ADMISSION_RETRY_AFTER = _env_int("LCS_ADMISSION_RETRY_AFTER", 10)      # Retry-After before build times are known (s)
+
+# ---- Response compression (server/compression.py) ----
+COMPRESSION_ENABLED = _env_bool("LCS_COMPRESSION_ENABLED", True)
+COMPRESSION_MIN_BYTES = _env_int("LCS_COMPRESSION_MIN_BYTES", 1024)     # smaller bodies are sent as-is
+COMPRESSION_GZIP_LEVEL = _env_int("LCS_COMPRESSION_GZIP_LEVEL", 6)
+COMPRESSION_BROTLI_QUALITY = _env_int("LCS_COMPRESSION_BROTLI_QUALITY", 5)  # when brotli is installed
+
+# ---- Profile HTML parsing (opl_ipf/parsers.py) ----
+PARSER_BACKEND = _env_str("LCS_PARSER_BACKEND", "auto")            # "auto", "lxml", "selectolax" or "bs4"
+PARSE_POOL = _env_str("LCS_PARSE_POOL", "process")                 # "process", "thread" or "off" (opl_ipf/parse_pool.py)
+PARSE_POOL_SIZE = _env_int("LCS_PARSE_POOL_SIZE", 0)               # 0 = one worker per available core
+
+# ---- Upstream sites (overridable so benchmarks can point at a local stand-in) ----
+OPENIPF_BASE_URL = _env_str("LCS_OPENIPF_BASE_URL", "https://www.openipf.org").rstrip("/")
+LIFTINGCAST_BASE_URL = _env_str("LCS_LIFTINGCAST_BASE_URL", "https://liftingcast.com").rstrip("/")
+
+# ---- Multi-meet batches (pipeline.build_batch, POST /api/reports) ----
+BATCH_MAX_MEETS = _env_int("LCS_BATCH_MAX_MEETS", 12)              # meets accepted in one API batch
+
+# ---- Direct LiftingCast roster source (scraper/liftingcast_api.py) ----
+LIFTINGCAST_DIRECT = _env_bool("LCS_LIFTINGCAST_DIRECT", True)     # read meet JSON before falling back to Chromium
+LIFTINGCAST_DATA_URL = _env_str(                                   # {meet_id} is substituted
+    "LCS_LIFTINGCAST_DATA_URL",
+    "https://couchdb.liftingcast.com/{meet_id}_readonly/_all_docs?include_docs=true",
+)
+
+# ---- Per-meet snapshots for incremental refreshes (snapshots.py) ----
+SNAPSHOT_ENABLED = _env_bool("LCS_SNAPSHOT_ENABLED", True)
+SNAPSHOT_PATH = _env_str("LCS_SNAPSHOT_PATH", "")                  # SQLite file; empty = memory only
+SNAPSHOT_MAX_MEETS = _env_int("LCS_SNAPSHOT_MAX_MEETS", 200)
+SNAPSHOT_TTL = _env_float("LCS_SNAPSHOT_TTL", 12 * 3600)           # older snapshots are ignored (s)
+
+# ---- Conditional-request cache for profile pages (opl_ipf/http_cache.py) ----
+HTTP_CACHE_ENABLED = _env_bool("LCS_HTTP_CACHE_ENABLED", True)
+HTTP_CACHE_PATH = _env_str("LCS_HTTP_CACHE_PATH", "")              # SQLite file; empty = in memory
+HTTP_CACHE_MAX_MB = _env_int("LCS_HTTP_CACHE_MAX_MB", 32)          # compressed parses kept, LRU beyond that
+HTTP_CACHE_CODEC = _env_str("LCS_HTTP_CACHE_CODEC", "auto")        # "auto" (zstd if installed), "zstd" or "gzip"
+
+# ---- Shared HTTP client (http_client.py) ----
+HTTP_LIMIT = _env_int("LCS_HTTP_LIMIT", 100)                       # open connections, all hosts
+HTTP_LIMIT_PER_HOST = _env_int("LCS_HTTP_LIMIT_PER_HOST", 32)
+HTTP_KEEPALIVE = _env_float("LCS_HTTP_KEEPALIVE", 60.0)            # idle seconds before a socket is closed
+HTTP_DNS_TTL = _env_int("LCS_HTTP_DNS_TTL", 300)                   # seconds
+HTTP_CONNECT_TIMEOUT = _env_float("LCS_HTTP_CONNECT_TIMEOUT", 5.0)
+HTTP_READ_TIMEOUT = _env_float("LCS_HTTP_READ_TIMEOUT", 15.0)      # between reads
+HTTP_TOTAL_TIMEOUT = _env_float("LCS_HTTP_TOTAL_TIMEOUT", 25.0)    # one request; the scheduler deadline covers retries
@@ -0,0 +1,190 @@
+# src/liftingcastscraper/http_client.py
+"""
+App-wide HTTP client.
+
+Creating an aiohttp.ClientSession per report throws away every open
+connection and DNS answer, so each report paid for fresh TCP/TLS handshakes to
+openipf.org. The server now owns ONE client for its whole lifetime (started in
+the FastAPI lifespan) with a tuned connector:
+
+    - connection limits overall and per host
+    - keep-alive, so consecutive lookups reuse sockets
+    - a DNS cache TTL
+    - gzip/deflate (and brotli, when installed) response compression
+    - separate connect / read / total timeouts
+
+Fetch code only needs `request()` (the `HttpSession` protocol), so a plain
+aiohttp.ClientSession or a test fake can stand in for the shared client.
+Connection reuse is tracked with an aiohttp TraceConfig.
+"""
+
+import logging
+from types import SimpleNamespace
+from typing import Any, AsyncContextManager, Dict, Optional, Protocol
+
+import aiohttp
+
+from . import config
+
+logger = logging.getLogger(__name__)
+
+try:
+    import brotli  # noqa: F401  - aiohttp decodes "br" when it is importable
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:  # pragma: no cover - optional dependency
+    ACCEPT_ENCODING = "gzip, deflate"
+
+
+class HttpSession(Protocol):
+    """What the fetch code needs from a client: aiohttp's `request()` context manager."""
+
+    def request(self, method: str, url: str, **kwargs: Any) -> AsyncContextManager[Any]: ...
+
+
+class ConnectionStats:
+    """Counters fed by the client's TraceConfig."""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.dns_cache_hits = 0
+        self.dns_cache_misses = 0
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        trace = aiohttp.TraceConfig()
+        trace.on_request_start.append(self._on_request_start)
+        trace.on_connection_create_end.append(self._on_connection_create_end)
+        trace.on_connection_reuseconn.append(self._on_connection_reuseconn)
+        trace.on_dns_cache_hit.append(self._on_dns_cache_hit)
+        trace.on_dns_cache_miss.append(self._on_dns_cache_miss)
+        return trace
+
+    async def _on_request_start(self, session, ctx: SimpleNamespace, params) -> None:
+        self.requests += 1
+
+    async def _on_connection_create_end(self, session, ctx: SimpleNamespace, params) -> None:
+        self.connections_created += 1
+
+    async def _on_connection_reuseconn(self, session, ctx: SimpleNamespace, params) -> None:
+        self.connections_reused += 1
+
+    async def _on_dns_cache_hit(self, session, ctx: SimpleNamespace, params) -> None:
+        self.dns_cache_hits += 1
+
+    async def _on_dns_cache_miss(self, session, ctx: SimpleNamespace, params) -> None:
+        self.dns_cache_misses += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        acquired = self.connections_created + self.connections_reused
+        return {
+            "requests": self.requests,
+            "connections_created": self.connections_created,
+            "connections_reused": self.connections_reused,
+            "connection_reuse_ratio": round(self.connections_reused / acquired, 3) if acquired else 0.0,
+            "dns_cache_hits": self.dns_cache_hits,
+            "dns_cache_misses": self.dns_cache_misses,
+        }
+
+
+class HttpClient:
+    """One long-lived aiohttp session with a tuned connector.
+
+    Usage:
+        async with HttpClient() as client:
+            async with client.request("GET", url) as response:
+                ...
+    """
+
+    def __init__(
+        self,
+        limit: int = config.HTTP_LIMIT,
+        limit_per_host: int = config.HTTP_LIMIT_PER_HOST,
+        keepalive_timeout: float = config.HTTP_KEEPALIVE,
+        dns_ttl: int = config.HTTP_DNS_TTL,
+        connect_timeout: float = config.HTTP_CONNECT_TIMEOUT,
+        read_timeout: float = config.HTTP_READ_TIMEOUT,
+        total_timeout: float = config.HTTP_TOTAL_TIMEOUT,
+    ) -> None:
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_ttl = dns_ttl
+        self.timeout = aiohttp.ClientTimeout(
+            total=total_timeout, sock_connect=connect_timeout, sock_read=read_timeout
+        )
+        self.stats = ConnectionStats()
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self) -> "HttpClient":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        """Create the session (idempotent). Must run inside the event loop that will use it."""
+        if self._session is not None and not self._session.closed:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.dns_ttl,
+            use_dns_cache=True,
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=self.timeout,
+            headers={"Accept-Encoding": ACCEPT_ENCODING},
+            auto_decompress=True,
+            trace_configs=[self.stats.trace_config()],
+        )
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            raise RuntimeError("HttpClient is not started")
+        return self._session
+
+    def request(self, method: str, url: str, **kwargs: Any) -> AsyncContextManager[aiohttp.ClientResponse]:
+        return self.session.request(method, url, **kwargs)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            **self.stats.as_dict(),
+            "limit": self.limit,
+            "limit_per_host": self.limit_per_host,
+            "open": self._session is not None and not self._session.closed,
+        }
+
+
+# ---------- shared instance (owned by the FastAPI lifespan) ----------
+
+_shared_client: Optional[HttpClient] = None
+
+
+def get_http_client() -> Optional[HttpClient]:
+    """Return the app-wide client, or None when running without one (CLI)."""
+    return _shared_client
+
+
+async def start_http_client(**kwargs) -> HttpClient:
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = HttpClient(**kwargs)
+    await _shared_client.start()
+    return _shared_client
+
+
+async def stop_http_client() -> None:
+    global _shared_client
+    if _shared_client is not None:
+        await _shared_client.close()
+        _shared_client = None
@@ -0,0 +1,177 @@
+"""
+Lightweight timing and metrics instrumentation.
+
+    with span("page_load"):
+        await page.goto(...)
+
+    inc("lcs_openipf_guesses_total", result="hit")
+
+Spans feed a process-wide histogram per stage (exported at /metrics in the
+Prometheus text format) and, when a report is being collected with
+`collect_timings()`, a per-report breakdown that can be attached to the API
+response. The collector travels in a contextvar, so tasks spawned by the
+pipeline report into the right breakdown.
+"""
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+STAGE_HISTOGRAM = "lcs_stage_duration_seconds"
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_HELP = {
+    STAGE_HISTOGRAM: "Time spent per pipeline stage.",
+    "lcs_openipf_guesses_total": "OpenIPF username guesses tried, by result.",
+    "lcs_http_responses_total": "OpenIPF HTTP responses, by status code.",
+    "lcs_reports_total": "Reports built, by outcome.",
+    "lcs_http_cache_total": "Profile fetches by conditional-cache outcome (not_modified, stored, uncacheable).",
+    "lcs_roster_source_total": "Rosters loaded, by source (api or browser).",
+    "lcs_admission_total": "Report requests admitted or rejected (by reason) by admission control.",
+    "lcs_singleflight_total": "Coalesced calls, by flight and whether they started or shared the work.",
+    "lcs_process_rss_bytes": "Resident set size of the API process.",
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+_lock = threading.Lock()
+_counters: Dict[str, Dict[LabelKey, float]] = {}
+_gauges: Dict[str, Dict[LabelKey, float]] = {}
+_histograms: Dict[str, Dict[LabelKey, "_Histogram"]] = {}
+
+
+class _Histogram:
+    __slots__ = ("bucket_counts", "count", "sum")
+
+    def __init__(self) -> None:
+        self.bucket_counts = [0] * len(BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.bucket_counts[i] += 1
+
+
+def _labels(labels: Dict[str, object]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+# ---------- recording ----------
+
+def inc(name: str, value: float = 1.0, **labels) -> None:
+    key = _labels(labels)
+    with _lock:
+        series = _counters.setdefault(name, {})
+        series[key] = series.get(key, 0.0) + value
+
+
+def set_gauge(name: str, value: float, **labels) -> None:
+    with _lock:
+        _gauges.setdefault(name, {})[_labels(labels)] = value
+
+
+def observe(name: str, value: float, **labels) -> None:
+    key = _labels(labels)
+    with _lock:
+        series = _histograms.setdefault(name, {})
+        hist = series.get(key)
+        if hist is None:
+            hist = series[key] = _Histogram()
+        hist.observe(value)
+
+
+class Timings:
+    """Per-report breakdown: stage -> count / total / max milliseconds."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self._stages: Dict[str, List[float]] = {}
+
+    def add(self, stage: str, seconds: float) -> None:
+        self._stages.setdefault(stage, []).append(seconds)
+
+    def as_dict(self) -> Dict[str, object]:
+        stages = {
+            stage: {
+                "count": len(durations),
+                "total_ms": round(sum(durations) * 1000, 1),
+                "max_ms": round(max(durations) * 1000, 1),
+            }
+            for stage, durations in self._stages.items()
+        }
+        return {"wall_ms": round((time.perf_counter() - self.started) * 1000, 1), "stages": stages}
+
+
+_current_timings: contextvars.ContextVar[Optional[Timings]] = contextvars.ContextVar(
+    "lcs_current_timings", default=None
+)
+
+
+@contextmanager
+def collect_timings() -> Iterator[Timings]:
+    """Collect every span recorded inside this block (and tasks it spawns) into one Timings."""
+    timings = Timings()
+    token = _current_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _current_timings.reset(token)
+
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    """Time a pipeline stage. Safe to use around awaits."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        observe(STAGE_HISTOGRAM, elapsed, stage=stage)
+        timings = _current_timings.get()
+        if timings is not None:
+            timings.add(stage, elapsed)
+
+
+# ---------- export ----------
+
+def _escape(value: str) -> str:
+    # the exposition format only allows these three escapes inside a label value
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _fmt_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def render_prometheus() -> str:
+    """Render every metric in the Prometheus text exposition format."""
+    lines: List[str] = []
+    with _lock:
+        for kind, store in (("counter", _counters), ("gauge", _gauges)):
+            for name, series in sorted(store.items()):
+                if name in _HELP:
+                    lines.append(f"# HELP {name} {_HELP[name]}")
+                lines.append(f"# TYPE {name} {kind}")
+                for key, value in sorted(series.items()):
+                    lines.append(f"{name}{_fmt_labels(key)} {value}")
+
+        for name, series in sorted(_histograms.items()):
+            if name in _HELP:
+                lines.append(f"# HELP {name} {_HELP[name]}")
+            lines.append(f"# TYPE {name} histogram")
+            for key, hist in sorted(series.items()):
+                for bound, count in zip(BUCKETS, hist.bucket_counts):
+                    lines.append(f"{name}_bucket{_fmt_labels(key, ('le', str(bound)))} {count}")
+                lines.append(f"{name}_bucket{_fmt_labels(key, ('le', '+Inf'))} {hist.count}")
+                lines.append(f"{name}_sum{_fmt_labels(key)} {hist.sum}")
+                lines.append(f"{name}_count{_fmt_labels(key)} {hist.count}")
+    return "\n".join(lines) + "\n"
@@ -2,15 +2,21 @@
 """
 Manual testing entry point.
 Run in VSCode terminal: python -m liftingcastscraper.main
+
+Batch mode (one report per meet, lifters shared across meets):
+    python -m liftingcastscraper batch urls.txt
 """
 
 import os
 import asyncio
 import logging
+from typing import List, Optional
 
-from .pipeline import build_people
-from .scraper.utils import save_html_report, slugify, normalize_liftingcast_url
-from .reports.html_report import generate_html_report
+from .http_client import start_http_client, stop_http_client
+from .pipeline import build_batch, build_people
+from .scraper.browser_pool import start_browser_manager, stop_browser_manager
+from .scraper.utils import slugify, normalize_liftingcast_url
+from .reports.html_report import write_html_report
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
@@ -26,14 +32,47 @@ async def run_pipeline(meet_url: str) -> None:
     people = await build_people(meet_url)
 
     logger.info("Building HTML report…")
-    html = generate_html_report(people)
-
     filename = os.path.join(OUTPUT_DIR, f"report_{slugify(meet_url)}.html")
-    save_html_report(html, filename)
+    write_html_report(people, filename)
 
     logger.info("Report saved → %s", filename)
 
 
+def read_meet_urls(path: str) -> List[str]:
+    """Meet URLs from a text file: one per line, blank lines and # comments ignored."""
+    with open(path, encoding="utf-8") as f:
+        lines = (line.split("#", 1)[0].strip() for line in f)
+        return [line for line in lines if line]
+
+
+async def run_batch(meet_urls: List[str], output_dir: Optional[str] = None, full_refresh: bool = False) -> int:
+    """Build all meets as one batch and write one HTML report per meet. Returns the number of failed meets."""
+    output_dir = output_dir or OUTPUT_DIR
+
+    # one HTTP client and one browser pool for every meet in the batch;
+    # Chromium is only launched if a roster has to be scraped
+    await start_http_client()
+    await start_browser_manager(launch=False)
+    try:
+        batch = await build_batch(meet_urls, use_snapshot=not full_refresh)
+    finally:
+        await stop_browser_manager()
+        await stop_http_client()
+
+    for meet_url, people in batch.people.items():
+        filename = os.path.join(output_dir, f"report_{slugify(meet_url)}.html")
+        write_html_report(people, filename)
+        logger.info("Report saved → %s", filename)
+    for meet_url, error in batch.errors.items():
+        logger.error("No report for %s: %s", meet_url, error)
+
+    logger.info(
+        "%d/%d meets done, %d roster entries, %d unique lifters looked up",
+        len(batch.people), len(batch.people) + len(batch.errors), batch.roster_entries, batch.unique_lifters,
+    )
+    return len(batch.errors)
+
+
 if __name__ == "__main__":
     example_url = "https://liftingcast.com/meets/mfnfcu3cri6q/roster"
     example_url = normalize_liftingcast_url(example_url)
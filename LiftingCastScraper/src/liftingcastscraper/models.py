@@ -0,0 +1,280 @@
+# src/liftingcastscraper/models.py
+"""
+Typed records for report data.
+
+A parsed profile used to be a list of dicts keyed by table header with every
+value a string, so each meet cost a dict plus ~15 string objects and clients
+had to parse the numbers again. `MeetResult` and `Lifter` are slotted
+dataclasses instead: numbers are parsed once during extraction, repeated
+labels (federation, equipment, class, ...) are interned, and there is no
+per-instance __dict__.
+
+On the wire nothing changes shape: `to_wire()` emits the same keys as before
+("Place", "Fed", ..., "Squat": [attempts], "Total", "GLP"), with numeric
+fields as JSON numbers. `dumps()` serializes records straight to JSON bytes,
+with orjson when installed.
+
+`from_wire()` accepts both the current form and the old all-strings form, so
+JSON written by earlier versions (caches, snapshots, the bulk index) still
+loads.
+
+`LifterStats` holds the derived numbers (bests, recent total, points, class
+rank) computed once per lifter by analytics.py; it goes on the wire as the
+person's "analytics" object.
+"""
+
+import json
+import sys
+from dataclasses import asdict, dataclass, field, fields
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - optional dependency
+    _orjson = None
+
+LIFT_KEYS = ("Squat", "Bench", "Deadlift")
+POINTS_KEYS = ("GLP", "Dots", "Goodlift", "IPF GL")
+
+# wire key -> MeetResult field, for the plain-text and numeric columns
+TEXT_FIELDS = {
+    "Place": "place",
+    "Fed": "federation",
+    "Date": "date",
+    "Location": "location",
+    "Competition": "competition",
+    "Division": "division",
+    "Equip": "equipment",
+    "Class": "weight_class",
+}
+NUMBER_FIELDS = {
+    "Age": "age",
+    "Weight": "bodyweight",
+    "Total": "total",
+}
+# low-cardinality values worth sharing between rows
+INTERNED = frozenset({"federation", "location", "division", "equipment", "weight_class"})
+
+
+def parse_number(value: Any) -> Optional[float]:
+    """Float for a numeric cell ("82.5", 82.5, "~24"), None for blanks and non-numbers."""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).strip().lstrip("~")
+    if not text:
+        return None
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def parse_attempts(values: Iterable[Any]) -> Tuple[float, ...]:
+    """Numeric attempts only; failed ("-200") attempts stay, blanks and text are dropped."""
+    attempts = []
+    for value in values:
+        number = parse_number(value)
+        if number is not None:
+            attempts.append(number)
+    return tuple(attempts)
+
+
+@dataclass(slots=True)
+class MeetResult:
+    """One row of a lifter's meet history."""
+
+    place: str = ""
+    federation: str = ""
+    date: str = ""
+    location: str = ""
+    competition: str = ""
+    division: str = ""
+    age: Optional[float] = None
+    equipment: str = ""
+    weight_class: str = ""
+    bodyweight: Optional[float] = None
+    squat: Tuple[float, ...] = ()
+    bench: Tuple[float, ...] = ()
+    deadlift: Tuple[float, ...] = ()
+    total: Optional[float] = None
+    points: Optional[float] = None
+    points_label: str = "GLP"
+    extra: Optional[Dict[str, str]] = None  # columns we have no field for
+
+    @classmethod
+    def from_wire(cls, row: Dict[str, Any]) -> "MeetResult":
+        """Build from a header-keyed row (scraped cells, cached JSON or a bulk-index row)."""
+        result = cls()
+        extra = None
+        for key, value in row.items():
+            name = TEXT_FIELDS.get(key)
+            if name is not None:
+                text = "" if value is None else str(value)
+                setattr(result, name, sys.intern(text) if name in INTERNED else text)
+                continue
+            name = NUMBER_FIELDS.get(key)
+            if name is not None:
+                setattr(result, name, parse_number(value))
+                continue
+            if key in LIFT_KEYS:
+                values = value if isinstance(value, (list, tuple)) else (value,)
+                setattr(result, key.lower(), parse_attempts(values))
+                continue
+            if key in POINTS_KEYS:
+                result.points = parse_number(value)
+                result.points_label = sys.intern(key)
+                continue
+            if extra is None:
+                extra = {}
+            extra[key] = value
+        result.extra = extra
+        return result
+
+    def to_wire(self) -> Dict[str, Any]:
+        row: Dict[str, Any] = {
+            "Place": self.place,
+            "Fed": self.federation,
+            "Date": self.date,
+            "Location": self.location,
+            "Competition": self.competition,
+            "Division": self.division,
+            "Age": self.age,
+            "Equip": self.equipment,
+            "Class": self.weight_class,
+            "Weight": self.bodyweight,
+            "Squat": list(self.squat),
+            "Bench": list(self.bench),
+            "Deadlift": list(self.deadlift),
+            "Total": self.total,
+            self.points_label: self.points,
+        }
+        if self.extra:
+            row.update(self.extra)
+        return row
+
+
+@dataclass(slots=True)
+class LifterStats:
+    """Numbers derived from a lifter's meet history (see analytics.py). Weights in kg."""
+
+    as_of: str = ""                          # ISO date the recent window was measured from
+    meets: int = 0
+    last_meet: str = ""                      # date of the latest meet
+    sex: Optional[str] = None                # "F" / "M", inferred from division or weight classes
+    best_squat: Optional[float] = None
+    best_bench: Optional[float] = None
+    best_deadlift: Optional[float] = None
+    best_total: Optional[float] = None
+    recent_total: Optional[float] = None     # best total within LCS_ANALYTICS_RECENT_DAYS
+    recent_bodyweight: Optional[float] = None
+    dots: Optional[float] = None             # for the recent total (else the latest one)
+    ipf_gl: Optional[float] = None
+    best_ipf_gl: Optional[float] = None      # career best
+    attempts_made: int = 0
+    attempts_taken: int = 0
+    success_rate: Optional[float] = None     # None when the history only lists best lifts
+    trend_kg_per_year: Optional[float] = None
+    weight_class: str = ""                   # class the lifter is ranked in at this meet
+    class_rank: Optional[int] = None
+    class_size: int = 0
+
+    @classmethod
+    def from_wire(cls, row: Dict[str, Any]) -> "LifterStats":
+        return cls(**{f.name: row[f.name] for f in fields(cls) if f.name in row})
+
+    def to_wire(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(slots=True)
+class Lifter:
+    """One roster entry with its OpenIPF lookup result."""
+
+    name: str
+    liftingcast_href: str
+    divisions: List[Dict[str, Optional[str]]] = field(default_factory=list)
+    lookup: str = "refreshed"
+    opl_profile: Optional[str] = None
+    opl_summary: Optional[List[MeetResult]] = None
+    analytics: Optional[LifterStats] = None
+
+    @classmethod
+    def from_wire(cls, person: Dict[str, Any]) -> "Lifter":
+        summary = person.get("opl_summary")
+        stats = person.get("analytics")
+        return cls(
+            name=person["name"],
+            liftingcast_href=person["liftingcast_href"],
+            divisions=person.get("divisions") or [],
+            lookup=person.get("lookup", "refreshed"),
+            opl_profile=person.get("opl_profile"),
+            opl_summary=meet_results_from_wire(summary) if summary is not None else None,
+            analytics=LifterStats.from_wire(stats) if stats is not None else None,
+        )
+
+    def to_wire(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "liftingcast_href": self.liftingcast_href,
+            "divisions": self.divisions,
+            "lookup": self.lookup,
+            "opl_profile": self.opl_profile,
+            "opl_summary": [m.to_wire() for m in self.opl_summary] if self.opl_summary is not None else None,
+            "analytics": self.analytics.to_wire() if self.analytics is not None else None,
+        }
+
+
+def meet_results_from_wire(rows: Iterable[Any]) -> List[MeetResult]:
+    return [row if isinstance(row, MeetResult) else MeetResult.from_wire(row) for row in rows]
+
+
+def intern_results(rows: List[MeetResult]) -> List[MeetResult]:
+    """
+    Intern the repetitive text fields again (in place). Rows unpickled from a
+    parse worker process carry their own copies of strings the worker
+    interned, which this process has not seen.
+    """
+    for row in rows:
+        for name in INTERNED:
+            setattr(row, name, sys.intern(getattr(row, name)))
+        row.points_label = sys.intern(row.points_label)
+    return rows
+
+
+# ---------- serialization ----------
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, (MeetResult, Lifter, LifterStats)):
+        return obj.to_wire()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def to_wire(obj: Any) -> Any:
+    """Plain JSON-compatible copy of `obj` (records become dicts), for code that needs dicts."""
+    if isinstance(obj, (MeetResult, Lifter, LifterStats)):
+        return obj.to_wire()
+    if isinstance(obj, dict):
+        return {key: to_wire(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [to_wire(value) for value in obj]
+    return obj
+
+
+if _orjson is not None:
+    _ORJSON_OPTIONS = _orjson.OPT_PASSTHROUGH_DATACLASS | _orjson.OPT_NON_STR_KEYS
+
+    def dumps(obj: Any) -> bytes:
+        """JSON bytes for `obj`; MeetResult / Lifter / LifterStats records are written in their wire form."""
+        return _orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+
+else:  # pragma: no cover - exercised when orjson is not installed
+
+    def dumps(obj: Any) -> bytes:
+        """JSON bytes for `obj`; MeetResult / Lifter / LifterStats records are written in their wire form."""
+        return json.dumps(obj, default=_default, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: bytes | str) -> Any:
+    return _orjson.loads(data) if _orjson is not None else json.loads(data)
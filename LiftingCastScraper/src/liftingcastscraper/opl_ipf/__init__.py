@@ -1,10 +1,39 @@
 """ Retrieve OPL data """
 
-from .fetcher import Page
-from .lookup import try_fetch_openipf
+from .._lazy import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "BulkIndex": ".bulk_index",
+    "get_bulk_index": ".bulk_index",
+    "LookupCache": ".cache",
+    "get_lookup_cache": ".cache",
+    "Page": ".fetcher",
+    "PageNotFound": ".fetcher",
+    "HttpCache": ".http_cache",
+    "get_http_cache": ".http_cache",
+    "generate_username_guesses": ".lookup",
+    "try_fetch_openipf": ".lookup",
+    "Candidate": ".names",
+    "NameIndex": ".names",
+    "get_name_index": ".names",
+    "FetchScheduler": ".scheduler",
+    "get_fetch_scheduler": ".scheduler",
+})
 
 __all__ = [
     "try_fetch_openipf",
     "generate_username_guesses",
     "Page",
-]
\ No newline at end of file
+    "PageNotFound",
+    "LookupCache",
+    "get_lookup_cache",
+    "HttpCache",
+    "get_http_cache",
+    "FetchScheduler",
+    "get_fetch_scheduler",
+    "BulkIndex",
+    "get_bulk_index",
+    "NameIndex",
+    "Candidate",
+    "get_name_index",
+]
@@ -0,0 +1,378 @@
+"""
+Offline lifter index built from the OpenPowerlifting bulk CSV export.
+
+Guessing `/u/<username>` URLs costs up to three round-trips per lifter and
+cannot find disambiguated lifters ("John Smith #2"). Instead, ingest the public
+dump (https://openpowerlifting.gitlab.io/opl-csv/bulk-csv.html) once into a
+memory-mapped SQLite index: normalized name -> lifter -> meet rows. A whole
+roster then resolves locally with one query.
+
+    python -m liftingcastscraper.opl_ipf.bulk_index ingest openpowerlifting-latest.zip --index opl.sqlite
+    python -m liftingcastscraper.opl_ipf.bulk_index lookup "Anthony Hill" --index opl.sqlite
+
+Re-ingesting a newer dump is incremental: unchanged meet rows are skipped
+(by row hash) and only new or corrected rows are written. Rows the new dump no
+longer has are deleted, along with lifters left without any meet. With
+--since, only meets on or after that date are compared, so older rows stay.
+"""
+
+import argparse
+import csv
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+import zipfile
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .. import config
+from ..models import MeetResult, to_wire
+from .fetcher import profile_url_for
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = "1"
+BATCH_SIZE = 5000
+
+# columns of the bulk CSV that identify one meet row for one lifter
+ROW_KEY_COLUMNS = ("Name", "MeetName", "Date", "Federation", "Division", "Event", "Equipment", "WeightClassKg")
+
+
+def normalize_name(name: str) -> str:
+    """'José  Smith #2' -> 'jose smith' (accents folded, disambiguation suffix dropped)."""
+    name = re.sub(r"#\d+\s*$", "", name)
+    name = unicodedata.normalize("NFKD", name)
+    name = "".join(ch for ch in name if not unicodedata.combining(ch))
+    name = re.sub(r"[^a-z0-9 ]+", " ", name.lower())
+    return " ".join(name.split())
+
+
+def username_for(name: str) -> str:
+    """OpenPowerlifting usernames are the folded name without separators: 'John Smith #2' -> 'johnsmith2'."""
+    folded = unicodedata.normalize("NFKD", name)
+    folded = "".join(ch for ch in folded if not unicodedata.combining(ch))
+    return re.sub(r"[^a-z0-9]+", "", folded.lower())
+
+
+def _attempts(row: Dict[str, str], lift: str) -> List[float]:
+    """Attempt columns like Squat1Kg..Squat3Kg -> floats; falls back to the best lift."""
+    attempts = []
+    for i in (1, 2, 3):
+        value = row.get(f"{lift}{i}Kg") or ""
+        try:
+            attempts.append(float(value))
+        except ValueError:
+            continue
+    if not attempts:
+        try:
+            attempts.append(float(row.get(f"Best3{lift}Kg") or ""))
+        except ValueError:
+            pass
+    return attempts
+
+
+def _location(row: Dict[str, str]) -> str:
+    return "-".join(part for part in (row.get("MeetCountry", ""), row.get("MeetState", "")) if part)
+
+
+def to_meet_history_row(row: Dict[str, str]) -> Dict:
+    """Shape a bulk CSV row like a row scraped from an OpenIPF profile table (MeetResult wire form)."""
+    return {
+        "Place": row.get("Place", ""),
+        "Fed": row.get("Federation", ""),
+        "Date": row.get("Date", ""),
+        "Location": _location(row),
+        "Competition": row.get("MeetName", ""),
+        "Division": row.get("Division", ""),
+        "Age": row.get("Age", ""),
+        "Equip": row.get("Equipment", ""),
+        "Class": row.get("WeightClassKg", ""),
+        "Weight": row.get("BodyweightKg", ""),
+        "Squat": _attempts(row, "Squat"),
+        "Bench": _attempts(row, "Bench"),
+        "Deadlift": _attempts(row, "Deadlift"),
+        "Total": row.get("TotalKg", ""),
+        "GLP": row.get("Goodlift", ""),
+    }
+
+
+def _is_ipf(row: Dict[str, str]) -> bool:
+    return row.get("ParentFederation") == "IPF" or row.get("Federation") == "IPF"
+
+
+def _row_key(row: Dict[str, str]) -> str:
+    return "\x1f".join(row.get(col, "") for col in ROW_KEY_COLUMNS)
+
+
+def _row_hash(row: Dict[str, str]) -> str:
+    return hashlib.blake2b(
+        "\x1f".join(f"{k}={v}" for k, v in sorted(row.items())).encode("utf-8"), digest_size=16
+    ).hexdigest()
+
+
+def _open_dump(path: str) -> Iterator[Dict[str, str]]:
+    """Stream rows from the bulk export, either the .zip as downloaded or the extracted .csv."""
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as zf:
+            member = next(n for n in zf.namelist() if n.endswith(".csv"))
+            with zf.open(member) as raw:
+                yield from csv.DictReader(io.TextIOWrapper(raw, encoding="utf-8", newline=""))
+    else:
+        with open(path, encoding="utf-8", newline="") as f:
+            yield from csv.DictReader(f)
+
+
+class BulkIndex:
+    """Name -> lifter -> meet rows, stored in a memory-mapped SQLite file."""
+
+    def __init__(self, path: str, mmap_mb: int = config.OPL_INDEX_MMAP_MB) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(f"PRAGMA mmap_size = {mmap_mb * 1024 * 1024}")
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._create_schema()
+
+    def _create_schema(self) -> None:
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS meta (
+                key   TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS lifters (
+                id          INTEGER PRIMARY KEY,
+                name        TEXT NOT NULL UNIQUE,
+                norm_name   TEXT NOT NULL,
+                username    TEXT NOT NULL,
+                last_date   TEXT NOT NULL DEFAULT ''
+            );
+            CREATE INDEX IF NOT EXISTS lifters_norm_name ON lifters (norm_name);
+            CREATE TABLE IF NOT EXISTS meets (
+                row_key     TEXT PRIMARY KEY,
+                lifter_id   INTEGER NOT NULL REFERENCES lifters (id),
+                date        TEXT NOT NULL,
+                row_hash    TEXT NOT NULL,
+                data        TEXT NOT NULL
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS meets_lifter ON meets (lifter_id, date);
+            """
+        )
+        self._conn.execute(
+            "INSERT OR IGNORE INTO meta (key, value) VALUES ('schema_version', ?)", (SCHEMA_VERSION,)
+        )
+        self._conn.commit()
+
+    # ---------- ingest ----------
+
+    def _dump_fingerprint(self, path: str) -> str:
+        st = os.stat(path)
+        return f"{os.path.basename(path)}:{st.st_size}:{int(st.st_mtime)}"
+
+    def ingest(self, path: str, ipf_only: bool = config.OPL_INDEX_IPF_ONLY, since: Optional[str] = None) -> Dict[str, int]:
+        """
+        Ingest (or refresh from) a bulk dump. Returns row counters.
+        `since` (YYYY-MM-DD) skips older meets, for a quick refresh from a newer dump.
+        """
+        fingerprint = self._dump_fingerprint(path)
+        stats = {"rows": 0, "skipped": 0, "inserted": 0, "updated": 0, "unchanged": 0, "deleted": 0}
+
+        with self._lock:
+            seen = self._meta_json("ingested_dumps", [])
+            if fingerprint in seen:
+                logger.info("Dump %s already ingested, nothing to do", fingerprint)
+                return stats
+
+            # row keys present in this dump, to find the rows it no longer has
+            self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS seen_rows (row_key TEXT PRIMARY KEY) WITHOUT ROWID")
+            self._conn.execute("DELETE FROM seen_rows")
+
+            lifter_ids: Dict[str, int] = {}
+            batch: List[Dict[str, str]] = []
+            for row in _open_dump(path):
+                stats["rows"] += 1
+                if (ipf_only and not _is_ipf(row)) or (since and row.get("Date", "") < since) or not row.get("Name"):
+                    stats["skipped"] += 1
+                    continue
+                batch.append(row)
+                if len(batch) >= BATCH_SIZE:
+                    self._write_batch(batch, lifter_ids, stats)
+                    batch = []
+            if batch:
+                self._write_batch(batch, lifter_ids, stats)
+            stats["deleted"] = self._delete_missing(since or "")
+
+            self._set_meta("ingested_dumps", json.dumps(seen + [fingerprint]))
+            self._conn.commit()
+
+        logger.info("Ingested %s: %s", path, stats)
+        return stats
+
+    def _write_batch(self, rows: List[Dict[str, str]], lifter_ids: Dict[str, int], stats: Dict[str, int]) -> None:
+        self._conn.executemany("INSERT OR IGNORE INTO seen_rows (row_key) VALUES (?)", ((_row_key(r),) for r in rows))
+        for row in rows:
+            name = row["Name"]
+            lifter_id = lifter_ids.get(name)
+            if lifter_id is None:
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO lifters (name, norm_name, username) VALUES (?, ?, ?)",
+                    (name, normalize_name(name), username_for(name)),
+                )
+                (lifter_id,) = self._conn.execute("SELECT id FROM lifters WHERE name = ?", (name,)).fetchone()
+                lifter_ids[name] = lifter_id
+
+            key, digest, date = _row_key(row), _row_hash(row), row.get("Date", "")
+            existing = self._conn.execute("SELECT row_hash FROM meets WHERE row_key = ?", (key,)).fetchone()
+            if existing is not None and existing[0] == digest:
+                stats["unchanged"] += 1
+                continue
+
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meets (row_key, lifter_id, date, row_hash, data) VALUES (?, ?, ?, ?, ?)",
+                (key, lifter_id, date, digest, json.dumps(to_meet_history_row(row), separators=(",", ":"))),
+            )
+            self._conn.execute(
+                "UPDATE lifters SET last_date = MAX(last_date, ?) WHERE id = ?", (date, lifter_id)
+            )
+            stats["updated" if existing is not None else "inserted"] += 1
+        self._conn.commit()
+
+    def _delete_missing(self, since: str) -> int:
+        """Delete meet rows dated `since` or later that this dump did not have; returns how many."""
+        missing = "date >= ? AND row_key NOT IN (SELECT row_key FROM seen_rows)"
+        lifter_ids = [lifter_id for (lifter_id,) in self._conn.execute(
+            f"SELECT DISTINCT lifter_id FROM meets WHERE {missing}", (since,)
+        )]
+        if not lifter_ids:
+            return 0
+        deleted = self._conn.execute(f"DELETE FROM meets WHERE {missing}", (since,)).rowcount
+        for start in range(0, len(lifter_ids), 500):  # stay under SQLite's variable limit
+            chunk = lifter_ids[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            self._conn.execute(
+                f"UPDATE lifters SET last_date = COALESCE((SELECT MAX(date) FROM meets WHERE lifter_id = lifters.id), '') "
+                f"WHERE id IN ({placeholders})",
+                chunk,
+            )
+            self._conn.execute(
+                f"DELETE FROM lifters WHERE id IN ({placeholders}) "
+                "AND NOT EXISTS (SELECT 1 FROM meets WHERE lifter_id = lifters.id)",
+                chunk,
+            )
+        self._conn.commit()
+        return deleted
+
+    def _meta_json(self, key: str, default):
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def _set_meta(self, key: str, value: str) -> None:
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    # ---------- lookup ----------
+
+    def lookup_many(self, names: Iterable[str]) -> Dict[str, Dict]:
+        """
+        Resolve many roster names in one pass.
+        Returns {name: {"profile_url", "meet_history"}} for names found; when several
+        lifters share a name, the most recently active one wins.
+        """
+        wanted: Dict[str, List[str]] = {}
+        for name in names:
+            if name:
+                wanted.setdefault(normalize_name(name), []).append(name)
+        if not wanted:
+            return {}
+
+        results: Dict[str, Dict] = {}
+        with self._lock:
+            norm_names = list(wanted)
+            best: Dict[str, tuple] = {}
+            for start in range(0, len(norm_names), 500):  # stay under SQLite's variable limit
+                chunk = norm_names[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                for lifter_id, norm_name, username, last_date in self._conn.execute(
+                    f"SELECT id, norm_name, username, last_date FROM lifters WHERE norm_name IN ({placeholders})",
+                    chunk,
+                ):
+                    current = best.get(norm_name)
+                    if current is None or last_date > current[2]:
+                        best[norm_name] = (lifter_id, username, last_date)
+
+            for norm_name, (lifter_id, username, _) in best.items():
+                history = [
+                    MeetResult.from_wire(json.loads(data))
+                    for (data,) in self._conn.execute(
+                        "SELECT data FROM meets WHERE lifter_id = ? ORDER BY date DESC", (lifter_id,)
+                    )
+                ]
+                for name in wanted[norm_name]:
+                    results[name] = {"profile_url": profile_url_for(username), "meet_history": history}
+        return results
+
+    def lookup(self, name: str) -> Optional[Dict]:
+        return self.lookup_many([name]).get(name)
+
+    def iter_lifters(self) -> Iterator[Tuple[str, str]]:
+        """(username, name) for every lifter, for seeding the name index."""
+        with self._lock:
+            rows = self._conn.execute("SELECT username, name FROM lifters").fetchall()
+        return iter(rows)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            (lifters,) = self._conn.execute("SELECT COUNT(*) FROM lifters").fetchone()
+            (meets,) = self._conn.execute("SELECT COUNT(*) FROM meets").fetchone()
+        return {"lifters": lifters, "meets": meets}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# ---------- shared instance ----------
+
+_default_index: Optional[BulkIndex] = None
+
+
+def get_bulk_index() -> Optional[BulkIndex]:
+    """Return the index at LCS_OPL_INDEX_PATH, or None when not configured / not built yet."""
+    global _default_index
+    if _default_index is None and config.OPL_INDEX_PATH and os.path.exists(config.OPL_INDEX_PATH):
+        _default_index = BulkIndex(config.OPL_INDEX_PATH)
+        logger.info("OpenPowerlifting index loaded from %s", config.OPL_INDEX_PATH)
+    return _default_index
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Build or query the offline OpenPowerlifting index.")
+    parser.add_argument("--index", default=config.OPL_INDEX_PATH or "opl_index.sqlite", help="index file path")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    ingest = sub.add_parser("ingest", help="ingest a bulk CSV/zip export (incremental on re-run)")
+    ingest.add_argument("dump")
+    ingest.add_argument("--all-federations", action="store_true", help="keep non-IPF meets too")
+    ingest.add_argument("--since", help="only ingest meets on or after YYYY-MM-DD")
+
+    lookup = sub.add_parser("lookup", help="resolve a lifter name")
+    lookup.add_argument("name")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    index = BulkIndex(args.index)
+    if args.command == "ingest":
+        print(index.ingest(args.dump, ipf_only=not args.all_federations, since=args.since))
+        print(index.stats())
+    else:
+        print(json.dumps(to_wire(index.lookup(args.name)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
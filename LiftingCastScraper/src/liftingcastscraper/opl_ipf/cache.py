@@ -0,0 +1,371 @@
+"""
+Tiered cache for OpenIPF lookups.
+
+Tier 1 is an in-process LRU, tier 2 an optional SQLite file that survives
+restarts. Entries are keyed by username guess and come in three kinds, each
+with its own TTL:
+
+    profile  - the guess resolves to a real profile URL
+    miss     - the guess returned 404
+    history  - the parsed `meet_history` for the profile (MeetResult rows)
+    stats    - LifterStats derived from that history (analytics.py); dropped
+               whenever the history is replaced, and shares its TTL
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, TypeVar
+
+from .. import config
+from ..models import LifterStats, MeetResult, dumps, loads, meet_results_from_wire
+
+logger = logging.getLogger(__name__)
+
+PROFILE = "profile"
+MISS = "miss"
+HISTORY = "history"
+STATS = "stats"
+
+T = TypeVar("T")
+
+
+class CacheStats:
+    """Hit / miss / eviction counters for one tier."""
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.writes = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "writes": self.writes,
+        }
+
+
+class MemoryTier:
+    """LRU dict of key -> (expires_at, value). Locked, since lookups run it from worker threads."""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, record: bool = True) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if record:
+                    self.stats.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                self.stats.expirations += 1
+                if record:
+                    self.stats.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+        if record:
+            self.stats.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, expires_at: float) -> None:
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            self.stats.writes += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteTier:
+    """On-disk tier. Values are JSON; the least recently used rows are evicted past `max_entries`."""
+
+    def __init__(self, path: str, max_entries: int) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS lookup_cache (
+                key         TEXT PRIMARY KEY,
+                value       TEXT NOT NULL,
+                expires_at  REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS lookup_cache_accessed ON lookup_cache (accessed_at)")
+        self._conn.commit()
+
+    def get(self, key: str, record: bool = True) -> Optional[Tuple[float, Any]]:
+        """Return (expires_at, value) so the memory tier can be refilled with the same expiry."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM lookup_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                if record:
+                    self.stats.misses += 1
+                return None
+
+            value, expires_at = row
+            if expires_at <= now:
+                self._conn.execute("DELETE FROM lookup_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                self.stats.expirations += 1
+                if record:
+                    self.stats.misses += 1
+                return None
+
+            self._conn.execute("UPDATE lookup_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+
+        if record:
+            self.stats.hits += 1
+        return expires_at, loads(value)
+
+    def set(self, key: str, value: Any, expires_at: float) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO lookup_cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, dumps(value).decode("utf-8"), expires_at, now),
+            )
+            self.stats.writes += 1
+            self._evict()
+            self._conn.commit()
+
+    def set_many(self, entries: List[Tuple[str, Any, float]]) -> None:
+        """(key, value, expires_at) rows in one transaction."""
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO lookup_cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                [(key, dumps(value).decode("utf-8"), expires_at, now) for key, value, expires_at in entries],
+            )
+            self.stats.writes += len(entries)
+            self._evict()
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM lookup_cache WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM lookup_cache").fetchone()
+        overflow = count - self.max_entries
+        if overflow <= 0:
+            return
+        self._conn.execute(
+            "DELETE FROM lookup_cache WHERE key IN "
+            "(SELECT key FROM lookup_cache ORDER BY accessed_at LIMIT ?)",
+            (overflow,),
+        )
+        self.stats.evictions += overflow
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM lookup_cache").fetchone()
+        return count
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class CachedLookup(NamedTuple):
+    """A name answered from the cache: the guess that matched and its stored profile."""
+
+    guess: str
+    profile_url: Optional[str]
+    meet_history: List[MeetResult]
+
+
+class LookupCache:
+    """Memory LRU in front of an optional SQLite tier, with per-kind TTLs.
+
+    Calls that may reach the SQLite tier are blocking; from async code, go
+    through `run()` so they happen on a worker thread.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = config.CACHE_MAX_ENTRIES,
+        path: Optional[str] = None,
+        disk_max_entries: int = config.CACHE_DISK_MAX_ENTRIES,
+        profile_ttl: float = config.CACHE_PROFILE_TTL,
+        miss_ttl: float = config.CACHE_MISS_TTL,
+        history_ttl: float = config.CACHE_HISTORY_TTL,
+    ) -> None:
+        self.memory = MemoryTier(max_entries)
+        self.disk = SQLiteTier(path, disk_max_entries) if path else None
+        self.ttls = {PROFILE: profile_ttl, MISS: miss_ttl, HISTORY: history_ttl, STATS: history_ttl}
+        # one hit or miss per name looked up (see resolve()); the tier counters are per key
+        self.lookups = CacheStats()
+
+    @staticmethod
+    def _key(kind: str, guess: str) -> str:
+        return f"{kind}:{guess}"
+
+    def _get(self, kind: str, guess: str, record: bool = True) -> Optional[Any]:
+        key = self._key(kind, guess)
+        value = self.memory.get(key, record)
+        if value is not None or self.disk is None:
+            return value
+
+        entry = self.disk.get(key, record)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if kind == HISTORY:
+            value = meet_results_from_wire(value)  # disk holds the wire form
+        elif kind == STATS:
+            value = LifterStats.from_wire(value)
+        self.memory.set(key, value, expires_at)  # promote to tier 1
+        return value
+
+    def _set(self, kind: str, guess: str, value: Any) -> None:
+        key = self._key(kind, guess)
+        expires_at = time.time() + self.ttls[kind]
+        self.memory.set(key, value, expires_at)
+        if self.disk is not None:
+            self.disk.set(key, value, expires_at)
+
+    def _delete(self, kind: str, guess: str) -> None:
+        key = self._key(kind, guess)
+        self.memory.delete(key)
+        if self.disk is not None:
+            self.disk.delete(key)
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Call a cache method from async code, on a worker thread when the disk tier is on."""
+        if self.disk is None:
+            return fn(*args)
+        return await asyncio.to_thread(fn, *args)
+
+    # ---------- lookup API ----------
+
+    def resolve(self, guesses: List[str]) -> Tuple[Optional[CachedLookup], List[str]]:
+        """Consult the cache for one name's ranked guesses.
+
+        Returns the cached profile if any guess has a live history; otherwise
+        the guesses still worth fetching - confirmed profiles first (history
+        expired), known 404s dropped. Counts as a single lookup in `stats()`.
+        """
+        for guess in guesses:
+            history = self._get(HISTORY, guess, record=False)
+            if history is not None:
+                self.lookups.hits += 1
+                return CachedLookup(guess, self._get(PROFILE, guess, record=False), history), []
+
+        self.lookups.misses += 1
+        known = [g for g in guesses if self._get(PROFILE, g, record=False)]
+        rest = [g for g in guesses if g not in known and self._get(MISS, g, record=False) is None]
+        return None, known + rest
+
+    def get_profile(self, guess: str) -> Optional[str]:
+        """Return the confirmed profile URL for a guess."""
+        return self._get(PROFILE, guess)
+
+    def get_history(self, guess: str) -> Optional[List[MeetResult]]:
+        return self._get(HISTORY, guess)
+
+    def is_miss(self, guess: str) -> bool:
+        return self._get(MISS, guess) is not None
+
+    def get_stats(self, guess: str) -> Optional[LifterStats]:
+        return self._get(STATS, guess)
+
+    def put_profile(self, guess: str, profile_url: str, meet_history: List[MeetResult]) -> None:
+        self._set(PROFILE, guess, profile_url)
+        self._set(HISTORY, guess, meet_history)
+        self._delete(MISS, guess)
+        self._delete(STATS, guess)  # derived from the old history
+
+    def put_stats(self, guess: str, stats: LifterStats) -> None:
+        self._set(STATS, guess, stats)
+
+    def get_stats_many(self, guesses: Iterable[str]) -> Dict[str, LifterStats]:
+        """Cached stats for each guess that has them."""
+        found = {}
+        for guess in guesses:
+            stats = self._get(STATS, guess)
+            if stats is not None:
+                found[guess] = stats
+        return found
+
+    def put_stats_many(self, stats: Dict[str, LifterStats]) -> None:
+        """Store stats for many guesses; the disk tier writes them in one transaction."""
+        expires_at = time.time() + self.ttls[STATS]
+        entries = [(self._key(STATS, guess), value, expires_at) for guess, value in stats.items()]
+        for key, value, _ in entries:
+            self.memory.set(key, value, expires_at)
+        if self.disk is not None and entries:
+            self.disk.set_many(entries)
+
+    def put_miss(self, guess: str) -> None:
+        self._set(MISS, guess, True)
+        # the profile is gone; don't keep offering it (or its history) ahead of the miss
+        self._delete(PROFILE, guess)
+        self._delete(HISTORY, guess)
+        self._delete(STATS, guess)
+
+    def stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = {
+            "lookups": {"hits": self.lookups.hits, "misses": self.lookups.misses},
+            "memory": {**self.memory.stats.as_dict(), "size": len(self.memory)},
+        }
+        if self.disk is not None:
+            stats["disk"] = {**self.disk.stats.as_dict(), "size": len(self.disk), "path": self.disk.path}
+        return stats
+
+    def close(self) -> None:
+        if self.disk is not None:
+            self.disk.close()
+
+
+# ---------- shared instance ----------
+
+_default_cache: Optional[LookupCache] = None
+
+
+def get_lookup_cache() -> Optional[LookupCache]:
+    """Return the process-wide cache, built from config on first use (None when disabled)."""
+    global _default_cache
+    if not config.CACHE_ENABLED:
+        return None
+    if _default_cache is None:
+        _default_cache = LookupCache(path=config.CACHE_PATH or None)
+        logger.info("Lookup cache ready (disk tier: %s)", config.CACHE_PATH or "off")
+    return _default_cache
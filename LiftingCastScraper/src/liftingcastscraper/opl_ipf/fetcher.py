@@ -1,7 +1,24 @@
-from bs4 import BeautifulSoup
-from typing import List, Dict, Optional
+import asyncio
+from typing import List, Optional
 import aiohttp
-import requests # switched to aiohttp for async requests
+
+from .. import config
+from ..http_client import HttpSession
+from ..instrumentation import inc
+from ..models import MeetResult
+from .http_cache import HttpCache, get_http_cache
+from .parse_pool import parse_profile_html_async
+from .parsers import parse_display_name, to_attempts
+from .scheduler import FetchScheduler, get_fetch_scheduler
+
+def profile_url_for(username: str) -> str:
+    """Profile URL for a username on the configured OpenIPF host."""
+    return f"{config.OPENIPF_BASE_URL}/u/{username}"
+
+
+class PageNotFound(ValueError):
+    """The profile URL returned 404 — the username does not exist."""
+
 
 # thank you to georgehawkins0 for this code, changed it to fit my needs
 class Page:
@@ -13,26 +30,29 @@ class Page:
     HEADER_ROW_INDEX = 0
     FIRST_DATA_ROW_INDEX = 1
     SUCCESS_STATUS_CODE = 200
+    NOT_MODIFIED_STATUS_CODE = 304
+    NOT_FOUND_STATUS_CODE = 404
 
     # remember to call data = await page.get_data() from an async function after creating the Page instance. Removed this from init to allow for async calling (__init__ cannot be async).
     def __init__(self, url: Optional[str] = None, username: Optional[str] = None) -> None: 
         self.fetched = False
         self._data = None
+        self.display_name: Optional[str] = None  # set when the page itself was downloaded (not on a 304)
 
         if url:
             self._url = url
         else:
             if not username:
                 raise ValueError('Either url or username must be provided')
-            self._url = f"https://www.openipf.org/u/{username}"
+            self._url = profile_url_for(username)
         
         if not self.url_validator():
             raise ValueError(f"Invalid url: {self._url}")
 
             
-    async def fetch(self, session: aiohttp.ClientSession) -> None:
+    async def fetch(self, session: HttpSession, scheduler: Optional[FetchScheduler] = None) -> None:
         """Fetch the page data and store it"""
-        self._data = await self.request(session)
+        self._data = await self.request(session, scheduler)
         self.fetched = True
 
     @staticmethod
@@ -41,66 +61,57 @@ class Page:
         Extract float values from lift attempt HTML elements.
         Ignores failures or non-numeric entries.
         """
-        attempts = []
-        for cell in cells:
-            text = cell.text.strip() 
-            try:
-                attempts.append(float(text))
-            except ValueError:
-                continue
-        return attempts
+        return to_attempts(cell.text.strip() for cell in cells)
 
-    async def request(self, session: aiohttp.ClientSession) -> List[Dict]:
+    async def request(
+        self,
+        session: HttpSession,
+        scheduler: Optional[FetchScheduler] = None,
+        http_cache: Optional[HttpCache] = None,
+    ) -> List[MeetResult]:
         """Send request, parse HTML, return structured table data."""
-        async with session.get(self._url) as response: # sends get requests non-blockingly
-            if response.status != self.SUCCESS_STATUS_CODE:
-                raise ValueError(f"URL returned {response.status}: {self._url}") # raise - fucntion cannot continue
-            html = await response.text() 
-        
-        
-        soup = BeautifulSoup(html, 'html.parser')
-
-        tables = soup.find_all("table")
-        if len(tables) < 2:
-            raise ValueError(f"No data table found at URL: {self._url}")
-        
-        table = tables[self.FIRST_DATA_ROW_INDEX]
-
-        rows = table.find_all("tr")
-        if not rows:
-            raise ValueError("No table rows found.")
-        
-        header_cells = rows[self.HEADER_ROW_INDEX].find_all(['td', 'th'])
-        keys = [cell.text.strip() for cell in header_cells]
-
-        data = []
+        scheduler = scheduler or get_fetch_scheduler()
+        http_cache = http_cache or get_http_cache()
 
-        for row in rows[self.FIRST_DATA_ROW_INDEX:]:
-            squat_attempts = self.extract_lift_attempts(row.find_all("td", class_="squat"))
-            bench_attempts = self.extract_lift_attempts(row.find_all("td", class_="bench"))
-            deadlift_attempts = self.extract_lift_attempts(row.find_all("td", class_="deadlift"))
-        
-            cells = row.find_all(["td", "th"])
-            row_data = [cell.text.strip() for cell in cells]
+        # revalidate a stored copy instead of downloading it again
+        # (cache calls block on SQLite and decompression, so they run in a thread)
+        cached = await asyncio.to_thread(http_cache.get, self._url) if http_cache is not None else None
 
-            d = dict(zip(keys, row_data))
-            d["Squat"] = squat_attempts
-            d["Bench"] = bench_attempts
-            d["Deadlift"] = deadlift_attempts
+        # rate-limited, retried on 429/5xx, bounded by an overall deadline
+        response = await scheduler.fetch(session, self._url, headers=cached.validators() if cached else None)
+        if response.status == self.NOT_MODIFIED_STATUS_CODE and cached is not None:
+            inc("lcs_http_cache_total", result="not_modified")
+            return await asyncio.to_thread(http_cache.revalidated, cached)
+        if response.status == self.NOT_FOUND_STATUS_CODE:
+            if cached is not None:
+                await asyncio.to_thread(http_cache.delete, self._url)
+            raise PageNotFound(f"URL returned {response.status}: {self._url}")
+        if response.status != self.SUCCESS_STATUS_CODE:
+            raise ValueError(f"URL returned {response.status}: {self._url}") # raise - fucntion cannot continue
+        html = response.text
+        self.display_name = parse_display_name(html)
 
-            data.append(d)
-        
+        # parsed in the shared parse pool so the event loop stays responsive
+        data = await parse_profile_html_async(html, self._url)
+        if http_cache is not None:
+            stored = await asyncio.to_thread(http_cache.put, self._url, response.headers, html, data)
+            inc("lcs_http_cache_total", result="stored" if stored else "uncacheable")
         return data
-    
+
     # learning note, when passing in a tuple, python iterates through each element
     def url_validator(self):
         """Check if URL begins with known valid base URLs."""
-        return self._url.startswith(self.BASE_URLS)
+        return self._url.startswith(self.BASE_URLS + (profile_url_for(""),))
         
-    async def get_data(self, session: aiohttp.ClientSession, refresh_data: bool = False) -> List[Dict]:
+    async def get_data(
+        self,
+        session: HttpSession,
+        refresh_data: bool = False,
+        scheduler: Optional[FetchScheduler] = None,
+    ) -> List[MeetResult]:
         """Return the parsed data"""
         if refresh_data or not self.fetched:
-            await self.fetch(session)
+            await self.fetch(session, scheduler)
         return self._data
     
     def get_url(self) -> str:
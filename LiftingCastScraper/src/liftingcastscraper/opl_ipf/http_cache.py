@@ -0,0 +1,241 @@
+"""
+Conditional-request cache for OpenIPF profile pages.
+
+For every profile response that carries a validator (ETag and/or
+Last-Modified), the parsed `meet_history` is stored compressed (zstd when
+`zstandard` is installed, gzip otherwise) next to the validators; the HTML
+itself is not kept. The next fetch of that URL sends If-None-Match /
+If-Modified-Since; on 304 the stored parse is returned, so an unchanged
+profile costs one tiny response and no HTML parsing.
+
+Entries live in SQLite (a file, or in memory when no path is configured) and
+the total stored size is held under a byte budget (LCS_HTTP_CACHE_MAX_MB,
+small by default since the in-memory store counts against the process) by
+evicting the least recently used entries. The methods block on compression
+and SQLite, so async callers run them with asyncio.to_thread.
+"""
+
+import gzip
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional
+
+from .. import config
+from ..models import MeetResult, dumps, loads, meet_results_from_wire
+
+logger = logging.getLogger(__name__)
+
+try:
+    import zstandard as _zstd
+except ImportError:  # pragma: no cover - optional dependency
+    _zstd = None
+
+ZSTD = "zstd"
+GZIP = "gzip"
+
+
+def resolve_codec(name: str = "auto") -> str:
+    if name == "auto":
+        return ZSTD if _zstd is not None else GZIP
+    if name == ZSTD and _zstd is None:
+        raise RuntimeError("zstd compression requested but zstandard is not installed")
+    if name not in (ZSTD, GZIP):
+        raise ValueError(f"Unknown HTTP cache codec {name!r}")
+    return name
+
+
+def compress(data: bytes, codec: str) -> bytes:
+    if codec == ZSTD:
+        return _zstd.ZstdCompressor(level=6).compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+
+def decompress(data: bytes, codec: str) -> bytes:
+    if codec == ZSTD:
+        if _zstd is None:
+            raise RuntimeError("entry is zstd-compressed but zstandard is not installed")
+        return _zstd.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+@dataclass
+class CachedResponse:
+    url: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    codec: str
+    parsed: bytes   # compressed JSON of the parse result
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional headers for revalidating this entry."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def meet_history(self) -> List[MeetResult]:
+        return meet_results_from_wire(loads(decompress(self.parsed, self.codec)))
+
+
+class HttpCache:
+    """Validator-keyed response store with a byte budget and LRU eviction."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_bytes: int = config.HTTP_CACHE_MAX_MB * 1024 * 1024,
+        codec: str = config.HTTP_CACHE_CODEC,
+    ) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.codec = resolve_codec(codec)
+        self._lock = threading.Lock()
+
+        self.hits = 0           # 304 answered from the cache
+        self.misses = 0         # no entry, or the server sent a fresh body
+        self.stores = 0
+        self.evictions = 0
+        self.bytes_saved = 0    # body bytes not downloaded thanks to 304s
+
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(http_cache)")}
+        if "body" in columns:  # a store from when the HTML was kept too; it is only a cache
+            self._conn.execute("DROP TABLE http_cache")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS http_cache (
+                url           TEXT PRIMARY KEY,
+                etag          TEXT,
+                last_modified TEXT,
+                codec         TEXT NOT NULL,
+                parsed        BLOB NOT NULL,
+                raw_size      INTEGER NOT NULL,
+                size          INTEGER NOT NULL,
+                accessed_at   REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS http_cache_accessed ON http_cache (accessed_at)")
+        self._conn.commit()
+        (self._bytes,) = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM http_cache").fetchone()
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, codec, parsed FROM http_cache WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        return CachedResponse(url, *row)
+
+    def revalidated(self, entry: CachedResponse) -> List[MeetResult]:
+        """Record a 304 for `entry`, bump it in the LRU order and return its stored parse."""
+        with self._lock:
+            row = self._conn.execute("SELECT raw_size FROM http_cache WHERE url = ?", (entry.url,)).fetchone()
+            self._conn.execute("UPDATE http_cache SET accessed_at = ? WHERE url = ?", (time.time(), entry.url))
+            self._conn.commit()
+        self.hits += 1
+        if row is not None:
+            self.bytes_saved += row[0]
+        return entry.meet_history()
+
+    def put(self, url: str, headers: Mapping[str, str], html: str, meet_history: List[MeetResult]) -> bool:
+        """
+        Store the parse of a 200 response. `headers` is a case-insensitive
+        mapping (as FetchResult and aiohttp give it); `html` is only measured,
+        for bytes_saved on later 304s. Responses without validators, or
+        marked no-store, are skipped.
+        """
+        self.misses += 1
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if not (etag or last_modified) or "no-store" in (headers.get("Cache-Control") or ""):
+            return False
+
+        parsed = compress(dumps(meet_history), self.codec)
+        size = len(parsed)
+        if size > self.max_bytes:
+            return False
+
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM http_cache WHERE url = ?", (url,)).fetchone()
+            self._bytes += size - (old[0] if old else 0)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO http_cache "
+                "(url, etag, last_modified, codec, parsed, raw_size, size, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, self.codec, parsed, len(html.encode("utf-8")), size, time.time()),
+            )
+            self._evict()
+            self._conn.commit()
+        self.stores += 1
+        return True
+
+    def delete(self, url: str) -> None:
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM http_cache WHERE url = ?", (url,)).fetchone()
+            if old is not None:
+                self._bytes -= old[0]
+                self._conn.execute("DELETE FROM http_cache WHERE url = ?", (url,))
+                self._conn.commit()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the stored size fits the budget (lock held)."""
+        if self._bytes <= self.max_bytes:
+            return
+        victims = []
+        for url, size in self._conn.execute("SELECT url, size FROM http_cache ORDER BY accessed_at"):
+            victims.append((url,))
+            self._bytes -= size
+            if self._bytes <= self.max_bytes:
+                break
+        self._conn.executemany("DELETE FROM http_cache WHERE url = ?", victims)
+        self.evictions += len(victims)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, stored, raw = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(raw_size), 0) FROM http_cache"
+            ).fetchone()
+        return {
+            "entries": entries,
+            "bytes": stored,
+            "raw_bytes": raw,
+            "max_bytes": self.max_bytes,
+            "codec": self.codec,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "bytes_saved": self.bytes_saved,
+            "path": self.path,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# ---------- shared instance ----------
+
+_default_cache: Optional[HttpCache] = None
+
+
+def get_http_cache() -> Optional[HttpCache]:
+    """Return the process-wide HTTP cache, built from config on first use (None when disabled)."""
+    global _default_cache
+    if not config.HTTP_CACHE_ENABLED:
+        return None
+    if _default_cache is None:
+        _default_cache = HttpCache(path=config.HTTP_CACHE_PATH or None)
+        logger.info("HTTP cache ready (%s, %s)", config.HTTP_CACHE_PATH or "memory", _default_cache.codec)
+    return _default_cache
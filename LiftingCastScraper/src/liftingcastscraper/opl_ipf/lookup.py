@@ -1,45 +1,138 @@
+import asyncio
 import aiohttp
-from .fetcher import Page
+from typing import Dict, List, Optional, Tuple
+from .. import config
+from ..http_client import HttpSession
+from .cache import LookupCache, get_lookup_cache
+from .fetcher import Page, PageNotFound, profile_url_for
+from .names import NameIndex, get_name_index, merge_guesses, username_candidates
+from .scheduler import FetchScheduler, get_fetch_scheduler
+from ..instrumentation import inc, span
+from ..singleflight import SingleFlight
 import logging
 
 logger = logging.getLogger(__name__) # __name__ is the module name e.g. __name__ == "openipf.fetcher"
 
+# concurrent lookups of the same name (several reports / meets at once) share one fetch
+lookup_flight = SingleFlight("openipf_lookup")
 
-async def try_fetch_openipf(name: str, session: aiohttp.ClientSession) -> dict | None:
+
+async def try_fetch_openipf(
+    name: str,
+    session: HttpSession,
+    cache: Optional[LookupCache] = None,
+    scheduler: Optional[FetchScheduler] = None,
+) -> dict | None:
     """
     Try fetching OpenIPF data using username guessing and URL fallback.
+    Results (including 404s) are remembered in the lookup cache, so re-running
+    a roster only hits openipf.org for guesses we have not seen recently.
     Returns:
         {
             "profile_url": "...",
             "meet_history": [...]
         }
     or None if not found.
+
+    Concurrent calls for the same name with the shared cache and scheduler
+    are coalesced into one lookup.
     """
 
     if not name:
         raise ValueError("Name must be provided")
-    
-    guesses = generate_username_guesses(name)
-    logger.info("Trying OpenIPF lookup for '%s' with %d username guesses", name, len(guesses))
-
-    for guess in guesses:
-        try:
-            url = f"https://www.openipf.org/u/{guess}"
-            page = Page(url=url)
-
-            logger.info(" → Trying username guess: %s", guess)
-
-            data = await page.get_data(session)  # async HTML fetch + parse
-
-            logger.info(" ✓ Match found for %s → %s", name, url)
-
+    if cache is None and scheduler is None:
+        return await lookup_flight.do(name, lambda: _try_fetch_openipf(name, session))
+    return await _try_fetch_openipf(name, session, cache, scheduler)
+
+
+async def _try_fetch_openipf(
+    name: str,
+    session: HttpSession,
+    cache: Optional[LookupCache] = None,
+    scheduler: Optional[FetchScheduler] = None,
+) -> dict | None:
+    cache = cache or get_lookup_cache()
+    scheduler = scheduler or get_fetch_scheduler()
+    names = get_name_index()
+    guesses, confident = await _ranked_guesses(name, names)
+
+    if cache is not None:
+        # known profiles first (history expired, profile still confirmed), known 404s skipped
+        hit, guesses = await cache.run(cache.resolve, guesses)
+        if hit is not None:
+            logger.info(" ✓ Cache hit for %s → %s", name, hit.guess)
+            inc("lcs_openipf_guesses_total", result="cache_hit")
             return {
-                "profile_url": url,
-                "meet_history": data,
+                "profile_url": hit.profile_url or profile_url_for(hit.guess),
+                "meet_history": hit.meet_history,
             }
 
-        except Exception as e:
-            logger.warning(" ✗ Guess '%s' failed (%s)", guess, e)
+    logger.info("Trying OpenIPF lookup for '%s' with %d username guesses", name, len(guesses))
+
+    # The top guess is fetched outright (it is usually the hit); the others are
+    # probed at the same time with status-only requests, so a lifter with no
+    # profile costs one round-trip instead of one per guess.
+    # An exact name-index match is fetched on its own; the rest are only
+    # tried (one by one) if it turns out to be stale.
+    probes: Dict[str, asyncio.Future] = {}
+    if config.FETCH_PROBE and not confident:
+        probes = {
+            guess: asyncio.ensure_future(_probe_guess(guess, session, scheduler))
+            for guess in guesses[1:]
+        }
+
+    try:
+        for guess in guesses:
+            probe = probes.get(guess)
+            if probe is not None:
+                status = await probe
+                if status == Page.NOT_FOUND_STATUS_CODE:
+                    logger.warning(" ✗ Guess '%s' failed (probe returned %d)", guess, status)
+                    inc("lcs_openipf_guesses_total", result="miss")
+                    if cache is not None:
+                        await cache.run(cache.put_miss, guess)
+                    continue
+                if status is not None and status != Page.SUCCESS_STATUS_CODE:
+                    logger.warning(" ✗ Guess '%s' failed (probe returned %d)", guess, status)
+                    inc("lcs_openipf_guesses_total", result="error")
+                    continue
+                # 200, or the probe itself failed: fall through to a full fetch
+
+            try:
+                url = profile_url_for(guess)
+                page = Page(url=url)
+
+                logger.info(" → Trying username guess: %s", guess)
+
+                with span("openipf_guess"):
+                    data = await page.get_data(session, scheduler=scheduler)  # rate-limited fetch + parse
+                inc("lcs_openipf_guesses_total", result="hit")
+
+                logger.info(" ✓ Match found for %s → %s", name, url)
+                if cache is not None:
+                    await cache.run(cache.put_profile, guess, url, data)
+                if names is not None and page.display_name:
+                    # filed under OpenIPF's spelling, not the roster's
+                    await asyncio.to_thread(names.add, guess, page.display_name)
+
+                return {
+                    "profile_url": url,
+                    "meet_history": data,
+                }
+
+            except PageNotFound as e:
+                logger.warning(" ✗ Guess '%s' failed (%s)", guess, e)
+                inc("lcs_openipf_guesses_total", result="miss")
+                if cache is not None:
+                    await cache.run(cache.put_miss, guess)
+
+            except Exception as e:
+                logger.warning(" ✗ Guess '%s' failed (%s)", guess, e)
+                inc("lcs_openipf_guesses_total", result="error")
+    finally:
+        # lower-priority probes still in flight are no longer needed
+        for probe in probes.values():
+            probe.cancel()
 
     logger.warning("No OpenIPF profile found for '%s'", name)
 
@@ -58,29 +151,44 @@ async def try_fetch_openipf(name: str, session: aiohttp.ClientSession) -> dict |
     return None  # No match found
 
 
-def generate_username_guesses(name: str):
+async def _probe_guess(guess: str, session: HttpSession, scheduler: FetchScheduler) -> Optional[int]:
+    """Status code for a guess's profile URL, or None if the probe itself failed."""
+    try:
+        with span("openipf_probe"):
+            return await scheduler.probe(session, profile_url_for(guess))
+    except Exception as e:
+        logger.info(" ? Probe for '%s' failed (%s)", guess, e)
+        return None
+
+
+async def _ranked_guesses(name: str, names: Optional[NameIndex]) -> Tuple[List[str], bool]:
+    """
+    Usernames to try for `name`, best first, capped at NAME_MAX_GUESSES: the
+    heuristic guesses merged with name-index candidates (see
+    names.merge_guesses). Every one of them is either filed under this exact
+    name or a username the name itself produces, so a profile found under any
+    of them belongs to this lifter. The flag says whether the first one is an
+    exact index match.
+    """
+    guesses = generate_username_guesses(name)
+    if names is None:
+        return guesses[:config.NAME_MAX_GUESSES], False
+
+    candidates = await asyncio.to_thread(
+        names.search, name, limit=config.NAME_MATCH_CANDIDATES, min_score=config.NAME_MATCH_MIN_SCORE
+    )
+    ranked, confident = merge_guesses(name, guesses, candidates)
+    if candidates:
+        logger.info(" ~ Name index for '%s': %s", name, ", ".join(f"{c.username} ({c.score})" for c in candidates))
+        inc("lcs_name_index_total", result="confident" if confident else "candidate")
+    else:
+        inc("lcs_name_index_total", result="none")
+    return ranked[:config.NAME_MAX_GUESSES], confident
+
+
+def generate_username_guesses(name: str) -> List[str]:
     """
-    Given a name, generate common username variants:
+    Given a name, generate likely username variants, most likely first
+    (accents folded, separators dropped; see names.username_candidates).
     """
-    base = name.lower()
-
-    # normalize pieces
-    no_space = base.replace(" ", "")
-    no_dash = no_space.replace("-", "")
-    with_dashes = base.replace(" ", "-")
-
-    guesses = [
-        no_dash,       # most reliable, OPENIPF-style
-        no_space,      
-        with_dashes,   
-    ]
-
-    # Keep order, ensure uniqueness. Ensures no_dash is tried first
-    seen = set()
-    ordered = []
-    for g in guesses:
-        if g not in seen:
-            ordered.append(g)
-            seen.add(g)
-
-    return ordered
+    return username_candidates(name)
@@ -0,0 +1,308 @@
+"""
+Name resolution for OpenIPF lookups.
+
+Roster names rarely match OpenIPF usernames character for character:
+accents ("José García" -> josegarcia), apostrophes (O'Brien -> obrien),
+suffixes ("Jr."), middle names or initials that one side has and the other
+does not. Two pieces deal with that:
+
+    username_candidates(name)   heuristic usernames, most likely first
+                                (folded, separators dropped - the OPL rule)
+    NameIndex                   known usernames with their OpenIPF display
+                                names, found by folded name or by first and
+                                last name, filled from successful lookups
+                                (and optionally the bulk OpenPowerlifting
+                                index)
+
+`NameIndex.search()` returns ranked candidates with a 0..1 score;
+`merge_guesses()` decides which of them the lookup may try. Only an entry
+filed under exactly the lifter's (folded) name is trusted outright. Any other
+candidate must be a username the lifter's own name produces, so a namesake
+with an extra middle name is never taken for them. (There is no looser
+matching on purpose: spelling variants close enough to be the same person
+score below namesakes that differ by a middle name, so no threshold separates
+the two.)
+
+    python -m liftingcastscraper.opl_ipf.names seed --index opl.sqlite --names names.sqlite
+    python -m liftingcastscraper.opl_ipf.names search "Jose Maria Garcia Jr" --names names.sqlite
+"""
+
+import argparse
+import itertools
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from .. import config
+
+logger = logging.getLogger(__name__)
+
+# letters NFKD does not decompose into ASCII
+_TRANSLATE = str.maketrans({
+    "ø": "o", "Ø": "o", "æ": "ae", "Æ": "ae", "œ": "oe", "Œ": "oe", "ł": "l", "Ł": "l",
+    "đ": "d", "Đ": "d", "ð": "d", "þ": "th", "Þ": "th", "ı": "i",
+})
+_APOSTROPHES = re.compile(r"[’'`´]")
+_DISAMBIGUATION = re.compile(r"#\d+\s*$")
+SUFFIXES = frozenset({"jr", "sr", "ii", "iii", "iv", "v"})
+
+LOOKUP = "lookup"
+BULK = "bulk"
+
+
+def fold(text: str) -> str:
+    """Lowercase ASCII: accents stripped, special letters transliterated, apostrophes dropped."""
+    text = unicodedata.normalize("NFKD", text.translate(_TRANSLATE))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return _APOSTROPHES.sub("", text).casefold()
+
+
+def name_tokens(name: str, keep_suffix: bool = False) -> List[str]:
+    """'Seán O'Brien-Walsh Jr.' -> ['sean', 'obrien', 'walsh'] (+ 'jr' with keep_suffix)."""
+    name = _DISAMBIGUATION.sub("", name)
+    tokens = re.sub(r"[^a-z0-9]+", " ", fold(name)).split()
+    if keep_suffix:
+        return tokens
+    return [t for t in tokens if t not in SUFFIXES] or tokens
+
+
+def name_key(name: str) -> str:
+    return " ".join(name_tokens(name))
+
+
+def short_key(key: str) -> str:
+    """First and last name only: 'jose maria garcia' -> 'jose garcia'."""
+    tokens = key.split()
+    return f"{tokens[0]} {tokens[-1]}" if len(tokens) > 1 else key
+
+
+def username_candidates(name: str) -> List[str]:
+    """
+    Likely OpenIPF usernames for a roster name, most likely first. Usernames
+    are the folded name without separators, so punctuation never varies;
+    what varies is which tokens made it in (middle names, suffixes).
+    """
+    tokens = name_tokens(name, keep_suffix=True)
+    core = [t for t in tokens if t not in SUFFIXES] or tokens
+    if not core:
+        return []
+
+    candidates = ["".join(tokens)]                    # as written, suffix included ("johnsmithjr")
+    candidates.append("".join(core))                   # suffix dropped
+    if len(core) > 2:
+        candidates.append(core[0] + core[-1])          # middle name(s) dropped
+
+    seen: Set[str] = set()
+    return [c for c in candidates if not (c in seen or seen.add(c))]
+
+
+def username_matches(username: str, name: str) -> bool:
+    """Whether OpenIPF could have made `username` from `name` (namesakes get a number: johnsmith2)."""
+    return (username.rstrip("0123456789") or username) in username_candidates(name)
+
+
+def trigrams(key: str) -> Set[str]:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def similarity(a: str, b: str) -> float:
+    """0..1 similarity of two name keys: trigram Dice, with first+last-name agreement counted high."""
+    if a == b:
+        return 1.0
+    if a.replace(" ", "") == b.replace(" ", ""):
+        return 0.97  # "o connor" vs "oconnor" - the same username
+    ga, gb = trigrams(a), trigrams(b)
+    dice = 2 * len(ga & gb) / (len(ga) + len(gb)) if ga and gb else 0.0
+    ta, tb = a.split(), b.split()
+    if len(ta) > 1 and len(tb) > 1 and ta[0] == tb[0] and ta[-1] == tb[-1]:
+        # same first and last name; only middle names / initials differ
+        return max(dice, 0.92)
+    if sorted(ta) == sorted(tb):
+        return max(dice, 0.9)  # "Smith John" vs "John Smith"
+    return dice
+
+
+class Candidate(NamedTuple):
+    username: str
+    display_name: str
+    score: float
+
+
+def merge_guesses(name: str, guesses: List[str], candidates: Iterable[Candidate]) -> Tuple[List[str], bool]:
+    """
+    Usernames to try for `name`, best first, and whether the first is a
+    confident match. Index entries filed under exactly this name come first
+    and are confident; then the top heuristic guess; then the other index
+    candidates, but only those `username_matches` the name; then the rest.
+    """
+    key = name_key(name)
+    candidates = list(candidates)
+    exact = [c.username for c in candidates if name_key(c.display_name) == key]
+    fuzzy = [c.username for c in candidates if c.username not in exact and username_matches(c.username, name)]
+    ranked = exact + guesses[:1] + fuzzy + guesses[1:]
+    return list(dict.fromkeys(ranked)), bool(exact)
+
+
+class NameIndex:
+    """
+    Known OpenIPF usernames and display names, in SQLite (file or memory).
+
+    Exact and first+last-name matches come from indexed key columns. Calls
+    block on SQLite; from async code run them in a thread.
+    """
+
+    BATCH = 5000  # rows per write transaction in add_many
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self.searches = 0
+        self.matches = 0
+
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS names (
+                username     TEXT PRIMARY KEY,
+                display_name TEXT NOT NULL,
+                key          TEXT NOT NULL,
+                short_key    TEXT NOT NULL,
+                source       TEXT NOT NULL,
+                updated_at   REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS names_key ON names (key);
+            CREATE INDEX IF NOT EXISTS names_short_key ON names (short_key);
+            DROP TABLE IF EXISTS name_grams;
+            DROP TABLE IF EXISTS gram_counts;
+            """
+        )
+        self._conn.commit()
+
+    def add(self, username: str, display_name: str, source: str = LOOKUP) -> None:
+        self.add_many([(username, display_name)], source=source)
+
+    def add_many(self, entries: Iterable[Tuple[str, str]], source: str = LOOKUP) -> int:
+        """Insert or refresh (username, display_name) pairs. Returns how many were written."""
+        count = 0
+        entries = iter(entries)
+        while True:
+            batch: Dict[str, Tuple[str, str]] = {}
+            for username, display_name in itertools.islice(entries, self.BATCH):
+                key = name_key(display_name)
+                if username and key:
+                    batch[username] = (display_name, key)
+            if not batch:
+                return count
+            with self._lock:
+                self._write_batch(batch, source)
+            count += len(batch)
+
+    def _write_batch(self, batch: Dict[str, Tuple[str, str]], source: str) -> None:
+        now = time.time()
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO names (username, display_name, key, short_key, source, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            ((u, name, key, short_key(key), source, now) for u, (name, key) in batch.items()),
+        )
+        self._conn.commit()
+
+    def search(self, name: str, limit: int = 3, min_score: float = 0.0) -> List[Candidate]:
+        """
+        Known usernames filed under the same name, or the same first and
+        last name, best first. Ties go to the most recently confirmed entry.
+        """
+        key = name_key(name)
+        if not key:
+            return []
+        with self._lock:
+            self.searches += 1
+            rows = self._conn.execute(
+                "SELECT username, display_name, key, updated_at FROM names WHERE key = ? OR short_key = ?",
+                (key, short_key(key)),
+            ).fetchall()
+
+        scored = sorted(
+            {(similarity(key, other_key), updated_at, username, display_name)
+             for username, display_name, other_key, updated_at in rows},
+            reverse=True,
+        )
+        candidates = [
+            Candidate(username, display_name, round(score, 3))
+            for score, _, username, display_name in scored[:limit]
+            if score >= min_score
+        ]
+        if candidates:
+            self.matches += 1
+        return candidates
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM names").fetchone()
+        return count
+
+    def stats(self) -> Dict[str, Any]:
+        return {"names": len(self), "searches": self.searches, "matches": self.matches, "path": self.path}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# ---------- shared instance ----------
+
+_default_index: Optional[NameIndex] = None
+
+
+def get_name_index() -> Optional[NameIndex]:
+    """Return the process-wide name index, built from config on first use (None when disabled)."""
+    global _default_index
+    if not config.NAME_INDEX_ENABLED:
+        return None
+    if _default_index is None:
+        _default_index = NameIndex(path=config.NAME_INDEX_PATH or None)
+        logger.info("Name index ready (%s, %d names)", config.NAME_INDEX_PATH or "memory", len(_default_index))
+    return _default_index
+
+
+# ---------- CLI ----------
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="OpenIPF name index")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seed = commands.add_parser("seed", help="load usernames from a bulk OpenPowerlifting index")
+    seed.add_argument("--index", required=True, help="bulk index built by opl_ipf.bulk_index")
+    seed.add_argument("--names", default=config.NAME_INDEX_PATH, required=not config.NAME_INDEX_PATH)
+
+    search = commands.add_parser("search", help="ranked candidates for a name")
+    search.add_argument("name")
+    search.add_argument("--names", default=config.NAME_INDEX_PATH, required=not config.NAME_INDEX_PATH)
+    search.add_argument("--limit", type=int, default=5)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    index = NameIndex(args.names)
+    if args.command == "seed":
+        from .bulk_index import BulkIndex
+
+        bulk = BulkIndex(args.index)
+        written = index.add_many(bulk.iter_lifters(), source=BULK)
+        bulk.close()
+        print(f"{written} names loaded into {args.names}")
+    else:
+        for candidate in index.search(args.name, limit=args.limit):
+            print(f"{candidate.score:.3f}  {candidate.username:<30} {candidate.display_name}")
+    index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Profile parsing off the event loop.
+
+When hundreds of lookups come back together, parsing them inline blocks the
+asyncio loop for seconds (and /healthz with it). Page.request hands the raw
+HTML to a shared executor instead and awaits the result.
+
+    LCS_PARSE_POOL=process  - ProcessPoolExecutor (default), sidesteps the GIL
+    LCS_PARSE_POOL=thread   - ThreadPoolExecutor, cheaper to start
+    LCS_PARSE_POOL=off      - parse inline on the loop
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional
+
+from .. import config
+from ..instrumentation import span
+from ..models import MeetResult, intern_results
+from .parsers import parse_profile_html, resolve_backend
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[Executor] = None
+
+
+def available_cores() -> int:
+    """CPUs this process may run on (respects container CPU affinity)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # macOS / Windows
+        return os.cpu_count() or 1
+
+
+def get_parse_executor() -> Optional[Executor]:
+    """Return the shared executor, creating it on first use (None when pooling is off)."""
+    global _executor
+    if _executor is not None or config.PARSE_POOL == "off":
+        return _executor
+
+    workers = config.PARSE_POOL_SIZE or available_cores()
+    if config.PARSE_POOL == "thread":
+        _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="parse")
+    elif config.PARSE_POOL == "process":
+        # never fork a process that is running an event loop and Chromium pipes
+        methods = multiprocessing.get_all_start_methods()
+        ctx = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        _executor = ProcessPoolExecutor(max_workers=workers, mp_context=ctx)
+    else:
+        raise ValueError(f"Unknown parse pool: {config.PARSE_POOL}")
+
+    logger.info("Parse pool started (%s, %d workers)", config.PARSE_POOL, workers)
+    return _executor
+
+
+def shutdown_parse_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def parse_profile_html_async(html: str, url: str = "") -> List[MeetResult]:
+    """Parse in the shared pool, or inline when the pool is disabled."""
+    with span("parse"):
+        return await _parse(html, url)
+
+
+async def _parse(html: str, url: str) -> List[MeetResult]:
+    # resolve here so workers use the same backend regardless of their environment
+    backend = resolve_backend()
+    executor = get_parse_executor()
+    if executor is None:
+        return parse_profile_html(html, url, backend)
+
+    loop = asyncio.get_running_loop()
+    try:
+        rows = await loop.run_in_executor(executor, parse_profile_html, html, url, backend)
+    except BrokenProcessPool:
+        # a worker died (e.g. OOM-killed); start a fresh pool next time, parse this one inline
+        logger.warning("Parse pool broken, recreating it")
+        shutdown_parse_executor()
+        return parse_profile_html(html, url, backend)
+    # strings interned in a worker process arrive as fresh copies; share them with the rest again
+    return intern_results(rows) if isinstance(executor, ProcessPoolExecutor) else rows
+
+
+def _warm_worker(backend: str) -> int:
+    """Runs in a pool worker: load the parser backend so the first real parse does not pay for it."""
+    try:
+        parse_profile_html("<table></table>", "warm-up", backend)
+    except ValueError:
+        pass  # no data tables, as expected
+    return os.getpid()
+
+
+async def warm_parse_pool() -> int:
+    """Start the pool's workers ahead of the first lookup. Returns how many distinct workers answered."""
+    backend = resolve_backend()
+    executor = get_parse_executor()
+    if executor is None:
+        _warm_worker(backend)
+        return 0
+    workers = config.PARSE_POOL_SIZE or available_cores()
+    # submit() starts worker processes synchronously, so keep it off the loop
+    futures = await asyncio.to_thread(lambda: [executor.submit(_warm_worker, backend) for _ in range(workers)])
+    pids = await asyncio.gather(*(asyncio.wrap_future(future) for future in futures))
+    return len(set(pids))
@@ -0,0 +1,267 @@
+"""
+Fetch scheduler for OpenIPF requests.
+
+Every profile request goes through one scheduler so a 400-lifter roster does
+not fire hundreds of requests at openipf.org at once:
+    - a global concurrency cap (semaphore)
+    - a per-host token bucket (requests / second with a burst)
+    - exponential backoff with jitter on 429 / 5xx and network errors
+    - an overall deadline per fetch, retries included
+    - status-only probes (HEAD, or a GET dropped after the status line)
+"""
+
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Mapping, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+from multidict import CIMultiDict
+
+from .. import config
+from ..http_client import HttpSession
+from ..instrumentation import inc
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+HEAD_UNSUPPORTED_STATUS_CODES = frozenset({405, 501})
+
+
+@dataclass
+class FetchResult:
+    url: str
+    status: int
+    text: str
+    headers: Mapping[str, str] = field(default_factory=CIMultiDict)  # case-insensitive, like aiohttp's
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, holding at most `burst`."""
+
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:  # first come, first served
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class FetchScheduler:
+    """Bounded-concurrency, rate-limited fetcher shared by every OpenIPF lookup."""
+
+    def __init__(
+        self,
+        max_concurrency: int = config.FETCH_MAX_CONCURRENCY,
+        rate_per_host: float = config.FETCH_RATE_PER_HOST,
+        burst: float = config.FETCH_BURST,
+        max_retries: int = config.FETCH_MAX_RETRIES,
+        backoff_base: float = config.FETCH_BACKOFF_BASE,
+        backoff_max: float = config.FETCH_BACKOFF_MAX,
+        deadline: float = config.FETCH_DEADLINE,
+        probe_method: str = config.FETCH_PROBE_METHOD,
+    ) -> None:
+        self.max_concurrency = max_concurrency
+        self.rate_per_host = rate_per_host
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.deadline = deadline
+        self.probe_method = probe_method.upper()
+
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._no_head_hosts: set = set()
+
+        # metrics
+        self._queued = 0
+        self._in_flight = 0
+        self._requests = 0
+        self._retries = 0
+        self._deadline_exceeded = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._waits = 0
+        self._probes = 0
+        self._status_counts: Dict[int, int] = {}
+
+    def _bucket(self, host: str) -> TokenBucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = TokenBucket(self.rate_per_host, self.burst)
+        return bucket
+
+    async def fetch(
+        self,
+        session: HttpSession,
+        url: str,
+        method: str = "GET",
+        headers: Optional[Dict[str, str]] = None,
+        read_body: bool = True,
+    ) -> FetchResult:
+        """
+        Fetch `url`, honouring the concurrency cap and host rate limit.
+        With read_body=False the response is dropped after the status line.
+        Raises asyncio.TimeoutError once the overall deadline passes.
+        """
+        try:
+            return await asyncio.wait_for(
+                self._fetch_with_retries(session, url, method, headers, read_body), timeout=self.deadline
+            )
+        except asyncio.TimeoutError:
+            self._deadline_exceeded += 1
+            logger.warning("Fetch deadline (%.0fs) exceeded: %s", self.deadline, url)
+            raise
+
+    async def probe(self, session: HttpSession, url: str) -> int:
+        """
+        Return the status of `url` without downloading the body.
+        Uses HEAD unless the host refuses it, then a GET that is dropped as
+        soon as the status line arrives.
+        """
+        self._probes += 1
+        host = urlsplit(url).netloc
+        if self.probe_method == "HEAD" and host not in self._no_head_hosts:
+            result = await self.fetch(session, url, method="HEAD")
+            if result.status not in HEAD_UNSUPPORTED_STATUS_CODES:
+                return result.status
+            logger.info("%s does not support HEAD, probing with GET", host)
+            self._no_head_hosts.add(host)
+        result = await self.fetch(session, url, read_body=False)
+        return result.status
+
+    async def _fetch_with_retries(
+        self,
+        session: HttpSession,
+        url: str,
+        method: str,
+        headers: Optional[Dict[str, str]],
+        read_body: bool,
+    ) -> FetchResult:
+        host = urlsplit(url).netloc
+        attempt = 0
+
+        while True:
+            retry_after: Optional[float] = None
+            try:
+                result = await self._fetch_once(session, url, method, headers, host, read_body)
+                if result.status not in RETRY_STATUS_CODES or attempt >= self.max_retries:
+                    return result
+                retry_after = _parse_retry_after(result.headers.get("Retry-After"))
+                reason = f"HTTP {result.status}"
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt >= self.max_retries:
+                    raise
+                reason = repr(e)
+
+            attempt += 1
+            self._retries += 1
+            delay = retry_after if retry_after is not None else self._backoff(attempt)
+            logger.info("Retrying %s in %.2fs (%s, attempt %d/%d)", url, delay, reason, attempt, self.max_retries)
+            await asyncio.sleep(delay)
+
+    async def _fetch_once(
+        self,
+        session: HttpSession,
+        url: str,
+        method: str,
+        headers: Optional[Dict[str, str]],
+        host: str,
+        read_body: bool,
+    ) -> FetchResult:
+        queued_at = time.monotonic()
+        self._queued += 1
+        try:
+            # rate limit first: a throttled host must not sit on slots other hosts could use
+            await self._bucket(host).acquire()
+            await self._slots.acquire()
+        finally:
+            self._queued -= 1
+
+        try:
+            self._record_wait(time.monotonic() - queued_at)
+
+            self._in_flight += 1
+            self._requests += 1
+            try:
+                async with session.request(method, url, headers=headers) as response:
+                    # leaving the block with the body unread closes the connection, which
+                    # is what we want for a dropped GET
+                    text = await response.text() if read_body and method != "HEAD" else ""
+                    self._status_counts[response.status] = self._status_counts.get(response.status, 0) + 1
+                    inc("lcs_http_responses_total", status=response.status)
+                    return FetchResult(url=url, status=response.status, text=text, headers=CIMultiDict(response.headers))
+            finally:
+                self._in_flight -= 1
+        finally:
+            self._slots.release()
+
+    def _backoff(self, attempt: int) -> float:
+        """Exponential backoff with full jitter."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+
+    def _record_wait(self, waited: float) -> None:
+        self._waits += 1
+        self._wait_total += waited
+        self._wait_max = max(self._wait_max, waited)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": self._queued,
+            "in_flight": self._in_flight,
+            "max_concurrency": self.max_concurrency,
+            "rate_per_host": self.rate_per_host,
+            "requests": self._requests,
+            "probes": self._probes,
+            "retries": self._retries,
+            "deadline_exceeded": self._deadline_exceeded,
+            "wait_seconds_total": round(self._wait_total, 3),
+            "wait_seconds_avg": round(self._wait_total / self._waits, 3) if self._waits else 0.0,
+            "wait_seconds_max": round(self._wait_max, 3),
+            "status_codes": dict(self._status_counts),
+        }
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Only the delta-seconds form of Retry-After is honoured."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+# ---------- shared instance ----------
+
+_default_scheduler: Optional[FetchScheduler] = None
+
+
+def get_fetch_scheduler() -> FetchScheduler:
+    """Return the process-wide scheduler, built from config on first use."""
+    global _default_scheduler
+    if _default_scheduler is None:
+        _default_scheduler = FetchScheduler()
+    return _default_scheduler
+
+
+def configure_fetch_scheduler(**kwargs) -> FetchScheduler:
+    """Replace the process-wide scheduler, e.g. with benchmark-specific limits."""
+    global _default_scheduler
+    _default_scheduler = FetchScheduler(**kwargs)
+    return _default_scheduler
@@ -1,61 +1,355 @@
 # src/liftingcastscraper/pipeline.py
 import asyncio
-from typing import List, Dict
-
-import aiohttp
+import logging
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, AsyncIterator, Callable, Iterable, List, Dict, Optional, Tuple
 
 # from .scraper.selenium_scraper import scrape_liftingcast_roster # Old selenium scraper
-from .scraper.playwright_scraper import scrape_liftingcast_roster
+from .scraper.liftingcast_api import read_roster, scrape_roster
 from .scraper.utils import clean_lifter_name, normalize_liftingcast_url, log_mem
 from .opl_ipf.lookup import try_fetch_openipf
+from .opl_ipf.bulk_index import get_bulk_index
+from . import config
+from .analytics import analyze
+from .http_client import HttpClient, HttpSession, get_http_client
+from .instrumentation import span
+from .models import Lifter
+from .singleflight import SingleFlight
+from .snapshots import REFRESHED, REUSED, get_snapshot_store, reusable
+
+if TYPE_CHECKING:
+    from .server.admission import AdmissionController
+
+logger = logging.getLogger(__name__)
+
+# concurrent reports for the same meet share one run
+report_flight = SingleFlight("report")
+
+
+def _make_person(
+    lifter_name: str,
+    liftingcast_url: str,
+    ipf_data: Dict | None,
+    divisions: Optional[List[Dict]] = None,
+    lookup: str = REFRESHED,
+) -> Lifter:
+    if ipf_data:
+        return Lifter(
+            name=lifter_name,
+            liftingcast_href=liftingcast_url,
+            divisions=divisions or [],
+            lookup=lookup,
+            opl_profile=ipf_data["profile_url"],
+            opl_summary=ipf_data["meet_history"],
+            analytics=ipf_data.get("analytics"),
+        )
+    return Lifter(
+        name=lifter_name,
+        liftingcast_href=liftingcast_url,
+        divisions=divisions or [],
+        lookup=lookup,
+    )
+
+
+def _stored_ipf_data(person: Lifter) -> Dict | None:
+    if not person.opl_profile:
+        return None
+    return {"profile_url": person.opl_profile, "meet_history": person.opl_summary, "analytics": person.analytics}
+
+
+async def iter_people(
+    meet_url: str,
+    roster: Optional[List[Tuple[str, str]]] = None,
+    use_snapshot: bool = True,
+    session: Optional[HttpSession] = None,
+    shared_lookups: Optional[Dict[str, asyncio.Future]] = None,
+    admission: Optional["AdmissionController"] = None,
+    shed: bool = True,
+) -> AsyncIterator[Dict]:
+    """
+    Streaming version of `build_people`. Yields events as work completes:
+
+        {"type": "queued",   "position": n}             # waiting for a browser slot (see below)
+        {"type": "roster",   "meet_url": ..., "total": N, "reused": R, "lifters": [{"index", "name", "liftingcast_href"}, ...]}
+        {"type": "lifter",   "index": i, "person": Lifter}    # one per lifter; reused ones first, then in completion order
+        {"type": "progress", "done": k, "total": N}
+        {"type": "analytics", "lifters": [{"index": i, "analytics": LifterStats}, ...]}  # once all are in
+        {"type": "done",     "total": N, "reused": R, "refreshed": N - R}
+
+    Lifters unchanged since the meet's last snapshot are reused without a
+    lookup (person.lookup == "reused"); new or renamed ones are looked up
+    ("refreshed"). Pass use_snapshot=False to look everyone up again.
 
+    Closing the generator early (client went away) cancels the outstanding lookups.
+    Pass `roster` ((label, href) pairs) to skip scraping when it is already known.
+    `divisions` is only filled in when the roster came from the direct data API.
+    HTTP goes through `session` if given, else the app-wide client, else a
+    client opened for this run (CLI).
+    `shared_lookups` (cleaned name -> lookup future) lets several meets of one
+    batch share their OpenIPF lookups; see `build_batch`.
 
-async def build_people(meet_url: str) -> List[Dict]:
-    """Return the `people` structure for a meet URL."""
+    When the roster has to be scraped with the browser, the scrape first takes
+    a slot from `admission` (if given), reporting its queue position while it
+    waits, and raises server.admission.Overloaded if turned away. `shed=False`
+    (background jobs) is never turned away and waits as long as it takes.
+    """
     log_mem("Start pipeline")
     meet_url = normalize_liftingcast_url(meet_url)
-    
-    # 1. Scrape the roster synchronously via playwright
-    roster = await scrape_liftingcast_roster(meet_url)
-    log_mem("After roster scrape")
-
-    names: List[str] = []
-    urls: List[str] = []
-    tasks: List[asyncio.Future] = []
-
-    # 2. Reuse ONE aiohttp session for all lifters
-    async with aiohttp.ClientSession() as session:
-        for raw_label, liftingcast_url in roster:
-            lifter_name = clean_lifter_name(raw_label)
-            names.append(lifter_name)
-            urls.append(liftingcast_url)
-
-            # NOTE: pass the session in here 👇
-            tasks.append(try_fetch_openipf(lifter_name, session=session))
-
-        # 3. Run all OpenIPF lookups concurrently
-        results = await asyncio.gather(*tasks)
+    session = session or get_http_client()
+
+    # 1. Roster from LiftingCast's data API, or via playwright when that fails
+    if roster is None:
+        roster = await read_roster(meet_url, session)
+    if roster is None:
+        # only the browser is admission-controlled: it is what runs out of memory
+        ticket = admission.enter(shed=shed) if admission is not None else None
+        try:
+            if ticket is not None:
+                async for position in admission.wait_turn(ticket, timeout=-1 if shed else None):
+                    yield {"type": "queued", "position": position}
+            with span("roster_scrape"):
+                roster = await scrape_roster(meet_url)
+        finally:
+            if ticket is not None:
+                ticket.release()
+        log_mem("After roster scrape")
+
+    names: List[str] = [clean_lifter_name(entry[0]) for entry in roster]
+    urls: List[str] = [entry[1] for entry in roster]
+    divisions: List[List[Dict]] = [list(getattr(entry, "divisions", ())) for entry in roster]
+    total = len(names)
+
+    # Diff against the last finished run of this meet
+    store = get_snapshot_store()
+    snapshot = await asyncio.to_thread(store.get, meet_url) if store and use_snapshot else None
+    stored: Dict[int, Lifter] = {}
+    for i in range(total):
+        person = reusable(snapshot, names[i], urls[i])
+        if person is not None:
+            stored[i] = person
+    pending: List[int] = [i for i in range(total) if i not in stored]
+
+    yield {
+        "type": "roster",
+        "meet_url": meet_url,
+        "total": total,
+        "reused": len(stored),
+        "lifters": [
+            {"index": i, "name": name, "liftingcast_href": url, "divisions": divisions[i]}
+            for i, (name, url) in enumerate(zip(names, urls))
+        ],
+    }
+
+    people: List[Optional[Lifter]] = [None] * total
+    done = 0
+    for i, person in stored.items():
+        people[i] = _make_person(names[i], urls[i], _stored_ipf_data(person), divisions[i], lookup=REUSED)
+        done += 1
+        yield {"type": "lifter", "index": i, "person": people[i]}
+        yield {"type": "progress", "done": done, "total": total}
+
+    # 2. Resolve what we can from the offline OpenPowerlifting index (one query)
+    index = get_bulk_index()
+    with span("index_lookup"):
+        local_hits = (
+            await asyncio.to_thread(index.lookup_many, [names[i] for i in pending]) if index and pending else {}
+        )
+    if index:
+        log_mem(f"After index lookup ({len(local_hits)}/{len(pending)} resolved locally)")
+
+    async def lookup(i: int, lifter_name: str, session: HttpSession):
+        if lifter_name in local_hits:
+            return i, local_hits[lifter_name]
+        if index and not config.OPL_INDEX_HTTP_FALLBACK:
+            return i, None
+        with span("lifter_lookup"):
+            if shared_lookups is None:
+                return i, await try_fetch_openipf(lifter_name, session=session)
+            future = shared_lookups.get(lifter_name)
+            if future is None:
+                future = asyncio.ensure_future(try_fetch_openipf(lifter_name, session=session))
+                shared_lookups[lifter_name] = future
+            # shielded: another meet of the batch may still be waiting on it
+            return i, await asyncio.shield(future)
+
+    # 3. Reuse ONE HTTP client for all lifters (kept alive across reports by the server)
+    async with (nullcontext(session) if session is not None else HttpClient()) as session:
+        # 4. Run all OpenIPF lookups concurrently, emitting each as it resolves
+        tasks = [asyncio.ensure_future(lookup(i, names[i], session)) for i in pending]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                i, ipf_data = await next_done
+                done += 1
+                with span("stitch"):
+                    people[i] = _make_person(names[i], urls[i], ipf_data, divisions[i])
+                yield {"type": "lifter", "index": i, "person": people[i]}
+                yield {"type": "progress", "done": done, "total": total}
+        finally:
+            for task in tasks:
+                task.cancel()
+
     log_mem("After OpenIPF lookups")
-    # 4. Stitch everything back together in order
-    people: List[Dict] = []
-    for lifter_name, liftingcast_url, ipf_data in zip(names, urls, results):
-        if ipf_data:
-            people.append(
-                {
-                    "name": lifter_name,
-                    "liftingcast_href": liftingcast_url,
-                    "opl_profile": ipf_data["profile_url"],
-                    "opl_summary": ipf_data["meet_history"],
-                }
-            )
-        else:
-            people.append(
-                {
-                    "name": lifter_name,
-                    "liftingcast_href": liftingcast_url,
-                    "opl_profile": None,
-                    "opl_summary": None,
-                }
-            )
+
+    # 5. Bests, points and class ranks, now that the whole roster is in
+    if config.ANALYTICS_ENABLED:
+        with span("analytics"):
+            await asyncio.to_thread(analyze, people)
+        yield {
+            "type": "analytics",
+            "lifters": [
+                {"index": i, "analytics": person.analytics}
+                for i, person in enumerate(people)
+                if person is not None and person.analytics is not None
+            ],
+        }
+
+    # only complete runs become the next snapshot
+    if store is not None:
+        await asyncio.to_thread(store.put, meet_url, people)
+        store.record(reused=len(stored), refreshed=len(pending))
+
+    yield {"type": "done", "total": total, "reused": len(stored), "refreshed": len(pending)}
+
+
+async def build_people(
+    meet_url: str,
+    roster: Optional[List[Tuple[str, str]]] = None,
+    use_snapshot: bool = True,
+    session: Optional[HttpSession] = None,
+    shared_lookups: Optional[Dict[str, asyncio.Future]] = None,
+    admission: Optional["AdmissionController"] = None,
+    shed: bool = True,
+    on_event: Optional[Callable[[Dict], None]] = None,
+) -> List[Lifter]:
+    """
+    Return the `people` structure for a meet URL (`to_wire()` gives the JSON form).
+
+    Concurrent calls for the same meet (and snapshot setting) share one run
+    and get the same list, so callers must not modify it. The run admits its
+    browser scrape (if any) and reports its `iter_people` events to
+    `on_event` the way the first caller asked; later callers only get the
+    result. Calls with a pre-loaded roster or batch lookups are never coalesced.
+    """
+    if roster is not None or shared_lookups is not None:
+        return await _build_people(
+            meet_url, roster, use_snapshot, session, shared_lookups, admission, shed, on_event
+        )
+    key = (normalize_liftingcast_url(meet_url), use_snapshot)
+    return await report_flight.do(
+        key,
+        lambda: _build_people(
+            meet_url, use_snapshot=use_snapshot, session=session, admission=admission, shed=shed, on_event=on_event
+        ),
+    )
+
+
+async def _build_people(
+    meet_url: str,
+    roster: Optional[List[Tuple[str, str]]] = None,
+    use_snapshot: bool = True,
+    session: Optional[HttpSession] = None,
+    shared_lookups: Optional[Dict[str, asyncio.Future]] = None,
+    admission: Optional["AdmissionController"] = None,
+    shed: bool = True,
+    on_event: Optional[Callable[[Dict], None]] = None,
+) -> List[Lifter]:
+    people: List[Lifter] = []
+
+    # Stitch the streamed events back together in roster order
+    async for event in iter_people(
+        meet_url, roster=roster, use_snapshot=use_snapshot, session=session, shared_lookups=shared_lookups,
+        admission=admission, shed=shed,
+    ):
+        if on_event is not None:
+            on_event(event)
+        if event["type"] == "roster":
+            people = [None] * event["total"]
+        elif event["type"] == "lifter":
+            people[event["index"]] = event["person"]
+
     log_mem("End pipeline")
     return people
+
+
+@dataclass
+class BatchReport:
+    people: Dict[str, List[Lifter]] = field(default_factory=dict)  # normalized meet URL -> people
+    errors: Dict[str, str] = field(default_factory=dict)            # meet URL -> why it failed
+    roster_entries: int = 0                                         # lifters across all rosters
+    unique_lifters: int = 0                                         # distinct names, i.e. lookups at most
+
+
+async def _batch_roster(
+    meet_url: str, session: HttpSession, admission: Optional["AdmissionController"]
+) -> List[Tuple[str, str]]:
+    roster = await read_roster(meet_url, session)
+    if roster is not None:
+        return roster
+    async with (admission.admit() if admission is not None else nullcontext()):
+        return await scrape_roster(meet_url)
+
+
+async def build_batch(
+    meet_urls: Iterable[str],
+    use_snapshot: bool = True,
+    session: Optional[HttpSession] = None,
+    admission: Optional["AdmissionController"] = None,
+) -> BatchReport:
+    """
+    Build several meets at once (e.g. the flights / platforms of one weekend).
+
+    All rosters are loaded concurrently (browser fallbacks share the pool's
+    contexts and each takes an `admission` slot), then lifters are deduplicated across meets by cleaned name so
+    each one is looked up on OpenIPF at most once for the whole batch. A meet
+    that fails is reported in `errors` without failing the others.
+    """
+    meet_urls = list(dict.fromkeys(normalize_liftingcast_url(url) for url in meet_urls))
+    session = session or get_http_client()
+    batch = BatchReport()
+
+    async with (nullcontext(session) if session is not None else HttpClient()) as session:
+        # 1. Every roster in parallel
+        with span("roster_scrape"):
+            results = await asyncio.gather(
+                *(_batch_roster(url, session, admission) for url in meet_urls), return_exceptions=True
+            )
+        rosters: Dict[str, List[Tuple[str, str]]] = {}
+        for url, result in zip(meet_urls, results):
+            if isinstance(result, Exception):
+                logger.warning("Roster for %s failed: %s", url, result)
+                batch.errors[url] = str(result)
+            else:
+                rosters[url] = result
+
+        # 2. Deduplicate across meets before any lookup
+        names = [clean_lifter_name(entry[0]) for roster in rosters.values() for entry in roster]
+        batch.roster_entries = len(names)
+        batch.unique_lifters = len(set(names))
+        logger.info(
+            "Batch of %d meets: %d roster entries, %d unique lifters",
+            len(rosters), batch.roster_entries, batch.unique_lifters,
+        )
+
+        # 3. Build every meet against one shared set of lookups
+        shared_lookups: Dict[str, asyncio.Future] = {}
+        try:
+            built = await asyncio.gather(
+                *(
+                    build_people(url, roster=roster, use_snapshot=use_snapshot, session=session,
+                                 shared_lookups=shared_lookups)
+                    for url, roster in rosters.items()
+                ),
+                return_exceptions=True,
+            )
+        finally:
+            for future in shared_lookups.values():
+                future.cancel()
+
+    for url, result in zip(rosters, built):
+        if isinstance(result, Exception):
+            logger.warning("Report for %s failed: %s", url, result)
+            batch.errors[url] = str(result)
+        else:
+            batch.people[url] = result
+    return batch
@@ -1,7 +1,13 @@
 """Reports package init"""
 
+from .._lazy import lazy_exports
 
-from .html_report import generate_html_report
+# jinja2 is only imported once a report is actually rendered
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "generate_html_report": ".html_report",
+    "generate_stream": ".html_report",
+    "write_html_report": ".html_report",
+})
 
 
-__all__ = ["generate_html_report"]
\ No newline at end of file
+__all__ = ["generate_html_report", "generate_stream", "write_html_report"]
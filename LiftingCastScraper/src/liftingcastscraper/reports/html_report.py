@@ -1,6 +1,23 @@
-from jinja2 import Template
-from typing import List, Dict, Any
+"""
+HTML report rendering.
+
+The template is compiled once into a module-level jinja2 Environment (with
+autoescaping, since names and meet names come from scraped pages).
+`generate_html_report` returns the whole document; `generate_stream` yields it
+in chunks, one person at a time, so a large report can go straight to a file
+(`write_html_report`) or a StreamingResponse without building the full string.
+"""
+
 import datetime
+import os
+from typing import Any, Dict, Iterable, Iterator
+
+from jinja2 import Environment, select_autoescape
+
+from ..models import Lifter, to_wire
+
+# flush to the writer roughly every this many template chunks
+STREAM_BUFFER = 64
 
 TEMPLATE = """
 <!doctype html>
@@ -16,6 +33,7 @@ TEMPLATE = """
     th { background: #f3f3f3; text-align: left; }
     .person { margin-bottom: 1.4rem; padding: 8px; border-radius:4px; background:#fcfcfc; }
     .link { font-size:0.95rem; color:#1a73e8; }
+    .stats { font-size:0.95rem; color:#333; }
   </style>
 </head>
 <body>
@@ -32,10 +50,24 @@ TEMPLATE = """
         <a class="link" href="{{ p.opl_profile }}" target="_blank">{{ p.opl_profile }}</a>
       {% else %}
         <em>No profile found</em> —
-        <a class="link" href="https://www.openpowerlifting.org/search?name={{ p.name }}" target="_blank">Search on OPL</a>
+        <a class="link" href="https://www.openpowerlifting.org/search?name={{ p.name | urlencode }}" target="_blank">Search on OPL</a>
       {% endif %}
     </p>
 
+    {% set a = p.analytics %}
+    {% if a %}
+      <p class="stats">
+        Best: {{ a.best_squat or '–' }} / {{ a.best_bench or '–' }} / {{ a.best_deadlift or '–' }}
+        — total {{ a.best_total or '–' }}
+        {% if a.recent_total %} · recent {{ a.recent_total }}{% endif %}
+        {% if a.dots %} · DOTS {{ a.dots }}{% endif %}
+        {% if a.ipf_gl %} · IPF GL {{ a.ipf_gl }}{% endif %}
+        {% if a.trend_kg_per_year is not none %} · trend {{ '%+.1f' | format(a.trend_kg_per_year) }} kg/yr{% endif %}
+        {% if a.success_rate is not none %} · {{ (a.success_rate * 100) | round | int }}% attempts made{% endif %}
+        {% if a.class_rank %} · #{{ a.class_rank }} of {{ a.class_size }} at {{ a.weight_class }} kg{% endif %}
+      </p>
+    {% endif %}
+
     {% if p.opl_summary %}
       <h3>Summary</h3>
       <table>
@@ -61,12 +93,36 @@ TEMPLATE = """
 """
 
 
-def generate_html_report(people: List[Dict[str, Any]]) -> str:
+_env = Environment(autoescape=select_autoescape(default=True, default_for_string=True))
+_template = _env.from_string(TEMPLATE)
+
+
+def _context(people: Iterable[Lifter | Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        # converted lazily, so only the person being rendered exists as dicts
+        "people": (to_wire(p) for p in people),
+        "now": datetime.datetime.utcnow().isoformat() + "Z",
+    }
+
+
+def generate_html_report(people: Iterable[Lifter | Dict[str, Any]]) -> str:
     """
     Render the HTML for the report and return it as a string.
     """
-    tpl = Template(TEMPLATE)
-    return tpl.render(
-        people=people,
-        now=datetime.datetime.utcnow().isoformat() + "Z",
-    )
+    return _template.render(_context(people))
+
+
+def generate_stream(people: Iterable[Lifter | Dict[str, Any]]) -> Iterator[str]:
+    """Render the report incrementally, yielding buffered chunks of HTML."""
+    stream = _template.stream(_context(people))
+    stream.enable_buffering(STREAM_BUFFER)
+    return iter(stream)
+
+
+def write_html_report(people: Iterable[Lifter | Dict[str, Any]], path: str) -> str:
+    """Stream the report into `path` without holding the whole document in memory."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for chunk in generate_stream(people):
+            f.write(chunk)
+    return path
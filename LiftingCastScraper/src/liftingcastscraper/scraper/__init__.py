@@ -1,15 +1,34 @@
 """scraper package init"""
 
+from .._lazy import lazy_exports
 
 # from .selenium_scraper import scrape_liftingcast_roster, get_driver
-from .playwright_scraper import scrape_liftingcast_roster
-from .utils import lifter_link_selector, slugify, clean_lifter_name, normalize_liftingcast_url, log_mem
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "scrape_liftingcast_roster": ".playwright_scraper",
+    "get_roster": ".liftingcast_api",
+    "read_roster": ".liftingcast_api",
+    "scrape_roster": ".liftingcast_api",
+    "fetch_meet_roster": ".liftingcast_api",
+    "RosterLifter": ".liftingcast_api",
+    "RosterUnavailable": ".liftingcast_api",
+    "lifter_link_selector": ".utils",
+    "slugify": ".utils",
+    "clean_lifter_name": ".utils",
+    "normalize_liftingcast_url": ".utils",
+    "log_mem": ".utils",
+})
 
 
 __all__ = [
     "scrape_liftingcast_roster",
+    "get_roster",
+    "read_roster",
+    "scrape_roster",
+    "fetch_meet_roster",
+    "RosterLifter",
+    "RosterUnavailable",
     "slugify",
     "clean_lifter_name",
     "normalize_liftingcast_url",
     "log_mem",
-]
\ No newline at end of file
+]
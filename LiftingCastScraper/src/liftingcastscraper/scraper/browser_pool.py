@@ -0,0 +1,296 @@
+# src/liftingcastscraper/scraper/browser_pool.py
+"""
+Long-lived Chromium shared between roster scrapes.
+
+Launching Chromium costs 1-3 s and a few hundred MB, so the server starts ONE
+browser in the FastAPI lifespan and hands out isolated browser contexts from a
+bounded pool. Contexts are recycled after a number of uses or when Chromium's
+RSS grows past a limit, and a crashed browser is relaunched transparently.
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, List, Optional, TypeVar
+
+import psutil
+
+if TYPE_CHECKING:  # playwright is imported on first launch; most reports never need a browser
+    from playwright.async_api import Browser, BrowserContext, Playwright
+
+from .. import config
+from ..instrumentation import span
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class _PooledContext:
+    context: "BrowserContext"
+    generation: int  # browser generation the context belongs to
+    uses: int = 0
+
+
+class BrowserManager:
+    """Own one Chromium process and lend out browser contexts from a bounded pool.
+
+    Usage:
+        async with BrowserManager() as manager:
+            result = await manager.run(lambda ctx: do_something(ctx))
+    """
+
+    def __init__(
+        self,
+        max_contexts: int = config.BROWSER_MAX_CONTEXTS,
+        max_uses: int = config.BROWSER_CONTEXT_MAX_USES,
+        rss_limit_mb: float = config.BROWSER_RSS_LIMIT_MB,
+        headless: bool = config.BROWSER_HEADLESS,
+    ) -> None:
+        if max_contexts < 1:
+            raise ValueError("max_contexts must be at least 1")
+
+        self.max_contexts = max_contexts
+        self.max_uses = max_uses
+        self.rss_limit_mb = rss_limit_mb
+        self.headless = headless
+
+        self._playwright: Optional["Playwright"] = None
+        self._browser: Optional["Browser"] = None
+        self._generation = 0
+        self._idle: List[_PooledContext] = []
+        self._slots = asyncio.Semaphore(max_contexts)
+        self._launch_lock = asyncio.Lock()
+        self._in_use = 0
+        self._launches = 0
+        self._recycled = 0
+        self._crashes = 0
+
+    async def __aenter__(self) -> "BrowserManager":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+    # ---------- lifecycle ----------
+
+    async def start(self) -> None:
+        """Start Playwright and launch Chromium (idempotent)."""
+        await self._ensure_browser()
+
+    async def stop(self) -> None:
+        """Close every context, the browser and Playwright."""
+        async with self._launch_lock:
+            for pooled in self._idle:
+                await self._close_context(pooled)
+            self._idle.clear()
+
+            if self._browser is not None:
+                try:
+                    await self._browser.close()
+                except Exception as e:
+                    logger.warning("Error closing browser (%s)", e)
+                self._browser = None
+
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._browser is not None and self._browser.is_connected()
+
+    async def _ensure_browser(self) -> "Browser":
+        """Return a connected browser, (re)launching it if needed."""
+        if self.is_running:
+            return self._browser
+
+        async with self._launch_lock:
+            # another coroutine may have relaunched while we waited
+            if self.is_running:
+                return self._browser
+
+            if self._browser is not None:
+                logger.warning("Chromium is gone, relaunching")
+                self._crashes += 1
+                self._browser = None
+
+            if self._playwright is None:
+                from playwright.async_api import async_playwright
+
+                self._playwright = await async_playwright().start()
+
+            with span("browser_launch"):
+                self._browser = await self._playwright.chromium.launch(headless=self.headless)
+            self._generation += 1
+            self._launches += 1
+
+            # contexts from a dead browser are useless
+            stale, self._idle = self._idle, []
+            for pooled in stale:
+                await self._close_context(pooled)
+
+            logger.info("Chromium launched (generation %d)", self._generation)
+            return self._browser
+
+    # ---------- context pool ----------
+
+    @asynccontextmanager
+    async def context(self):
+        """Borrow an isolated browser context. At most `max_contexts` are lent at once."""
+        async with self._slots:
+            pooled = await self._acquire()
+            self._in_use += 1
+            try:
+                yield pooled.context
+            finally:
+                self._in_use -= 1
+                await self._release(pooled)
+
+    async def run(self, fn: Callable[["BrowserContext"], Awaitable[T]], retries: int = 1) -> T:
+        """
+        Run `fn(context)` on a pooled context.
+        If Chromium crashes underneath the call, relaunch it and retry so the
+        request already in flight does not fail.
+        """
+        attempt = 0
+        while True:
+            generation = self._generation
+            try:
+                async with self.context() as ctx:
+                    return await fn(ctx)
+            except Exception:
+                crashed = not self.is_running or self._generation != generation
+                if not crashed or attempt >= retries:
+                    raise
+                attempt += 1
+                logger.warning("Browser crashed mid-request, retrying (%d/%d)", attempt, retries)
+
+    async def _acquire(self) -> _PooledContext:
+        await self._ensure_browser()
+
+        while self._idle:
+            pooled = self._idle.pop()
+            if pooled.generation == self._generation:
+                return pooled
+            await self._close_context(pooled)
+
+        browser = await self._ensure_browser()
+        return _PooledContext(context=await browser.new_context(), generation=self._generation)
+
+    async def _release(self, pooled: _PooledContext) -> None:
+        pooled.uses += 1
+
+        if (
+            pooled.generation != self._generation
+            or not self.is_running
+            or pooled.uses >= self.max_uses
+        ):
+            await self._recycle(pooled)
+            return
+
+        if self.browser_rss_mb() > self.rss_limit_mb:
+            logger.info("Chromium RSS above %.0f MB, recycling idle contexts", self.rss_limit_mb)
+            await self._recycle(pooled)
+            idle, self._idle = self._idle, []
+            for other in idle:
+                await self._recycle(other)
+            return
+
+        try:
+            # keep contexts isolated between requests
+            for page in pooled.context.pages:
+                await page.close()
+            await pooled.context.clear_cookies()
+        except Exception:
+            await self._recycle(pooled)
+            return
+
+        self._idle.append(pooled)
+
+    async def _recycle(self, pooled: _PooledContext) -> None:
+        self._recycled += 1
+        await self._close_context(pooled)
+
+    @staticmethod
+    async def _close_context(pooled: _PooledContext) -> None:
+        try:
+            await pooled.context.close()
+        except Exception:
+            pass  # browser already gone
+
+    # ---------- stats ----------
+
+    @staticmethod
+    def _driver_processes() -> List[psutil.Process]:
+        """
+        The Playwright driver (a node process running playwright's cli.js) among
+        this process's children. Chromium runs under it; parse workers and other
+        children of the server do not.
+        """
+        drivers = []
+        for child in psutil.Process().children():
+            try:
+                if any("playwright" in part for part in child.cmdline()):
+                    drivers.append(child)
+            except psutil.Error:
+                continue
+        return drivers
+
+    def browser_rss_mb(self) -> float:
+        """RSS of the Playwright driver and everything under it (Chromium), in MB."""
+        total = 0
+        for driver in self._driver_processes():
+            try:
+                processes = [driver, *driver.children(recursive=True)]
+            except psutil.Error:
+                continue
+            for process in processes:
+                try:
+                    total += process.memory_info().rss
+                except psutil.Error:
+                    continue
+        return total / (1024 * 1024)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "running": self.is_running,
+            "generation": self._generation,
+            "launches": self._launches,
+            "crashes": self._crashes,
+            "in_use": self._in_use,
+            "idle": len(self._idle),
+            "max_contexts": self.max_contexts,
+            "recycled": self._recycled,
+            "rss_mb": round(self.browser_rss_mb(), 1),
+        }
+
+
+# ---------- shared instance (owned by the FastAPI lifespan) ----------
+
+_shared_manager: Optional[BrowserManager] = None
+
+
+def get_browser_manager() -> Optional[BrowserManager]:
+    """Return the app-wide manager, or None when running without one (CLI)."""
+    return _shared_manager
+
+
+async def start_browser_manager(launch: bool = True, **kwargs) -> BrowserManager:
+    """Install the app-wide manager. With launch=False Chromium starts on first use instead."""
+    global _shared_manager
+    if _shared_manager is None:
+        _shared_manager = BrowserManager(**kwargs)
+    if launch:
+        await _shared_manager.start()
+    return _shared_manager
+
+
+async def stop_browser_manager() -> None:
+    global _shared_manager
+    if _shared_manager is not None:
+        await _shared_manager.stop()
+        _shared_manager = None
@@ -0,0 +1,212 @@
+# src/liftingcastscraper/scraper/liftingcast_api.py
+"""
+Roster source that reads LiftingCast's meet data directly.
+
+The LiftingCast SPA syncs each meet from a CouchDB database and renders the
+roster client-side, so scraping it means running Chromium. The same documents
+can be read with one plain HTTP request:
+
+    GET <LIFTINGCAST_DATA_URL with {meet_id}>   (CouchDB _all_docs?include_docs=true)
+
+Lifter docs carry the name, lot number and division entries; division docs
+carry the division name and its weight classes. `get_roster` tries this path
+first and only falls back to the Playwright scraper when it fails.
+"""
+
+import asyncio
+import json
+import logging
+import re
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import aiohttp
+
+from .. import config
+from ..http_client import HttpClient, HttpSession, get_http_client
+from ..instrumentation import inc, span
+from ..opl_ipf.scheduler import get_fetch_scheduler
+
+logger = logging.getLogger(__name__)
+
+LIFTER_ID_PREFIX = "l"
+DIVISION_ID_PREFIX = "d"
+
+
+class RosterUnavailable(RuntimeError):
+    """The meet data could not be read directly (network, status or shape)."""
+
+
+class RosterLifter(NamedTuple):
+    """
+    One roster entry. Indexes 0 and 1 are the (label, href) pair the
+    Playwright scraper returns, so both sources can be used interchangeably.
+    """
+    label: str
+    href: str
+    lifter_id: Optional[str] = None
+    divisions: Tuple[Dict[str, Optional[str]], ...] = ()
+
+
+def meet_id_from_url(meet_url: str) -> str:
+    match = re.search(r"/meets/([^/?#]+)", meet_url)
+    if not match:
+        raise ValueError(f"Invalid LiftingCast meet URL: {meet_url}")
+    return match.group(1)
+
+
+def meet_data_url(meet_id: str) -> str:
+    return config.LIFTINGCAST_DATA_URL.format(meet_id=meet_id)
+
+
+def _docs(payload: Any) -> List[Dict[str, Any]]:
+    """Accept CouchDB's {"rows": [{"doc": ...}]} as well as a bare list of docs."""
+    rows = payload.get("rows") if isinstance(payload, dict) else payload
+    if not isinstance(rows, list):
+        raise RosterUnavailable("meet data has no rows")
+    docs = []
+    for row in rows:
+        doc = row.get("doc", row) if isinstance(row, dict) else None
+        if isinstance(doc, dict):
+            docs.append(doc)
+    return docs
+
+
+def _is_lifter(doc: Dict[str, Any]) -> bool:
+    if doc.get("type") is not None:
+        return doc["type"] == "lifter"
+    return str(doc.get("_id", "")).startswith(LIFTER_ID_PREFIX) and bool(doc.get("name"))
+
+
+def _is_division(doc: Dict[str, Any]) -> bool:
+    if doc.get("type") is not None:
+        return doc["type"] == "division"
+    return str(doc.get("_id", "")).startswith(DIVISION_ID_PREFIX) and "weightClasses" in doc
+
+
+def _list(value: Any) -> List[Any]:
+    return value if isinstance(value, list) else []
+
+
+def parse_meet_docs(meet_id: str, payload: Any) -> List[RosterLifter]:
+    """Build the roster from a meet's documents, ordered by lot number then name."""
+    docs = _docs(payload)
+
+    divisions: Dict[str, str] = {}
+    weight_classes: Dict[str, str] = {}
+    for doc in docs:
+        if _is_division(doc) and isinstance(doc.get("_id"), str):
+            divisions[doc["_id"]] = str(doc.get("name") or "")
+            for wc in _list(doc.get("weightClasses")):
+                if isinstance(wc, dict) and isinstance(wc.get("_id"), str):
+                    weight_classes[wc["_id"]] = str(wc.get("name") or "")
+
+    lifters = []
+    for doc in docs:
+        # typed docs are trusted on "type" alone, so check the fields we use
+        lifter_id = doc.get("_id")
+        if not _is_lifter(doc) or doc.get("_deleted") or not isinstance(lifter_id, str):
+            continue
+        name = " ".join(str(doc.get("name") or "").split())
+        if not name:
+            continue
+
+        entries = []
+        for entry in _list(doc.get("divisions")):
+            if not isinstance(entry, dict):
+                continue
+            entries.append({
+                "division": divisions.get(str(entry.get("divisionId"))),
+                "weight_class": weight_classes.get(str(entry.get("weightClassId"))),
+            })
+
+        lot = doc.get("lot")
+        lifters.append(RosterLifter(
+            label=f"{lot} - {name}" if lot not in (None, "") else name,
+            href=f"/meets/{meet_id}/lifter/{lifter_id}",
+            lifter_id=lifter_id,
+            divisions=tuple(entries),
+        ))
+
+    if not lifters:
+        raise RosterUnavailable(f"no lifters in meet data for {meet_id}")
+
+    def sort_key(lifter: RosterLifter):
+        lot = lifter.label.split(" - ", 1)[0] if " - " in lifter.label else ""
+        return (0, int(lot), lifter.label) if lot.isdigit() else (1, 0, lifter.label)
+
+    return sorted(lifters, key=sort_key)
+
+
+async def fetch_meet_roster(
+    meet_url: str,
+    session: Optional[HttpSession] = None,
+) -> List[RosterLifter]:
+    """Read the roster from the meet's data endpoint. Raises RosterUnavailable."""
+    meet_id = meet_id_from_url(meet_url)
+    url = meet_data_url(meet_id)
+
+    session = session or get_http_client()
+    one_off = HttpClient() if session is None else None
+    try:
+        if one_off is not None:
+            await one_off.start()
+        response = await get_fetch_scheduler().fetch(
+            session or one_off, url, headers={"Accept": "application/json"}
+        )
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        raise RosterUnavailable(f"{url}: {e!r}") from e
+    finally:
+        if one_off is not None:
+            await one_off.close()
+
+    if response.status != 200:
+        raise RosterUnavailable(f"{url} returned {response.status}")
+    # a big meet is megabytes of JSON; decode and parse it off the event loop
+    return await asyncio.to_thread(_read_meet_data, meet_id, url, response.text)
+
+
+def _read_meet_data(meet_id: str, url: str, text: str) -> List[RosterLifter]:
+    try:
+        payload = json.loads(text)
+    except ValueError as e:
+        raise RosterUnavailable(f"{url} did not return JSON") from e
+    try:
+        return parse_meet_docs(meet_id, payload)
+    except (KeyError, TypeError, AttributeError) as e:  # a shape parse_meet_docs does not expect
+        raise RosterUnavailable(f"{url}: unexpected meet data ({e!r})") from e
+
+
+async def read_roster(meet_url: str, session: Optional[HttpSession] = None) -> Optional[List[RosterLifter]]:
+    """The roster from the meet's data endpoint, or None when the direct read is off or fails."""
+    if not config.LIFTINGCAST_DIRECT:
+        return None
+    try:
+        with span("roster_api"):
+            roster = await fetch_meet_roster(meet_url, session)
+    except RosterUnavailable as e:
+        logger.warning("Direct roster read failed, falling back to the browser (%s)", e)
+        return None
+    inc("lcs_roster_source_total", source="api")
+    logger.info("Roster for %s read directly (%d lifters)", meet_url, len(roster))
+    return roster
+
+
+async def scrape_roster(meet_url: str) -> List[Tuple[str, str]]:
+    """The roster via the headless browser (launches Chromium if the pool has none)."""
+    from .playwright_scraper import scrape_liftingcast_roster  # playwright only when it is needed
+
+    roster = await scrape_liftingcast_roster(meet_url)
+    inc("lcs_roster_source_total", source="browser")
+    return roster
+
+
+async def get_roster(meet_url: str, session: Optional[HttpSession] = None) -> List[Tuple[str, str]]:
+    """
+    Roster for a meet: the direct data endpoint when it works, otherwise the
+    headless-browser scrape. Entries are RosterLifter tuples, (label, href)
+    first; the direct path also fills in lifter ids and weight classes.
+    """
+    roster = await read_roster(meet_url, session)
+    if roster is not None:
+        return roster
+    return await scrape_roster(meet_url)
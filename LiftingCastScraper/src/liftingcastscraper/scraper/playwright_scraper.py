@@ -1,37 +1,133 @@
 # src/liftingcastscraper/scraper/playwright_scraper.py
 
-from typing import List, Tuple
+from typing import TYPE_CHECKING, List, Optional
 import logging
+import time
 
-from playwright.async_api import async_playwright
+if TYPE_CHECKING:
+    from playwright.async_api import BrowserContext, Route
 
+from .. import config
+from ..instrumentation import inc, span
+from .browser_pool import BrowserManager, get_browser_manager
+from .liftingcast_api import RosterLifter
 from .utils import lifter_link_selector
 
 logger = logging.getLogger(__name__)
 
+# nothing on the roster page needs these to render the lifter links
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+BLOCKED_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "facebook.net",
+    "hotjar.com",
+    "segment.io",
+    "sentry.io",
+)
 
-async def scrape_liftingcast_roster(url: str, timeout_ms: int = 30000):
+# Runs inside the page: collects every lifter link (label, href, division
+# heading) while scrolling, so lazily rendered or virtualized rows are seen
+# too, and returns once the number of distinct links has not changed for
+# `stablePolls` polls in a row. One evaluate call instead of 2 DevTools
+# round-trips per element.
+EXTRACT_ROSTER_JS = """
+async ({selector, settleMs, stablePolls, maxMs}) => {
+  const seen = new Map();
+  const headingFor = (el) => {
+    for (let node = el; node && node !== document.body; node = node.parentElement) {
+      for (let sib = node.previousElementSibling; sib; sib = sib.previousElementSibling) {
+        if (/^H[1-6]$/.test(sib.tagName)) return sib.textContent.trim() || null;
+      }
+    }
+    return null;
+  };
+  const collect = () => {
+    for (const a of document.querySelectorAll(selector)) {
+      const href = a.getAttribute("href");
+      const label = (a.innerText || a.textContent || "").trim();
+      if (href && label && !seen.has(href)) seen.set(href, [label, href, headingFor(a)]);
+    }
+  };
+  const started = performance.now();
+  let stable = 0, last = -1, polls = 0;
+  while (stable < stablePolls && performance.now() - started < maxMs) {
+    collect();
+    polls++;
+    if (seen.size === last) stable++; else { stable = 0; last = seen.size; }
+    window.scrollBy(0, window.innerHeight);
+    await new Promise((resolve) => setTimeout(resolve, settleMs));
+  }
+  collect();
+  return {rows: Array.from(seen.values()), polls, settled: stable >= stablePolls};
+}
+"""
+
+
+async def scrape_liftingcast_roster(
+    url: str,
+    timeout_ms: int = 30000,
+    manager: Optional[BrowserManager] = None,
+) -> List[RosterLifter]:
+    """
+    Scrape the lifter links from a LiftingCast roster page as RosterLifter
+    tuples (label, href, and the division heading above the link, if any).
+
+    Uses the shared browser pool when the server has started one; otherwise
+    (CLI / scripts) a short-lived browser is launched just for this call.
+    """
     logger.info(f"Loading {url}")
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
+    manager = manager or get_browser_manager()
+    if manager is not None:
+        return await manager.run(lambda ctx: _scrape_in_context(ctx, url, timeout_ms))
 
-        # LOAD PAGE — but don’t wait for network idle (it will never happen)
-        await page.goto(url, wait_until="domcontentloaded", timeout=timeout_ms)
+    async with BrowserManager(max_contexts=1) as one_off:
+        return await one_off.run(lambda ctx: _scrape_in_context(ctx, url, timeout_ms))
 
-        # WAIT FOR LIFTERS
-        await page.wait_for_selector('a[href*="/lifter/"]', timeout=timeout_ms)
 
-        elements = await page.query_selector_all('a[href*="/lifter/"]')
+async def _block_heavy(route: "Route") -> None:
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(host in request.url for host in BLOCKED_HOSTS):
+        inc("lcs_browser_blocked_total", type=request.resource_type)
+        await route.abort()
+    else:
+        await route.continue_()
 
-        results = []
-        for el in elements:
-            name = (await el.inner_text()).strip()
-            href = await el.get_attribute("href")
-            if name and href:
-                results.append((name, href))
 
-        await browser.close()
-        return results
+async def _scrape_in_context(context: "BrowserContext", url: str, timeout_ms: int) -> List[RosterLifter]:
+    page = await context.new_page()
+    started = time.monotonic()
+    try:
+        if config.BROWSER_BLOCK_RESOURCES:
+            await page.route("**/*", _block_heavy)
+
+        # LOAD PAGE — but don’t wait for network idle (it will never happen)
+        with span("page_load"):
+            await page.goto(url, wait_until="domcontentloaded", timeout=timeout_ms)
+
+        # WAIT FOR LIFTERS
+        selector = lifter_link_selector()
+        with span("selector_wait"):
+            await page.wait_for_selector(selector, timeout=timeout_ms)
+
+        # ...then keep collecting until the roster stops growing
+        remaining_ms = max(timeout_ms - (time.monotonic() - started) * 1000, config.ROSTER_SETTLE_MS)
+        with span("link_extraction"):
+            result = await page.evaluate(EXTRACT_ROSTER_JS, {
+                "selector": selector,
+                "settleMs": config.ROSTER_SETTLE_MS,
+                "stablePolls": config.ROSTER_STABLE_POLLS,
+                "maxMs": remaining_ms,
+            })
 
+        if not result["settled"]:
+            logger.warning("Roster at %s was still changing after %d polls, using what rendered", url, result["polls"])
+        logger.info("Scraped %d lifters from %s (%d polls)", len(result["rows"]), url, result["polls"])
+        return [
+            RosterLifter(label, href, divisions=({"division": division, "weight_class": None},) if division else ())
+            for label, href, division in result["rows"]
+        ]
+    finally:
+        await page.close()
@@ -7,6 +7,10 @@ import logging
 import re #regular expressions
 import os # for direectory creation and file operatinos
 import psutil  # for memory usage monitoring
+
+from .. import config
+
+from ..instrumentation import set_gauge
 # from selenium.webdriver.common.by import By
 # from selenium.webdriver.support import expected_conditions as EC
 
@@ -43,16 +47,6 @@ def slugify(value: str) -> str:
     value = value.strip("-")
     return value or "report"
 
-def save_html_report(html: str, path: str):
-    # Ensure the output directory exists
-    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
-
-    with open(path, "w", encoding="utf-8") as f:
-        f.write(html)
-
-    return path
-
-
 def clean_lifter_name(raw_label: str) -> str:
     """
     Convert something like '105 - Anthony Hill' → 'Anthony Hill'.
@@ -87,9 +81,10 @@ def normalize_liftingcast_url(url: str) -> str:
     meet_id = match.group(1)
 
     # Build normalized roster URL
-    return f"https://liftingcast.com/meets/{meet_id}/roster"
+    return f"{config.LIFTINGCAST_BASE_URL}/meets/{meet_id}/roster"
 
 def log_mem(tag=""):
-    p = psutil.Process(os.getpid())
-    mem = p.memory_info().rss / (1024 * 1024)
-    print(f"[MEM] {tag}: {mem:.1f} MB")
\ No newline at end of file
+    """Log the current RSS and publish it as the lcs_process_rss_bytes gauge."""
+    rss = psutil.Process(os.getpid()).memory_info().rss
+    set_gauge("lcs_process_rss_bytes", rss)
+    logger.info("[MEM] %s: %.1f MB", tag, rss / (1024 * 1024))
\ No newline at end of file
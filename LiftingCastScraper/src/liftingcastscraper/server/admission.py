@@ -0,0 +1,255 @@
+# src/liftingcastscraper/server/admission.py
+"""
+Admission control for browser-backed report builds.
+
+A roster scrape launches Chromium contexts, and on a small container two or
+three at once are enough to get the process OOM-killed. Builds whose roster
+comes from LiftingCast's data endpoint (and whose lifters come from snapshots,
+the caches or the bulk index) never touch the browser, so they run
+unthrottled. A build that has to fall back to the browser takes a slot from
+the one AdmissionController first (see `pipeline.iter_people`):
+
+    - at most `max_active` builds run at once; later requests wait in a FIFO
+      queue and can see their position in it
+    - at most `max_queue` requests wait; beyond that, or after waiting
+      `queue_timeout` seconds, the request is rejected with 503 + Retry-After
+    - new requests are shed straight away while the live RSS of the server
+      and its children (Chromium, parse workers) or the host CPU (smoothed,
+      so one busy second does not trip it) is above its limit
+
+    async with admission.admit():
+        roster = await scrape_roster(meet_url)
+
+Retry-After is estimated from the recent average time a slot is held and the
+queue length.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+
+import psutil
+
+from .. import config
+from ..instrumentation import inc
+
+logger = logging.getLogger(__name__)
+
+QUEUE_FULL = "queue_full"
+QUEUE_TIMEOUT = "queue_timeout"
+MEMORY = "memory"
+CPU = "cpu"
+
+
+class Overloaded(Exception):
+    """The request was not admitted; answer 503 with Retry-After."""
+
+    def __init__(self, reason: str, retry_after: int, queue_depth: int) -> None:
+        super().__init__(f"Server busy ({reason}), retry in {retry_after}s")
+        self.reason = reason
+        self.retry_after = retry_after
+        self.queue_depth = queue_depth
+
+
+class ResourceMonitor:
+    """Cached psutil readings: RSS of this process and its children, host CPU % (EWMA)."""
+
+    CPU_SMOOTHING = 0.3  # weight of the newest CPU sample
+
+    def __init__(self, interval: float = 1.0) -> None:
+        self.interval = interval
+        self._process = psutil.Process()
+        self._read_at = 0.0
+        self.rss_mb = 0.0
+        self.cpu_percent = 0.0
+        psutil.cpu_percent(interval=None)  # first call only primes the counter
+
+    def read(self) -> "ResourceMonitor":
+        now = time.monotonic()
+        if now - self._read_at >= self.interval:
+            rss = self._process.memory_info().rss
+            for child in self._process.children(recursive=True):
+                try:
+                    rss += child.memory_info().rss
+                except psutil.Error:
+                    pass  # exited meanwhile
+            self.rss_mb = rss / (1024 * 1024)
+            sample = psutil.cpu_percent(interval=None)
+            self.cpu_percent = round(self.CPU_SMOOTHING * sample + (1 - self.CPU_SMOOTHING) * self.cpu_percent, 1)
+            self._read_at = now
+        return self
+
+
+class Ticket:
+    """One request's place in line. `position` is 0 once admitted."""
+
+    def __init__(self, controller: "AdmissionController") -> None:
+        self._controller = controller
+        self._admitted = asyncio.get_running_loop().create_future()
+        self.admitted = False
+        self.released = False
+
+    @property
+    def position(self) -> int:
+        if self.admitted:
+            return 0
+        try:
+            return self._controller._waiting.index(self) + 1
+        except ValueError:
+            return 0
+
+    async def wait(self, timeout: Optional[float]) -> bool:
+        """Wait up to `timeout` seconds for a slot. Returns whether the ticket was admitted."""
+        if self.admitted:
+            return True
+        try:
+            await asyncio.wait_for(asyncio.shield(self._admitted), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def release(self) -> None:
+        if not self.released:
+            self.released = True
+            self._controller._release(self)
+
+
+class AdmissionController:
+    """FIFO slots for report builds, with a bounded queue and resource-based shedding."""
+
+    def __init__(
+        self,
+        max_active: int = config.ADMISSION_MAX_ACTIVE,
+        max_queue: int = config.ADMISSION_MAX_QUEUE,
+        queue_timeout: float = config.ADMISSION_QUEUE_TIMEOUT,
+        rss_limit_mb: float = config.ADMISSION_RSS_LIMIT_MB,
+        cpu_limit: float = config.ADMISSION_CPU_LIMIT,
+        retry_after: int = config.ADMISSION_RETRY_AFTER,
+        monitor: Optional[ResourceMonitor] = None,
+    ) -> None:
+        self.max_active = max_active
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.rss_limit_mb = rss_limit_mb
+        self.cpu_limit = cpu_limit
+        self.retry_after = retry_after
+        self.monitor = monitor or ResourceMonitor()
+
+        self._active = 0
+        self._waiting: Deque[Ticket] = deque()
+        self._avg_duration: Optional[float] = None  # EWMA of admitted build times (s)
+        self._admitted_at: Dict[int, float] = {}
+
+        self.admitted = 0
+        self.rejected: Dict[str, int] = {}
+
+    # ---------- admission ----------
+
+    def enter(self, shed: bool = True) -> Ticket:
+        """
+        Take a ticket: admitted at once if a slot is free, otherwise queued.
+        Raises Overloaded if the queue is full or (with `shed`) memory / CPU are over their limits.
+        """
+        if shed:
+            self._check_resources()
+        ticket = Ticket(self)
+        if self._active < self.max_active and not self._waiting:
+            self._grant(ticket)
+        elif shed and len(self._waiting) >= self.max_queue:
+            raise self._reject(QUEUE_FULL)
+        else:
+            self._waiting.append(ticket)
+        return ticket
+
+    async def wait_turn(self, ticket: Ticket, timeout: Optional[float] = -1, poll: float = 1.0) -> AsyncIterator[int]:
+        """
+        Wait for a queued ticket, yielding its position every `poll` seconds
+        (nothing if it is admitted at once). Raises Overloaded after `timeout`
+        seconds: -1 uses `queue_timeout`, None waits forever.
+        """
+        timeout = self.queue_timeout if timeout == -1 else timeout
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not await ticket.wait(poll if deadline is None else min(poll, max(0.0, deadline - time.monotonic()))):
+            if deadline is not None and time.monotonic() >= deadline:
+                raise self._reject(QUEUE_TIMEOUT)
+            yield ticket.position
+
+    @asynccontextmanager
+    async def admit(self, shed: bool = True, timeout: Optional[float] = -1) -> AsyncIterator[Ticket]:
+        """Hold a slot for the body. timeout=-1 uses `queue_timeout`, None waits forever."""
+        ticket = self.enter(shed=shed)
+        try:
+            if not await ticket.wait(self.queue_timeout if timeout == -1 else timeout):
+                raise self._reject(QUEUE_TIMEOUT)
+            yield ticket
+        finally:
+            ticket.release()
+
+    def _check_resources(self) -> None:
+        reading = self.monitor.read()
+        if self.rss_limit_mb and reading.rss_mb > self.rss_limit_mb:
+            raise self._reject(MEMORY)
+        if self.cpu_limit and reading.cpu_percent > self.cpu_limit:
+            raise self._reject(CPU)
+
+    def _reject(self, reason: str) -> Overloaded:
+        self.rejected[reason] = self.rejected.get(reason, 0) + 1
+        inc("lcs_admission_total", result="rejected", reason=reason)
+        logger.warning("Rejecting report (%s): %d active, %d queued", reason, self._active, len(self._waiting))
+        return Overloaded(reason, self.retry_after_seconds(), len(self._waiting))
+
+    def _grant(self, ticket: Ticket) -> None:
+        self._active += 1
+        self.admitted += 1
+        ticket.admitted = True
+        self._admitted_at[id(ticket)] = time.monotonic()
+        if not ticket._admitted.done():
+            ticket._admitted.set_result(True)
+        inc("lcs_admission_total", result="admitted")
+
+    def _release(self, ticket: Ticket) -> None:
+        if not ticket.admitted:
+            # gave up while queued (timeout or client went away)
+            try:
+                self._waiting.remove(ticket)
+            except ValueError:
+                pass
+            return
+
+        started = self._admitted_at.pop(id(ticket), None)
+        if started is not None:
+            duration = time.monotonic() - started
+            self._avg_duration = duration if self._avg_duration is None else 0.8 * self._avg_duration + 0.2 * duration
+        self._active -= 1
+        while self._waiting and self._active < self.max_active:
+            self._grant(self._waiting.popleft())
+
+    # ---------- reporting ----------
+
+    def retry_after_seconds(self) -> int:
+        """Rough time until a new request would get a slot."""
+        if self._avg_duration is None:
+            return self.retry_after
+        rounds = (len(self._waiting) + 1) / max(self.max_active, 1)
+        return max(1, min(300, math.ceil(self._avg_duration * rounds)))
+
+    def stats(self) -> Dict[str, Any]:
+        reading = self.monitor.read()
+        return {
+            "active": self._active,
+            "queued": len(self._waiting),
+            "max_active": self.max_active,
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "rejected": dict(self.rejected),
+            "avg_build_seconds": round(self._avg_duration, 3) if self._avg_duration is not None else None,
+            "retry_after": self.retry_after_seconds(),
+            "rss_mb": round(reading.rss_mb, 1),
+            "rss_limit_mb": self.rss_limit_mb,
+            "cpu_percent": reading.cpu_percent,
+            "cpu_limit": self.cpu_limit,
+        }
@@ -0,0 +1,176 @@
+# src/liftingcastscraper/server/compression.py
+"""
+Response compression for the API.
+
+Report JSON is mostly repeated keys and numbers, so it compresses 10-20x,
+and the extension popup often fetches it over a venue's mobile connection.
+`CompressionMiddleware` encodes response bodies with brotli, when the
+`brotli` (or `brotlicffi`) package is installed and the client accepts it,
+or with gzip otherwise:
+
+    - bodies under LCS_COMPRESSION_MIN_BYTES, responses that already have a
+      Content-Encoding, and clients that accept neither pass through untouched
+    - streamed responses (NDJSON report stream, HTML report) are flushed
+      after every chunk, so each event still reaches the client as soon as it
+      is sent
+    - large one-shot bodies are compressed in a thread, off the event loop
+"""
+
+import asyncio
+import logging
+import zlib
+from typing import List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .. import config
+from ..instrumentation import inc
+
+try:
+    import brotli as _brotli
+except ImportError:  # pragma: no cover - optional dependency
+    try:
+        import brotlicffi as _brotli
+    except ImportError:
+        _brotli = None
+
+logger = logging.getLogger(__name__)
+
+GZIP = "gzip"
+BROTLI = "br"
+
+# one-shot bodies at least this big are compressed in a worker thread
+THREAD_MIN_BYTES = 256 * 1024
+# already compressed or not worth it
+SKIP_CONTENT_TYPES = ("image/", "audio/", "video/", "application/zip", "application/gzip", "font/")
+
+
+def available_encodings() -> List[str]:
+    """Encodings this process can produce, preferred first."""
+    return [BROTLI, GZIP] if _brotli is not None else [GZIP]
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Best encoding both sides support for an Accept-Encoding header, or None."""
+    accepted = {}
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name:
+            accepted[name] = quality
+    for encoding in available_encodings():
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+class Encoder:
+    """Incremental compressor; `chunk(data, last)` returns bytes that can be sent right away."""
+
+    def __init__(self, encoding: str) -> None:
+        self.encoding = encoding
+        if encoding == BROTLI:
+            self._brotli = _brotli.Compressor(quality=config.COMPRESSION_BROTLI_QUALITY)
+        else:
+            self._gzip = zlib.compressobj(config.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def chunk(self, data: bytes, last: bool) -> bytes:
+        if self.encoding == BROTLI:
+            return self._brotli.process(data) + (self._brotli.finish() if last else self._brotli.flush())
+        return self._gzip.compress(data) + self._gzip.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """One-shot compression with the server's settings (used by the benchmark too)."""
+    return Encoder(encoding).chunk(data, last=True)
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = config.COMPRESSION_MIN_BYTES) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _Responder(send, encoding, self.minimum_size).send)
+
+
+class _Responder:
+    """Wraps `send` for one response: holds the start message until the first body chunk decides."""
+
+    def __init__(self, send: Send, encoding: str, minimum_size: int) -> None:
+        self._send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.start: Optional[Message] = None
+        self.encoder: Optional[Encoder] = None
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        kind = message["type"]
+        if kind == "http.response.start":
+            self.start = message
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            self.passthrough = (
+                "content-encoding" in headers
+                or message["status"] in (204, 206, 304)
+                or content_type.startswith(SKIP_CONTENT_TYPES)
+            )
+            if self.passthrough:
+                await self._send(message)
+            return
+        if kind != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.start is not None:
+            start, self.start = self.start, None
+            headers = MutableHeaders(raw=start["headers"])
+            headers.add_vary_header("Accept-Encoding")
+            if not more_body and len(body) < self.minimum_size:
+                self.passthrough = True
+                await self._send(start)
+                await self._send(message)
+                return
+            self.encoder = Encoder(self.encoding)
+            headers["Content-Encoding"] = self.encoding
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                message["body"] = await self._compress(body, last=True)
+                headers["Content-Length"] = str(len(message["body"]))
+                self._count(len(body), len(message["body"]))
+                await self._send(start)
+                await self._send(message)
+                return
+            await self._send(start)
+
+        message["body"] = await self._compress(body, last=not more_body)
+        self._count(len(body), len(message["body"]))
+        await self._send(message)
+
+    async def _compress(self, body: bytes, last: bool) -> bytes:
+        if len(body) >= THREAD_MIN_BYTES:
+            return await asyncio.to_thread(self.encoder.chunk, body, last)
+        return self.encoder.chunk(body, last)
+
+    def _count(self, raw: int, sent: int) -> None:
+        inc("lcs_response_bytes_total", value=raw, encoding=self.encoding, stage="raw")
+        inc("lcs_response_bytes_total", value=sent, encoding=self.encoding, stage="sent")
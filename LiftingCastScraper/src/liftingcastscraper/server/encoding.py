@@ -0,0 +1,191 @@
+# src/liftingcastscraper/server/encoding.py
+"""
+Response shaping for the report endpoints: field projection and the
+columnar encoding.
+
+By default a report sends every person with their full meet history, which
+for a big meet is several MB. A request can ask for less:
+
+    fields          person keys to send, e.g. ["name", "opl_profile", "analytics"]
+                    for bests only (default: all of PERSON_FIELDS)
+    history_limit   only the newest N meets of each history
+    history_fields  only these keys of each meet row, e.g. ["Date", "Total", "Class"]
+
+and for a more compact shape (encoding="columns"):
+
+    {"encoding": "columns", "count": N,
+     "name": [...], "opl_profile": [...], ...,     # one array per person field
+     "analytics": {"best_total": [...], ...},      # one array per stat, null where none
+     "opl_summary": {"offsets": [0, 3, 3, 7, ...], # person i owns rows offsets[i]:offsets[i+1]
+                     "Date": [...], "Total": [...], ...}}
+
+Keys are written once per column instead of once per row, so the
+columnar form is smaller before compression and compresses better too.
+"""
+
+from dataclasses import dataclass, fields as dataclass_fields
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from ..models import LIFT_KEYS, NUMBER_FIELDS, POINTS_KEYS, TEXT_FIELDS, Lifter, LifterStats, MeetResult
+
+PERSON_FIELDS = ("name", "liftingcast_href", "divisions", "lookup", "opl_profile", "opl_summary", "analytics")
+STATS_FIELDS = tuple(f.name for f in dataclass_fields(LifterStats))
+ROWS = "rows"
+COLUMNS = "columns"
+ENCODINGS = (ROWS, COLUMNS)
+
+
+@dataclass(frozen=True, slots=True)
+class Projection:
+    fields: Sequence[str] = PERSON_FIELDS
+    history_limit: Optional[int] = None
+    history_fields: Optional[Sequence[str]] = None
+    encoding: str = ROWS
+
+    @classmethod
+    def parse(
+        cls,
+        fields: Optional[Sequence[str]] = None,
+        history_limit: Optional[int] = None,
+        history_fields: Optional[Sequence[str]] = None,
+        encoding: str = ROWS,
+    ) -> "Projection":
+        """Validate request parameters; raises ValueError with a message fit for a 400."""
+        unknown = [name for name in fields or () if name not in PERSON_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown fields {unknown}; choose from {list(PERSON_FIELDS)}")
+        unknown = [key for key in history_fields or () if key not in HISTORY_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown history_fields {unknown}; choose from {list(HISTORY_FIELDS)}")
+        if history_limit is not None and history_limit < 0:
+            raise ValueError("history_limit must be >= 0")
+        if encoding not in ENCODINGS:
+            raise ValueError(f"encoding must be one of {list(ENCODINGS)}")
+        return cls(
+            fields=tuple(dict.fromkeys(fields)) if fields else PERSON_FIELDS,
+            history_limit=history_limit,
+            history_fields=tuple(dict.fromkeys(history_fields)) if history_fields else None,
+            encoding=encoding,
+        )
+
+    @property
+    def is_full(self) -> bool:
+        """True when the people can be sent as they are (the default shape)."""
+        return (
+            self.fields == PERSON_FIELDS
+            and self.history_limit is None
+            and self.history_fields is None
+            and self.encoding == ROWS
+        )
+
+
+FULL = Projection()
+
+
+# ---------- meet rows ----------
+
+WIRE_KEYS = (*TEXT_FIELDS, *NUMBER_FIELDS, *LIFT_KEYS)
+HISTORY_FIELDS = (*WIRE_KEYS, *POINTS_KEYS)  # what history_fields may name
+
+
+def _attribute(key: str) -> Optional[str]:
+    """MeetResult attribute holding a wire key, for the keys that map one-to-one."""
+    if key in LIFT_KEYS:
+        return key.lower()  # a tuple; serialized as an array
+    return TEXT_FIELDS.get(key) or NUMBER_FIELDS.get(key)
+
+
+def _getter(key: str) -> Callable[[MeetResult], Any]:
+    """Reads one wire key straight off a MeetResult, without building the whole to_wire() dict."""
+    name = _attribute(key)
+    if name is not None:
+        return attrgetter(name)
+    if key in POINTS_KEYS:
+        return lambda row: row.points if row.points_label == key else None
+    return lambda row: row.extra.get(key) if row.extra else None
+
+
+def _row_keys(rows: Iterable[MeetResult]) -> List[str]:
+    """Every wire key these rows have: the fixed ones, the points labels in use and any extras."""
+    keys = dict.fromkeys(WIRE_KEYS)
+    for row in rows:
+        keys[row.points_label] = None
+        if row.extra:
+            keys.update(dict.fromkeys(row.extra))
+    return list(keys)
+
+
+def _history(rows: Optional[List[MeetResult]], projection: Projection) -> Optional[List[MeetResult]]:
+    if rows is None or projection.history_limit is None:
+        return rows
+    return sorted(rows, key=lambda row: row.date, reverse=True)[:projection.history_limit]
+
+
+def _project_rows(rows: Optional[List[MeetResult]], projection: Projection) -> Optional[List[Any]]:
+    rows = _history(rows, projection)
+    if rows is None or projection.history_fields is None:
+        return rows
+    # plain attributes in one attrgetter call per row, the rest (points, extras) one by one
+    plain = [key for key in projection.history_fields if _attribute(key) is not None]
+    other = [(key, _getter(key)) for key in projection.history_fields if _attribute(key) is None]
+    get_plain = attrgetter(*(_attribute(key) for key in plain)) if plain else None
+    out = []
+    for row in rows:
+        values = get_plain(row) if get_plain is not None else ()
+        projected = dict(zip(plain, values if len(plain) != 1 else (values,)))
+        for key, get in other:
+            projected[key] = get(row)
+        out.append(projected)
+    return out
+
+
+def project_person(person: Optional[Lifter], projection: Projection) -> Optional[Dict[str, Any]]:
+    """The requested keys of one person; records (MeetResult, LifterStats) are left for dumps()."""
+    if person is None:
+        return None
+    out: Dict[str, Any] = {}
+    for key in projection.fields:
+        if key == "opl_summary":
+            out[key] = _project_rows(person.opl_summary, projection)
+        else:
+            out[key] = getattr(person, key)
+    return out
+
+
+def encode_people(people: Sequence[Optional[Lifter]], projection: Projection = FULL) -> Any:
+    """`people` shaped for a response: the records themselves, projected rows, or columns."""
+    if projection.is_full:
+        return people
+    if projection.encoding == ROWS:
+        return [project_person(person, projection) for person in people]
+    return _columns(people, projection)
+
+
+def _columns(people: Sequence[Lifter], projection: Projection) -> Dict[str, Any]:
+    out: Dict[str, Any] = {"encoding": COLUMNS, "count": len(people)}
+    for key in projection.fields:
+        if key == "analytics":
+            stats = [person.analytics for person in people]
+            out[key] = {
+                name: [getattr(s, name) if s is not None else None for s in stats] for name in STATS_FIELDS
+            }
+        elif key == "opl_summary":
+            out[key] = _history_columns(people, projection)
+        else:
+            out[key] = [getattr(person, key) for person in people]
+    return out
+
+
+def _history_columns(people: Sequence[Lifter], projection: Projection) -> Dict[str, Any]:
+    offsets = [0]
+    rows: List[MeetResult] = []
+    for person in people:
+        rows.extend(_history(person.opl_summary, projection) or ())
+        offsets.append(len(rows))
+
+    columns: Dict[str, Any] = {"offsets": offsets}
+    for key in projection.history_fields or _row_keys(rows):
+        get = _getter(key)
+        columns[key] = [get(row) for row in rows]
+    return columns
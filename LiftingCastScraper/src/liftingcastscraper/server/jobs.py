@@ -0,0 +1,313 @@
+# src/liftingcastscraper/server/jobs.py
+"""
+Background report jobs.
+
+`POST /api/report` with `"background": true` enqueues a job instead of
+building the report inside the request. Jobs are deduplicated by normalized
+meet URL (concurrent requests for the same meet share one run; a full-refresh
+request only shares a full-refresh run), executed by a
+bounded pool of worker tasks, and polled with `GET /api/report/{job_id}`.
+
+The store is pluggable: in-memory by default, SQLite when jobs should survive
+a restart (unfinished jobs are re-queued on startup).
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from .. import config
+from ..models import Lifter, dumps, loads
+from ..pipeline import build_people
+from ..scraper.utils import normalize_liftingcast_url
+from .admission import AdmissionController, Overloaded
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+ACTIVE_STATUSES = (QUEUED, RUNNING)
+
+
+@dataclass
+class Job:
+    job_id: str
+    meet_url: str
+    use_snapshot: bool = True  # False: look every lifter up again (full_refresh)
+    status: str = QUEUED
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    done: int = 0
+    total: Optional[int] = None
+    error: Optional[str] = None
+    people: Optional[List[Optional[Lifter]]] = None
+
+
+class JobStore(ABC):
+    """Persistence for jobs. Implementations must be safe to call from the event loop."""
+
+    @abstractmethod
+    def add(self, job: Job) -> None: ...
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[Job]: ...
+
+    @abstractmethod
+    def save(self, job: Job) -> None: ...
+
+    @abstractmethod
+    def find_active(self, meet_url: str, use_snapshot: bool = True) -> Optional[Job]:
+        """
+        Return a queued/running job for this (normalized) meet URL, if any.
+        A full-refresh job also serves requests that allow the snapshot, not
+        the other way round.
+        """
+
+    @abstractmethod
+    def unfinished(self) -> List[Job]:
+        """Jobs left queued/running, e.g. by a restart."""
+
+    @abstractmethod
+    def prune(self, older_than: float) -> int:
+        """Delete finished jobs that finished before `older_than`."""
+
+
+class InMemoryJobStore(JobStore):
+    def __init__(self) -> None:
+        self._jobs: Dict[str, Job] = {}
+
+    def add(self, job: Job) -> None:
+        self._jobs[job.job_id] = job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def save(self, job: Job) -> None:
+        self._jobs[job.job_id] = job
+
+    def find_active(self, meet_url: str, use_snapshot: bool = True) -> Optional[Job]:
+        for job in self._jobs.values():
+            if (
+                job.meet_url == meet_url
+                and job.status in ACTIVE_STATUSES
+                and (use_snapshot or not job.use_snapshot)
+            ):
+                return job
+        return None
+
+    def unfinished(self) -> List[Job]:
+        return [job for job in self._jobs.values() if job.status in ACTIVE_STATUSES]
+
+    def prune(self, older_than: float) -> int:
+        stale = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at < older_than
+        ]
+        for job_id in stale:
+            del self._jobs[job_id]
+        return len(stale)
+
+
+class SQLiteJobStore(JobStore):
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id       TEXT PRIMARY KEY,
+                meet_url     TEXT NOT NULL,
+                status       TEXT NOT NULL,
+                finished_at  REAL,
+                data         TEXT NOT NULL,
+                use_snapshot INTEGER NOT NULL DEFAULT 1
+            )
+            """
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        if "use_snapshot" not in columns:  # store created before full_refresh jobs
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN use_snapshot INTEGER NOT NULL DEFAULT 1")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_meet_status ON jobs (meet_url, status)")
+        self._conn.commit()
+
+    def _write(self, job: Job) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO jobs (job_id, meet_url, status, finished_at, data, use_snapshot) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    job.job_id, job.meet_url, job.status, job.finished_at,
+                    dumps(vars(job)).decode("utf-8"), int(job.use_snapshot),
+                ),
+            )
+            self._conn.commit()
+
+    def _query(self, sql: str, params: tuple) -> List[Job]:
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._job(loads(data)) for (data,) in rows]
+
+    @staticmethod
+    def _job(data: Dict[str, Any]) -> Job:
+        if data.get("people") is not None:
+            data["people"] = [Lifter.from_wire(p) if p is not None else None for p in data["people"]]
+        return Job(**data)
+
+    def add(self, job: Job) -> None:
+        self._write(job)
+
+    def save(self, job: Job) -> None:
+        self._write(job)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        jobs = self._query("SELECT data FROM jobs WHERE job_id = ?", (job_id,))
+        return jobs[0] if jobs else None
+
+    def find_active(self, meet_url: str, use_snapshot: bool = True) -> Optional[Job]:
+        jobs = self._query(
+            "SELECT data FROM jobs WHERE meet_url = ? AND status IN (?, ?) AND (use_snapshot = 0 OR ?) LIMIT 1",
+            (meet_url, *ACTIVE_STATUSES, int(use_snapshot)),
+        )
+        return jobs[0] if jobs else None
+
+    def unfinished(self) -> List[Job]:
+        return self._query("SELECT data FROM jobs WHERE status IN (?, ?)", ACTIVE_STATUSES)
+
+    def prune(self, older_than: float) -> int:
+        with self._lock:
+            cur = self._conn.execute(
+                "DELETE FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ?", (older_than,)
+            )
+            self._conn.commit()
+        return cur.rowcount
+
+
+class JobQueue:
+    """Bounded pool of worker tasks executing report jobs from a store."""
+
+    def __init__(
+        self,
+        store: JobStore,
+        workers: int = config.JOB_WORKERS,
+        admission: Optional[AdmissionController] = None,
+    ) -> None:
+        self.store = store
+        self.workers = workers
+        # jobs share the browser slots with synchronous requests (they wait, never shed)
+        self.admission = admission
+        self._queue: "asyncio.Queue[str]" = asyncio.Queue()
+        self._tasks: List[asyncio.Task] = []
+        # live Job objects for running jobs, so progress is visible without a store round-trip
+        self._running: Dict[str, Job] = {}
+
+    async def start(self) -> None:
+        for job in self.store.unfinished():
+            logger.info("Re-queueing unfinished job %s (%s)", job.job_id, job.meet_url)
+            job.status = QUEUED
+            self.store.save(job)
+            self._queue.put_nowait(job.job_id)
+
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(self, meet_url: str, use_snapshot: bool = True) -> Job:
+        """Enqueue a report for `meet_url`, or return the job already working on it."""
+        meet_url = normalize_liftingcast_url(meet_url)
+
+        existing = self.store.find_active(meet_url, use_snapshot)
+        if existing is not None:
+            return self._running.get(existing.job_id, existing)
+
+        self.store.prune(time.time() - config.JOB_RETENTION)
+
+        job = Job(job_id=uuid.uuid4().hex, meet_url=meet_url, use_snapshot=use_snapshot)
+        self.store.add(job)
+        self._queue.put_nowait(job.job_id)
+        logger.info("Queued job %s for %s", job.job_id, meet_url)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._running.get(job_id) or self.store.get(job_id)
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    async def _worker(self, worker_id: int) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                job = self.store.get(job_id)
+                if job is not None and job.status == QUEUED:
+                    await self._run(job)
+            except Exception:
+                logger.exception("Worker %d crashed on job %s", worker_id, job_id)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job) -> None:
+        job.status = RUNNING
+        job.started_at = time.time()
+        self.store.save(job)
+        self._running[job.job_id] = job
+
+        def progress(event: Dict[str, Any]) -> None:
+            if event["type"] == "roster":
+                job.total = event["total"]
+            elif event["type"] == "progress":
+                job.done = event["done"]
+
+        try:
+            # through report_flight, so a job and synchronous requests for the
+            # same meet share one run (progress is only seen if the job started it;
+            # people are only stored once the run is done)
+            while True:
+                try:
+                    people = await build_people(
+                        job.meet_url, use_snapshot=job.use_snapshot,
+                        admission=self.admission, shed=False, on_event=progress,
+                    )
+                    break
+                except Overloaded:
+                    # joined a request's run that was turned away; jobs wait for a slot instead
+                    logger.info("Job %s joined a run that was shed, starting its own", job.job_id)
+            job.people = people
+            job.total = job.done = len(people)
+            job.status = DONE
+            job.finished_at = time.time()
+        except Exception as e:
+            logger.exception("Job %s failed", job.job_id)
+            job.status = FAILED
+            job.error = str(e)
+            job.finished_at = time.time()
+        finally:
+            # cancelled at shutdown: saved as RUNNING without finished_at, so
+            # prune() leaves it alone and start() re-queues it
+            self.store.save(job)
+            self._running.pop(job.job_id, None)
+
+
+def make_job_store() -> JobStore:
+    """Build the store selected by LCS_JOB_STORE ("memory" or "sqlite")."""
+    if config.JOB_STORE == "sqlite":
+        return SQLiteJobStore(config.JOB_STORE_PATH)
+    if config.JOB_STORE != "memory":
+        raise ValueError(f"Unknown job store: {config.JOB_STORE}")
+    return InMemoryJobStore()
@@ -1,18 +1,82 @@
 # src/liftingcastscraper/server/main.py
 
 import asyncio
+import logging
 import psutil
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 
-from liftingcastscraper.pipeline import build_people
+from liftingcastscraper import config
+from liftingcastscraper.http_client import get_http_client, start_http_client, stop_http_client
+from liftingcastscraper.instrumentation import collect_timings, inc, render_prometheus, set_gauge
+from liftingcastscraper.models import dumps
+from liftingcastscraper.pipeline import build_batch, build_people, iter_people, report_flight
+from liftingcastscraper.opl_ipf.cache import get_lookup_cache
+from liftingcastscraper.opl_ipf.http_cache import get_http_cache
+from liftingcastscraper.opl_ipf.lookup import lookup_flight
+from liftingcastscraper.opl_ipf.parse_pool import shutdown_parse_executor
+from liftingcastscraper.opl_ipf.scheduler import get_fetch_scheduler
+from liftingcastscraper.scraper.browser_pool import (
+    get_browser_manager,
+    start_browser_manager,
+    stop_browser_manager,
+)
+from liftingcastscraper.scraper.utils import normalize_liftingcast_url
+from liftingcastscraper.server.admission import AdmissionController, Overloaded
+from liftingcastscraper.server.compression import CompressionMiddleware
+from liftingcastscraper.server.encoding import COLUMNS, FULL, Projection, encode_people, project_person
+from liftingcastscraper.server.jobs import Job, JobQueue, make_job_store
+from liftingcastscraper.snapshots import REUSED, get_snapshot_store
+from liftingcastscraper.warmup import BACKGROUND, BLOCKING, warm_up
+
+logger = logging.getLogger(__name__)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse that writes Lifter / MeetResult records straight to bytes (orjson when installed)."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
 
 
-app = FastAPI(title="LiftingCast → OpenPowerlifting API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One HTTP client (keep-alive, DNS cache) and one Chromium for the whole process;
+    # Chromium, parse workers and caches are started by the warm-up or on first use
+    await start_http_client()
+    await start_browser_manager(launch=False)
+    # every browser-backed roster scrape, synchronous or background, takes a slot here first
+    app.state.admission = AdmissionController()
+    app.state.jobs = JobQueue(make_job_store(), admission=app.state.admission)
+    await app.state.jobs.start()
+
+    app.state.warmup = None
+    warmup_task: Optional[asyncio.Task] = None
+    if config.WARMUP == BLOCKING:
+        app.state.warmup = await warm_up()
+    elif config.WARMUP == BACKGROUND:
+        async def _warm_up_in_background() -> None:
+            app.state.warmup = await warm_up()
+
+        warmup_task = asyncio.create_task(_warm_up_in_background())
+    try:
+        yield
+    finally:
+        if warmup_task is not None:
+            warmup_task.cancel()
+        await app.state.jobs.stop()
+        await stop_browser_manager()
+        await stop_http_client()
+        shutdown_parse_executor()
+
+
+app = FastAPI(title="LiftingCast → OpenPowerlifting API", lifespan=lifespan)
 
 # Allow your Chrome extension or frontend to call the API
 app.add_middleware(
@@ -22,31 +86,319 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+if config.COMPRESSION_ENABLED:
+    # gzip, or brotli when installed; streamed responses are flushed per chunk
+    app.add_middleware(CompressionMiddleware)
+
+@app.exception_handler(Overloaded)
+async def overloaded(request: Request, exc: Overloaded):
+    return JSONResponse(
+        status_code=503,
+        content={
+            "detail": str(exc),
+            "reason": exc.reason,
+            "retry_after": exc.retry_after,
+            "queue_depth": exc.queue_depth,
+        },
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+def _check_meet_url(meet_url: str) -> None:
+    try:
+        normalize_liftingcast_url(meet_url)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 
 class ReportRequest(BaseModel):
     meet_url: str
+    background: bool = False  # enqueue a job and poll GET /api/report/{job_id} instead of waiting
+    include_timings: bool = False  # attach a per-stage timing breakdown to the response
+    full_refresh: bool = False  # look every lifter up again instead of reusing the meet's last run
+    # response shaping (server/encoding.py); the defaults send everything, one dict per person
+    fields: Optional[List[str]] = None  # person keys to send, e.g. ["name", "analytics"] for bests only
+    history_limit: Optional[int] = None  # only the newest N meets per lifter
+    history_fields: Optional[List[str]] = None  # only these keys per meet, e.g. ["Date", "Total"]
+    encoding: str = "rows"  # "columns": one array per field instead of one dict per person
+
+    def projection(self) -> Projection:
+        try:
+            return Projection.parse(self.fields, self.history_limit, self.history_fields, self.encoding)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
 class ReportResponse(BaseModel):
     meet_url: str
     generated_at: str
-    people: List[Dict[str, Any]]
+    people: List[Dict[str, Any]] | Dict[str, Any]  # a dict of columns with encoding="columns"
+    reused: int = 0  # lifters carried over unchanged from the meet's previous run
+    refreshed: int = 0  # lifters looked up this time (new, renamed, or no snapshot)
+    timings: Optional[Dict[str, Any]] = None
+
+class BatchReportRequest(BaseModel):
+    meet_urls: List[str]  # e.g. every flight / platform of one weekend
+    full_refresh: bool = False
+
+class BatchReportResponse(BaseModel):
+    generated_at: str
+    reports: List[ReportResponse]  # one per meet that succeeded
+    errors: Dict[str, str]  # meet URL -> error, for meets that failed
+    roster_entries: int
+    unique_lifters: int  # each looked up at most once for the whole batch
+
+class JobResponse(BaseModel):
+    job_id: str
+    meet_url: str
+    status: str
+    done: int
+    total: Optional[int]
+    created_at: str
+    started_at: Optional[str]
+    finished_at: Optional[str]
+    error: Optional[str]
+    result: Optional[ReportResponse]
+
+
+def _iso(ts: Optional[float]) -> Optional[str]:
+    return datetime.utcfromtimestamp(ts).isoformat() + "Z" if ts is not None else None
+
+
+# Responses are built as plain dicts holding the typed records and serialized by
+# FastJSONResponse; the pydantic models above document the shape (response_model).
+
+def _report_response(
+    meet_url: str, generated_at: str, people: List[Any], projection: Projection = FULL, **extra
+) -> Dict[str, Any]:
+    reused = sum(1 for person in people if person is not None and person.lookup == REUSED)
+    return {
+        "meet_url": meet_url,
+        "generated_at": generated_at,
+        "people": encode_people(people, projection),
+        "reused": reused,
+        "refreshed": len(people) - reused,
+        "timings": None,
+        **extra,
+    }
+
+
+def _job_response(job: Job, projection: Projection = FULL) -> Dict[str, Any]:
+    result = None
+    if job.people is not None:
+        result = _report_response(job.meet_url, _iso(job.finished_at), job.people, projection)
+    return {
+        "job_id": job.job_id,
+        "meet_url": job.meet_url,
+        "status": job.status,
+        "done": job.done,
+        "total": job.total,
+        "created_at": _iso(job.created_at),
+        "started_at": _iso(job.started_at),
+        "finished_at": _iso(job.finished_at),
+        "error": job.error,
+        "result": result,
+    }
 
 
 @app.post("/api/report", response_model=ReportResponse)
-async def create_report(body: ReportRequest):
+async def create_report(body: ReportRequest, request: Request):
     if not body.meet_url:
         raise HTTPException(status_code=400, detail="meet_url is required")
+    projection = body.projection()
+    _check_meet_url(body.meet_url)
+
+    if body.background:
+        try:
+            job = request.app.state.jobs.submit(body.meet_url, use_snapshot=not body.full_refresh)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return FastJSONResponse(
+            status_code=202,
+            content=_job_response(job),
+            headers={"Location": f"/api/report/{job.job_id}"},
+        )
+
+    with collect_timings() as timings:
+        try:
+            people = await build_people(
+                body.meet_url, use_snapshot=not body.full_refresh, admission=request.app.state.admission
+            )
+        except Overloaded:
+            raise  # 503 + Retry-After (see the handler above)
+        except Exception as e:
+            inc("lcs_reports_total", outcome="error")
+            raise HTTPException(status_code=500, detail=str(e))
+    inc("lcs_reports_total", outcome="ok")
+
+    return FastJSONResponse(_report_response(
+        body.meet_url,
+        datetime.utcnow().isoformat() + "Z",
+        people,
+        projection,
+        timings=timings.as_dict() if body.include_timings else None,
+    ))
+
+
+@app.post("/api/reports", response_model=BatchReportResponse)
+async def create_reports(body: BatchReportRequest, request: Request):
+    """Several meets in one go; lifters appearing in more than one meet are looked up once."""
+    if not body.meet_urls:
+        raise HTTPException(status_code=400, detail="meet_urls is required")
+    if len(body.meet_urls) > config.BATCH_MAX_MEETS:
+        raise HTTPException(status_code=400, detail=f"At most {config.BATCH_MAX_MEETS} meets per batch")
 
     try:
-        people = await build_people(body.meet_url)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-    return ReportResponse(
-        meet_url=body.meet_url,
-        generated_at=datetime.utcnow().isoformat() + "Z",
-        people=people,
-    )
+        # meets whose roster needs the browser each take a slot; one turned away lands in `errors`
+        batch = await build_batch(
+            body.meet_urls, use_snapshot=not body.full_refresh, admission=request.app.state.admission
+        )
+    except ValueError as e:  # malformed meet URL
+        raise HTTPException(status_code=400, detail=str(e))
+    inc("lcs_reports_total", outcome="ok", value=len(batch.people))
+    if batch.errors:
+        inc("lcs_reports_total", outcome="error", value=len(batch.errors))
+
+    generated_at = datetime.utcnow().isoformat() + "Z"
+    return FastJSONResponse({
+        "generated_at": generated_at,
+        "reports": [_report_response(url, generated_at, people) for url, people in batch.people.items()],
+        "errors": batch.errors,
+        "roster_entries": batch.roster_entries,
+        "unique_lifters": batch.unique_lifters,
+    })
+
+
+@app.post("/api/report/stream")
+async def stream_report(body: ReportRequest, request: Request):
+    """
+    Same work as /api/report, streamed as NDJSON: the roster first, then one
+    `lifter` event per lookup as soon as it resolves, plus `progress` events.
+    While waiting for a browser slot (admission), `queued` events report the position.
+    `fields` / `history_limit` / `history_fields` apply to each lifter event.
+    """
+    if not body.meet_url:
+        raise HTTPException(status_code=400, detail="meet_url is required")
+    projection = body.projection()
+    if projection.encoding == COLUMNS:
+        raise HTTPException(status_code=400, detail="The stream sends one lifter per event; use encoding=rows")
+    _check_meet_url(body.meet_url)
+    admission: AdmissionController = request.app.state.admission
+
+    async def events():
+        with collect_timings() as timings:
+            try:
+                async for event in iter_people(
+                    body.meet_url, use_snapshot=not body.full_refresh, admission=admission
+                ):
+                    if event["type"] == "lifter" and not projection.is_full:
+                        event["person"] = project_person(event["person"], projection)
+                    elif event["type"] == "analytics" and "analytics" not in projection.fields:
+                        continue
+                    elif event["type"] == "done":
+                        event["generated_at"] = datetime.utcnow().isoformat() + "Z"
+                        if body.include_timings:
+                            event["timings"] = timings.as_dict()
+                    yield dumps(event) + b"\n"
+            except Overloaded as e:
+                # headers are already sent, so the 503 goes in-band
+                yield dumps({"type": "error", "detail": str(e), "retry_after": e.retry_after}) + b"\n"
+                return
+            except Exception as e:
+                # headers are already sent, so report the failure in-band
+                logger.exception("Streaming report failed for %s", body.meet_url)
+                inc("lcs_reports_total", outcome="error")
+                yield dumps({"type": "error", "detail": str(e)}) + b"\n"
+                return
+        inc("lcs_reports_total", outcome="ok")
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
+# registered before /api/report/{job_id}, which would otherwise match "<meet>.html"
+@app.get("/api/report/{meet}.html", response_class=StreamingResponse)
+async def html_report(meet: str, request: Request, full_refresh: bool = False):
+    """Build the report for a LiftingCast meet id and stream it back as rendered HTML."""
+    meet_url = f"{config.LIFTINGCAST_BASE_URL}/meets/{meet}/roster"
+    with collect_timings():
+        try:
+            people = await build_people(
+                meet_url, use_snapshot=not full_refresh, admission=request.app.state.admission
+            )
+        except Overloaded:
+            raise
+        except Exception as e:
+            inc("lcs_reports_total", outcome="error")
+            raise HTTPException(status_code=500, detail=str(e))
+    inc("lcs_reports_total", outcome="ok")
+    from liftingcastscraper.reports.html_report import generate_stream  # jinja2 only when a page is rendered
+
+    return StreamingResponse(generate_stream(people), media_type="text/html; charset=utf-8")
+
+
+@app.get("/api/report/{job_id}", response_model=JobResponse)
+async def get_report_job(
+    job_id: str,
+    request: Request,
+    fields: Optional[List[str]] = Query(None),
+    history_limit: Optional[int] = None,
+    history_fields: Optional[List[str]] = Query(None),
+    encoding: str = "rows",
+):
+    """Job status, and the report once it is done (shaped like POST /api/report)."""
+    try:
+        projection = Projection.parse(fields, history_limit, history_fields, encoding)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    job = request.app.state.jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+    return FastJSONResponse(_job_response(job, projection))
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics(request: Request):
+    """Prometheus scrape endpoint: stage timings, counters and live pool gauges."""
+    for key, value in get_fetch_scheduler().metrics().items():
+        if isinstance(value, (int, float)):
+            set_gauge(f"lcs_fetch_{key}", value)
+
+    lookup_cache = get_lookup_cache()
+    if lookup_cache is not None:
+        for tier, stats in lookup_cache.stats().items():
+            for key, value in stats.items():
+                if isinstance(value, (int, float)):
+                    set_gauge(f"lcs_cache_{key}", value, tier=tier)
+
+    http_client = get_http_client()
+    if http_client is not None:
+        for key, value in http_client.metrics().items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                set_gauge(f"lcs_http_client_{key}", value)
+
+    http_cache = get_http_cache()
+    if http_cache is not None:
+        for key, value in http_cache.stats().items():
+            if isinstance(value, (int, float)):
+                set_gauge(f"lcs_http_cache_{key}", value)
+
+    snapshot_store = get_snapshot_store()
+    if snapshot_store is not None:
+        for key, value in snapshot_store.stats().items():
+            if isinstance(value, (int, float)):
+                set_gauge(f"lcs_snapshot_{key}", value)
+
+    manager = get_browser_manager()
+    if manager is not None:
+        for key in ("in_use", "idle", "launches", "crashes", "recycled", "rss_mb"):
+            set_gauge(f"lcs_browser_{key}", manager.stats()[key])
+
+    for key, value in request.app.state.admission.stats().items():
+        if isinstance(value, (int, float)):
+            set_gauge(f"lcs_admission_{key}", value)
+
+    set_gauge("lcs_job_queue_depth", request.app.state.jobs.queue_depth())
+    set_gauge("lcs_process_rss_bytes", psutil.Process().memory_info().rss)
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
 
 
 @app.get("/healthz")
@@ -55,4 +407,51 @@ def health():
 
 @app.get("/debug/memory")
 def memory():
-    return {"rss_mb": psutil.Process().memory_info().rss / 1e6}
+    return {"rss_mb": psutil.Process().memory_info().rss / (1024 * 1024)}
+
+@app.get("/debug/browser")
+def browser():
+    manager = get_browser_manager()
+    return manager.stats() if manager else {"running": False}
+
+@app.get("/debug/cache")
+def cache():
+    lookup_cache = get_lookup_cache()
+    return lookup_cache.stats() if lookup_cache else {"enabled": False}
+
+@app.get("/debug/http")
+def http():
+    client = get_http_client()
+    return client.metrics() if client else {"open": False}
+
+@app.get("/debug/http-cache")
+def http_cache():
+    cache = get_http_cache()
+    return cache.stats() if cache else {"enabled": False}
+
+@app.get("/debug/snapshots")
+def snapshots():
+    snapshot_store = get_snapshot_store()
+    return snapshot_store.stats() if snapshot_store else {"enabled": False}
+
+@app.get("/debug/warmup")
+def warmup(request: Request):
+    if request.app.state.warmup is not None:
+        return request.app.state.warmup
+    return {"mode": config.WARMUP, "done": False}
+
+@app.get("/debug/admission")
+def admission(request: Request):
+    return request.app.state.admission.stats()
+
+@app.get("/debug/singleflight")
+def singleflight():
+    return {"reports": report_flight.stats(), "lookups": lookup_flight.stats()}
+
+@app.get("/debug/scheduler")
+def scheduler():
+    return get_fetch_scheduler().metrics()
+
+@app.get("/debug/jobs")
+def jobs(request: Request):
+    return {"queue_depth": request.app.state.jobs.queue_depth(), "workers": request.app.state.jobs.workers}
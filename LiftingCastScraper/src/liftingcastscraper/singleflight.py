@@ -0,0 +1,93 @@
+# src/liftingcastscraper/singleflight.py
+"""
+Single-flight request coalescing.
+
+When several callers ask for the same thing at the same time (extension
+users opening the same meet, two meets looking up the same lifter), only the
+first one starts the work; the others await the same task and get the same
+result or exception.
+
+    flight = SingleFlight("report")
+    people = await flight.do(meet_url, lambda: expensive(meet_url))
+
+The shared task is awaited through asyncio.shield, so a caller that is
+cancelled (client disconnected) only stops waiting; the work carries on for
+the others. When the LAST waiter is cancelled nobody needs the result any
+more and the task is cancelled too (and its key forgotten at once, so the
+next caller starts afresh).
+
+Only in-flight work is shared: once the task finishes its key is forgotten,
+and caching finished results is left to the caches.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+from .instrumentation import inc
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class _Flight:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task) -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Deduplicate concurrent calls by key."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._flights: Dict[Hashable, _Flight] = {}
+        self.started = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run `fn()` unless a call for `key` is already in flight, then await its result."""
+        flight = self._flights.get(key)
+        if flight is None:
+            # the task copies the first caller's context (timing collector etc.)
+            flight = _Flight(asyncio.ensure_future(fn()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda task, key=key: self._finished(key, task))
+            self.started += 1
+            inc("lcs_singleflight_total", flight=self.name, result="started")
+        else:
+            self.shared += 1
+            inc("lcs_singleflight_total", flight=self.name, result="shared")
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                logger.debug("Last waiter for %s %r went away, cancelling", self.name, key)
+                # forget it now: the done callback runs later, and a caller
+                # arriving before that must start a new flight, not join this one
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def _finished(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._flights.get(key) is not None and self._flights[key].task is task:
+            del self._flights[key]
+        if not task.cancelled():
+            task.exception()  # retrieved here too, in case every waiter was cancelled
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._flights
+
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"in_flight": self.in_flight(), "started": self.started, "shared": self.shared}
@@ -0,0 +1,163 @@
+# src/liftingcastscraper/snapshots.py
+"""
+Per-meet snapshots for incremental refreshes.
+
+During a live meet the same roster is run again and again. After each run the
+pipeline stores the finished `people` entries under the normalized meet URL;
+the next run diffs the freshly loaded roster against that snapshot and only
+looks up lifters that are new or whose name changed. Everyone else is reused
+as-is.
+
+Lifters are matched by their LiftingCast href (it carries the lifter id), so a
+renamed lifter keeps the same key but is refreshed because the name differs.
+Lifters without a profile last time are always refreshed: the result may have
+come from a timeout, and genuine 404s are answered by the lookup cache's miss
+entries without any requests.
+
+Like the lookup cache, the store is an in-process LRU with an optional SQLite
+file behind it.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import config
+from .models import Lifter, dumps, loads
+
+logger = logging.getLogger(__name__)
+
+REUSED = "reused"
+REFRESHED = "refreshed"
+
+Snapshot = Dict[str, Lifter]  # liftingcast href -> person
+
+
+class SnapshotStore:
+    """Latest finished `people` per meet, keyed by normalized meet URL."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_meets: int = config.SNAPSHOT_MAX_MEETS,
+        ttl: float = config.SNAPSHOT_TTL,
+    ) -> None:
+        self.path = path
+        self.max_meets = max_meets
+        self.ttl = ttl
+        self._memory: "OrderedDict[str, Tuple[float, Snapshot]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.reused = 0
+        self.refreshed = 0
+
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS meet_snapshots (
+                    meet_url   TEXT PRIMARY KEY,
+                    updated_at REAL NOT NULL,
+                    people     TEXT NOT NULL
+                )
+                """
+            )
+            self._conn.commit()
+
+    def get(self, meet_url: str) -> Optional[Snapshot]:
+        """Return the snapshot for a meet, or None if there is none or it is older than the TTL."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(meet_url)
+            if entry is None and self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT updated_at, people FROM meet_snapshots WHERE meet_url = ?", (meet_url,)
+                ).fetchone()
+                if row is not None:
+                    entry = (row[0], {href: Lifter.from_wire(person) for href, person in loads(row[1]).items()})
+                    self._remember(meet_url, entry)
+
+            if entry is None or entry[0] + self.ttl <= now:
+                self.misses += 1
+                return None
+
+            self._memory.move_to_end(meet_url)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, meet_url: str, people: List[Optional[Lifter]]) -> None:
+        snapshot = {person.liftingcast_href: person for person in people if person is not None}
+        entry = (time.time(), snapshot)
+        with self._lock:
+            self._remember(meet_url, entry)
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO meet_snapshots (meet_url, updated_at, people) VALUES (?, ?, ?)",
+                    (meet_url, entry[0], dumps(snapshot).decode("utf-8")),
+                )
+                self._conn.execute(
+                    "DELETE FROM meet_snapshots WHERE meet_url NOT IN "
+                    "(SELECT meet_url FROM meet_snapshots ORDER BY updated_at DESC LIMIT ?)",
+                    (self.max_meets,),
+                )
+                self._conn.commit()
+
+    def _remember(self, meet_url: str, entry: Tuple[float, Snapshot]) -> None:
+        self._memory[meet_url] = entry
+        self._memory.move_to_end(meet_url)
+        while len(self._memory) > self.max_meets:
+            self._memory.popitem(last=False)
+
+    def record(self, reused: int, refreshed: int) -> None:
+        self.reused += reused
+        self.refreshed += refreshed
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "meets": len(self._memory),
+            "hits": self.hits,
+            "misses": self.misses,
+            "lifters_reused": self.reused,
+            "lifters_refreshed": self.refreshed,
+            "path": self.path,
+        }
+
+    def close(self) -> None:
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+
+
+def reusable(snapshot: Optional[Snapshot], name: str, href: str) -> Optional[Lifter]:
+    """The stored person for this roster entry, if the same lifter was found under the same name last run."""
+    if not snapshot:
+        return None
+    person = snapshot.get(href)
+    if person is None or person.name != name or not person.opl_profile:
+        return None
+    return person
+
+
+# ---------- shared instance ----------
+
+_default_store: Optional[SnapshotStore] = None
+
+
+def get_snapshot_store() -> Optional[SnapshotStore]:
+    """Return the process-wide store, built from config on first use (None when disabled)."""
+    global _default_store
+    if not config.SNAPSHOT_ENABLED:
+        return None
+    if _default_store is None:
+        _default_store = SnapshotStore(path=config.SNAPSHOT_PATH or None)
+        logger.info("Meet snapshot store ready (disk: %s)", config.SNAPSHOT_PATH or "off")
+    return _default_store
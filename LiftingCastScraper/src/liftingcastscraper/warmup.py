@@ -0,0 +1,132 @@
+# src/liftingcastscraper/warmup.py
+"""
+Warm-up: do the first request's one-off work before the first request.
+
+On a scale-to-zero host the first report after a cold start used to pay for
+everything at once: importing jinja2 / bs4 / playwright, starting parse
+workers, opening SQLite caches, DNS + TLS to openipf.org and LiftingCast, and
+launching Chromium. `warm_up()` does those steps up front and reports how
+long each took:
+
+    LCS_WARMUP=background   (default) start serving at once, warm up behind it
+    LCS_WARMUP=blocking     warm up before the server accepts connections
+    LCS_WARMUP=off          everything happens on first use
+
+Each step is best-effort: a failure (no Chromium installed, host unreachable)
+is logged and recorded, and that piece is simply started on first use as
+before.
+"""
+
+import asyncio
+import importlib
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import aiohttp
+
+from . import config
+from .http_client import get_http_client, start_http_client
+from .instrumentation import set_gauge
+
+logger = logging.getLogger(__name__)
+
+OFF = "off"
+BACKGROUND = "background"
+BLOCKING = "blocking"
+
+# modules the first report imports lazily
+WARM_IMPORTS = (
+    "liftingcastscraper.reports.html_report",
+    "liftingcastscraper.opl_ipf.parsers",
+)
+
+
+# The synchronous steps run in a thread, so in background mode the server keeps
+# answering while they work (the stores all open with check_same_thread=False).
+def _open_caches() -> int:
+    from .opl_ipf.bulk_index import get_bulk_index
+    from .opl_ipf.cache import get_lookup_cache
+    from .opl_ipf.http_cache import get_http_cache
+    from .opl_ipf.names import get_name_index
+    from .snapshots import get_snapshot_store
+
+    stores = [get_lookup_cache(), get_http_cache(), get_snapshot_store(), get_name_index(), get_bulk_index()]
+    return sum(store is not None for store in stores)
+
+
+def _import_modules() -> int:
+    for module in WARM_IMPORTS:
+        importlib.import_module(module)
+    return len(WARM_IMPORTS)
+
+
+async def _preconnect() -> int:
+    """Open keep-alive connections (DNS, TCP, TLS) to the hosts every report talks to."""
+    client = get_http_client() or await start_http_client()
+    hosts = {config.OPENIPF_BASE_URL, config.LIFTINGCAST_BASE_URL}
+
+    async def head(url: str) -> bool:
+        try:
+            async with client.request("HEAD", url, timeout=aiohttp.ClientTimeout(total=5)) as response:
+                await response.read()
+            return True
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.info("Warm-up: could not reach %s (%s)", url, e)
+            return False
+
+    return sum(await asyncio.gather(*(head(url) for url in hosts)))
+
+
+async def _warm_parse_pool() -> int:
+    from .opl_ipf.parse_pool import warm_parse_pool
+
+    return await warm_parse_pool()
+
+
+async def _launch_browser() -> bool:
+    from .scraper.browser_pool import get_browser_manager, start_browser_manager
+
+    manager = get_browser_manager()
+    if manager is None:
+        manager = await start_browser_manager(launch=False)
+    await manager.start()
+    return True
+
+
+async def warm_up(browser: Optional[bool] = None) -> Dict[str, Any]:
+    """
+    Run every warm-up step; returns {"seconds", "steps": {step: {"seconds", "result" | "error"}}}.
+    `browser` defaults to LCS_BROWSER_LAUNCH_AT_STARTUP.
+    """
+    if browser is None:
+        browser = config.BROWSER_LAUNCH_AT_STARTUP
+
+    steps: Dict[str, Callable[[], Awaitable[Any]]] = {
+        "imports": lambda: asyncio.to_thread(_import_modules),
+        "caches": lambda: asyncio.to_thread(_open_caches),
+        "http": _preconnect,
+        "parse_pool": _warm_parse_pool,
+    }
+    if browser:
+        steps["browser"] = _launch_browser
+
+    async def run(name: str, step: Callable[[], Awaitable[Any]]) -> Dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            outcome: Dict[str, Any] = {"result": await step()}
+        except Exception as e:  # best-effort: the piece starts on first use instead
+            logger.warning("Warm-up step %s failed (%s)", name, e)
+            outcome = {"error": str(e)}
+        outcome["seconds"] = round(time.perf_counter() - started, 3)
+        set_gauge("lcs_warmup_seconds", outcome["seconds"], step=name)
+        return outcome
+
+    started = time.perf_counter()
+    # independent steps overlap: the browser launch hides behind the rest
+    results = dict(zip(steps, await asyncio.gather(*(run(name, step) for name, step in steps.items()))))
+    total = time.perf_counter() - started
+    logger.info(
+        "Warm-up done in %.2fs (%s)", total, ", ".join(f"{name} {r['seconds']:.2f}s" for name, r in results.items())
+    )
+    return {"seconds": round(total, 3), "steps": results}
@@ -0,0 +1,13 @@
+from pathlib import Path
+
+import pytest
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+@pytest.fixture
+def fixture_text():
+    """Read a file under tests/fixtures, e.g. fixture_text("openipf/profile.html")."""
+    def read(name: str) -> str:
+        return (FIXTURES / name).read_text(encoding="utf-8")
+    return read
@@ -0,0 +1,134 @@
+"""Admission control: FIFO slots, shedding, and 503 + Retry-After for browser-backed reports only."""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from liftingcastscraper import config, pipeline
+from liftingcastscraper.server import main
+from liftingcastscraper.server.admission import CPU, MEMORY, QUEUE_FULL, QUEUE_TIMEOUT, AdmissionController, Overloaded
+
+
+class FakeMonitor:
+    def __init__(self, rss_mb: float = 100.0, cpu_percent: float = 10.0) -> None:
+        self.rss_mb = rss_mb
+        self.cpu_percent = cpu_percent
+
+    def read(self) -> "FakeMonitor":
+        return self
+
+
+def controller(**kwargs) -> AdmissionController:
+    kwargs.setdefault("monitor", FakeMonitor())
+    return AdmissionController(**{"max_active": 1, "max_queue": 1, "queue_timeout": 5.0, **kwargs})
+
+
+def test_fifo_slots_and_full_queue():
+    async def run():
+        admission = controller(retry_after=7)
+        first = admission.enter()
+        second = admission.enter()
+        with pytest.raises(Overloaded) as turned_away:
+            admission.enter()
+
+        assert (first.position, second.position) == (0, 1)
+        first.release()
+        assert await second.wait(0) and second.position == 0
+        second.release()
+        return turned_away.value, admission.stats()
+
+    error, stats = asyncio.run(run())
+    assert (error.reason, error.retry_after, error.queue_depth) == (QUEUE_FULL, 7, 1)
+    assert stats["rejected"] == {QUEUE_FULL: 1}
+    assert (stats["active"], stats["queued"], stats["admitted"]) == (0, 0, 2)
+
+
+def test_wait_turn_reports_position_then_times_out():
+    async def run():
+        admission = controller(queue_timeout=0.05)
+        held = admission.enter()
+        waiting = admission.enter()
+        positions = []
+        with pytest.raises(Overloaded) as timed_out:
+            async for position in admission.wait_turn(waiting, poll=0.01):
+                positions.append(position)
+        waiting.release()
+        held.release()
+        return positions, timed_out.value.reason, admission.stats()["queued"]
+
+    positions, reason, queued = asyncio.run(run())
+    assert positions and set(positions) == {1}
+    assert (reason, queued) == (QUEUE_TIMEOUT, 0)
+
+
+@pytest.mark.parametrize("monitor, reason", [(FakeMonitor(rss_mb=2000), MEMORY), (FakeMonitor(cpu_percent=99), CPU)])
+def test_sheds_on_resources_unless_told_not_to(monitor, reason):
+    async def run():
+        admission = controller(rss_limit_mb=1000, cpu_limit=95, monitor=monitor)
+        with pytest.raises(Overloaded) as shed:
+            admission.enter()
+        ticket = admission.enter(shed=False)  # background jobs wait instead
+        admitted = ticket.admitted
+        ticket.release()
+        return shed.value.reason, admitted
+
+    assert asyncio.run(run()) == (reason, True)
+
+
+# ---------- through the API ----------
+
+MEET = "https://liftingcast.com/meets/m1/roster"
+ROSTER = [("Jane Doe", "/meets/m1/lifter/l1")]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(config, "WARMUP", "off")
+    monkeypatch.setattr(config, "ANALYTICS_ENABLED", False)
+    monkeypatch.setattr(pipeline, "get_snapshot_store", lambda: None)
+    monkeypatch.setattr(pipeline, "get_bulk_index", lambda: None)
+
+    async def no_profile(name, session):
+        return None
+
+    async def scrape_roster(meet_url):
+        return ROSTER
+
+    monkeypatch.setattr(pipeline, "try_fetch_openipf", no_profile)
+    monkeypatch.setattr(pipeline, "scrape_roster", scrape_roster)
+    with TestClient(main.app) as client:
+        # no slot free and no room to queue: every browser scrape is turned away
+        client.app.state.admission = controller(max_active=0, max_queue=0, retry_after=12)
+        client.app.state.jobs.admission = client.app.state.admission
+        yield client
+
+
+def test_browser_report_gets_503_with_retry_after(client, monkeypatch):
+    async def no_direct_read(meet_url, session):
+        return None
+
+    monkeypatch.setattr(pipeline, "read_roster", no_direct_read)
+
+    response = client.post("/api/report", json={"meet_url": MEET})
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "12"
+    assert response.json()["reason"] == QUEUE_FULL
+
+    stream = client.post("/api/report/stream", json={"meet_url": MEET})
+    assert stream.status_code == 200
+    assert stream.text.strip().splitlines()[-1] == '{"type":"error","detail":"Server busy (queue_full), retry in 12s","retry_after":12}'
+
+
+def test_direct_read_report_skips_admission(client, monkeypatch):
+    async def direct_read(meet_url, session):
+        return ROSTER
+
+    monkeypatch.setattr(pipeline, "read_roster", direct_read)
+
+    response = client.post("/api/report", json={"meet_url": MEET})
+
+    assert response.status_code == 200
+    assert [person["name"] for person in response.json()["people"]] == ["Jane Doe"]
+    assert client.app.state.admission.stats()["rejected"] == {}
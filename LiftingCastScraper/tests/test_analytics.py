@@ -0,0 +1,84 @@
+"""Points formulas, class ranking and the analyze() stage with its stats cache."""
+
+from datetime import date
+
+import pytest
+
+from liftingcastscraper.analytics import analyze, dots, infer_sex, ipf_gl, rank_classes
+from liftingcastscraper.models import Lifter, LifterStats, MeetResult
+from liftingcastscraper.opl_ipf.cache import LookupCache
+
+TODAY = date(2024, 6, 1)
+
+
+def test_dots():
+    assert dots(700, 100, "M") == pytest.approx(430.86, abs=0.01)
+    assert dots(500, 60, "F") == pytest.approx(554.27, abs=0.01)
+    assert dots(700, 250, "M") == dots(700, 210, "M")  # bodyweight clamped
+    assert dots(700, 100, None) == dots(0, 100, "M") == 0.0
+
+
+def test_ipf_gl():
+    assert ipf_gl(700, 100, "M") == pytest.approx(88.43, abs=0.01)
+    assert ipf_gl(500, 60, "F") == pytest.approx(113.02, abs=0.01)
+    assert ipf_gl(200, 83, "M", bench_only=True) == pytest.approx(100.46, abs=0.01)
+    assert ipf_gl(700, 100, "M", equipped=True) < ipf_gl(700, 100, "M")
+    assert ipf_gl(300, 30, "F") == 0.0  # below the formula's floor
+
+
+def test_infer_sex():
+    assert infer_sex([{"division": "Open Women"}], []) == "F"
+    assert infer_sex([{"division": "Open", "weight_class": "93kg"}], []) == "M"
+    assert infer_sex([], [MeetResult(weight_class="63")]) == "F"
+    assert infer_sex([], []) is None
+
+
+def _person(name, weight_class, recent_total, best_total, sex="M"):
+    return Lifter(
+        name=name,
+        liftingcast_href=f"/lifter/{name}",
+        divisions=[{"division": "Open", "weight_class": weight_class}],
+        analytics=LifterStats(sex=sex, recent_total=recent_total, best_total=best_total),
+    )
+
+
+def test_rank_classes():
+    a = _person("a", "93kg", 700.0, 720.0)
+    b = _person("b", "93", None, 750.0)
+    c = _person("c", "93", 700.0, 710.0)
+    d = _person("d", "63", 400.0, 400.0, sex="F")
+
+    classes = rank_classes([a, None, b, c, d, Lifter(name="e", liftingcast_href="/lifter/e")])
+
+    assert classes == {("M", "93"): 3, ("F", "63"): 1}
+    assert [(p.analytics.class_rank, p.analytics.class_size) for p in (a, c, b)] == [(1, 3), (2, 3), (3, 3)]
+    assert (a.analytics.weight_class, d.analytics.class_rank) == ("93", 1)
+
+
+def _lifter(username):
+    return Lifter(
+        name=username,
+        liftingcast_href=f"/lifter/{username}",
+        opl_profile=f"https://www.openipf.org/u/{username}",
+        opl_summary=[
+            MeetResult(date="2024-03-01", weight_class="93", bodyweight=92.0, total=700.0,
+                       squat=(250.0,), bench=(170.0,), deadlift=(280.0,)),
+            MeetResult(date="2023-03-01", weight_class="93", bodyweight=91.0, total=650.0),
+        ],
+    )
+
+
+def test_analyze_reuses_cached_stats(tmp_path):
+    cache = LookupCache(path=str(tmp_path / "lookup.sqlite"))
+    people = [_lifter("janedoe"), None, _lifter("johnroe")]
+
+    assert analyze(people, TODAY, cache) == 2
+    stats = people[0].analytics
+    assert (stats.best_total, stats.recent_total, stats.meets) == (700.0, 700.0, 2)
+    assert stats.trend_kg_per_year == pytest.approx(50.0, abs=0.5)
+    assert stats.class_rank == 1 and stats.class_size == 2
+
+    again = [_lifter("janedoe"), _lifter("johnroe")]
+    assert analyze(again, TODAY, cache) == 0  # both from the cache
+    assert again[0].analytics == stats
+    assert analyze([_lifter("janedoe")], date(2024, 6, 2), cache) == 1  # a new day moves the window
@@ -0,0 +1,40 @@
+"""Batch mode: one lookup per lifter across meets, failures kept per meet."""
+
+import asyncio
+
+from liftingcastscraper import config, pipeline
+
+ROSTERS = {
+    "https://liftingcast.com/meets/m1/roster": [("Jane Doe", "/meets/m1/lifter/l1"), ("John Roe", "/meets/m1/lifter/l2")],
+    "https://liftingcast.com/meets/m2/roster": [("12 - Jane Doe", "/meets/m2/lifter/l7")],
+}
+BROKEN = "https://liftingcast.com/meets/m3/roster"
+
+
+def test_batch_looks_each_lifter_up_once(monkeypatch):
+    looked_up = []
+
+    async def read_roster(meet_url, session):
+        if meet_url == BROKEN:
+            raise RuntimeError("meet not found")
+        return ROSTERS[meet_url]
+
+    async def lookup(name, session):
+        looked_up.append(name)
+        await asyncio.sleep(0.01)  # still in flight when the other meet asks
+        return None
+
+    monkeypatch.setattr(config, "ANALYTICS_ENABLED", False)
+    monkeypatch.setattr(pipeline, "get_snapshot_store", lambda: None)
+    monkeypatch.setattr(pipeline, "get_bulk_index", lambda: None)
+    monkeypatch.setattr(pipeline, "read_roster", read_roster)
+    monkeypatch.setattr(pipeline, "try_fetch_openipf", lookup)
+
+    urls = ["https://liftingcast.com/meets/m1/results", *ROSTERS, BROKEN]
+    batch = asyncio.run(pipeline.build_batch(urls, session=object()))
+
+    assert sorted(looked_up) == ["Jane Doe", "John Roe"]
+    assert (batch.roster_entries, batch.unique_lifters) == (3, 2)
+    assert list(batch.people) == list(ROSTERS)  # the /results URL is the same meet as m1
+    assert [p.liftingcast_href for p in batch.people["https://liftingcast.com/meets/m2/roster"]] == ["/meets/m2/lifter/l7"]
+    assert batch.errors == {BROKEN: "meet not found"}
@@ -0,0 +1,106 @@
+"""BrowserManager against a stand-in Chromium: context reuse, recycling and crash recovery."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from liftingcastscraper.scraper.browser_pool import BrowserManager
+
+
+class FakeContext:
+    def __init__(self) -> None:
+        self.pages = []
+        self.closed = False
+
+    async def clear_cookies(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self) -> None:
+        self.connected = True
+        self.contexts = []
+
+    def is_connected(self) -> bool:
+        return self.connected
+
+    async def new_context(self) -> FakeContext:
+        self.contexts.append(FakeContext())
+        return self.contexts[-1]
+
+    async def close(self) -> None:
+        self.connected = False
+
+
+def manager(**kwargs) -> BrowserManager:
+    """A manager whose Playwright launches FakeBrowsers (kept in manager.browsers)."""
+    pool = BrowserManager(**{"max_contexts": 2, "max_uses": 2, "rss_limit_mb": 10_000, **kwargs})
+    pool.browsers = []
+
+    async def launch(headless):
+        pool.browsers.append(FakeBrowser())
+        return pool.browsers[-1]
+
+    async def stop():
+        pass
+
+    pool._playwright = SimpleNamespace(chromium=SimpleNamespace(launch=launch), stop=stop)
+    return pool
+
+
+async def borrowed(ctx):
+    return ctx
+
+
+def test_contexts_are_reused_then_recycled():
+    async def run():
+        pool = manager()
+        async with pool:
+            seen = [await pool.run(borrowed) for _ in range(3)]
+            return pool, seen
+
+    pool, seen = asyncio.run(run())
+    first, second = pool.browsers[0].contexts
+    assert seen == [first, first, second]  # max_uses=2
+    assert first.closed and second.closed  # recycled, then closed on stop
+    assert pool.stats()["recycled"] == 1
+
+
+def test_crash_mid_request_relaunches_and_retries():
+    async def run():
+        pool = manager()
+        attempts = []
+
+        async def scrape(ctx):
+            attempts.append(ctx)
+            if len(attempts) == 1:
+                pool.browsers[0].connected = False  # Chromium dies under the request
+                raise RuntimeError("Target closed")
+            return "roster"
+
+        async with pool:
+            return pool, await pool.run(scrape), attempts
+
+    pool, result, attempts = asyncio.run(run())
+    assert result == "roster" and len(pool.browsers) == 2
+    assert attempts == [pool.browsers[0].contexts[0], pool.browsers[1].contexts[0]]
+    assert (pool.stats()["launches"], pool.stats()["crashes"]) == (2, 1)
+
+
+def test_errors_without_a_crash_are_not_retried():
+    async def run():
+        pool = manager()
+
+        async def scrape(ctx):
+            raise ValueError("no roster table")
+
+        async with pool:
+            with pytest.raises(ValueError):
+                await pool.run(scrape)
+            return pool
+
+    assert len(asyncio.run(run()).browsers) == 1
@@ -0,0 +1,114 @@
+"""Offline OpenPowerlifting index: ingest, incremental refresh and roster lookups."""
+
+import csv
+import shutil
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from liftingcastscraper import config
+from liftingcastscraper.opl_ipf.bulk_index import BulkIndex, normalize_name, username_for
+
+SAMPLE = Path(__file__).parent / "fixtures" / "opl" / "sample.csv"
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = BulkIndex(str(tmp_path / "opl.sqlite"))
+    yield index
+    index.close()
+
+
+def _rows():
+    with open(SAMPLE, encoding="utf-8", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def _write_dump(path: Path, rows) -> str:
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    return str(path)
+
+
+def test_names_and_usernames():
+    assert normalize_name("José  García #2") == "jose garcia"
+    assert username_for("John Smith #2") == "johnsmith2"
+    assert username_for("Zoë Ó'Connor") == "zoeoconnor"
+
+
+def test_ingest_keeps_ipf_rows(index):
+    stats = index.ingest(str(SAMPLE))
+
+    assert stats == {"rows": 6, "skipped": 1, "inserted": 5, "updated": 0, "unchanged": 0, "deleted": 0}
+    assert index.stats() == {"lifters": 4, "meets": 5}
+    assert index.lookup("Sarah Lee") is None  # USPA is not an IPF affiliate
+
+
+def test_ingest_from_zip(index, tmp_path):
+    archive = tmp_path / "openpowerlifting-latest.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.write(SAMPLE, "openpowerlifting-2024-03-10/openpowerlifting-2024-03-10.csv")
+
+    assert index.ingest(str(archive), ipf_only=False)["inserted"] == 6
+
+
+def test_same_dump_is_ingested_once(index):
+    index.ingest(str(SAMPLE))
+
+    assert index.ingest(str(SAMPLE))["rows"] == 0
+
+
+def test_refresh_writes_only_changed_rows(index, tmp_path):
+    index.ingest(str(SAMPLE))
+    rows = _rows()
+    rows[0]["BodyweightKg"] = "82.6"  # a correction to an existing meet row
+    rows.append({**rows[1], "Date": "2024-06-01", "MeetName": "Sydney Open", "TotalKg": "630"})
+
+    stats = index.ingest(_write_dump(tmp_path / "newer.csv", rows))
+
+    assert (stats["inserted"], stats["updated"], stats["unchanged"], stats["deleted"]) == (1, 1, 4, 0)
+    history = index.lookup("John Smith")["meet_history"]
+    assert [row.date for row in history] == ["2024-06-01", "2024-03-09", "2023-03-11"]
+    assert history[1].bodyweight == 82.6
+
+
+def test_refresh_deletes_rows_missing_from_the_dump(index, tmp_path):
+    index.ingest(str(SAMPLE))
+    rows = [row for row in _rows() if row["Name"] != "José García" and row["Date"] != "2023-03-11"]
+
+    stats = index.ingest(_write_dump(tmp_path / "newer.csv", rows))
+
+    assert stats["deleted"] == 2
+    assert index.lookup("José García") is None
+    assert [row.date for row in index.lookup("John Smith")["meet_history"]] == ["2024-03-09"]
+    assert index.stats() == {"lifters": 3, "meets": 3}
+
+
+def test_refresh_since_leaves_older_rows(index, tmp_path):
+    index.ingest(str(SAMPLE))
+    recent = [row for row in _rows() if row["Date"] >= "2024-01-01"]
+
+    stats = index.ingest(_write_dump(tmp_path / "recent.csv", recent), since="2024-01-01")
+
+    assert stats["deleted"] == 0 and stats["unchanged"] == 2
+    assert index.stats()["meets"] == 5
+
+
+def test_lookup_many(index, monkeypatch):
+    monkeypatch.setattr(config, "OPENIPF_BASE_URL", "https://openipf.example")
+    index.ingest(str(SAMPLE))
+
+    found = index.lookup_many(["JOHN SMITH", "Jose Garcia", "Zoe O'Connor", "Nobody Here", ""])
+
+    assert set(found) == {"JOHN SMITH", "Jose Garcia", "Zoe O'Connor"}
+    # namesakes: the most recently active lifter wins
+    assert found["JOHN SMITH"]["profile_url"] == "https://openipf.example/u/johnsmith"
+    assert [row.total for row in found["JOHN SMITH"]["meet_history"]] == [615.0, 585.0]
+    jose = found["Jose Garcia"]["meet_history"][0]
+    assert jose.squat == (260.0, 272.5, 280.0) and jose.equipment == "Single-ply"
+    assert (jose.points_label, jose.points, jose.location) == ("GLP", 95.55, "Spain")
+    zoe = found["Zoe O'Connor"]["meet_history"][0]
+    assert (zoe.squat, zoe.bench, zoe.total) == ((), (75.0, 80.0, -82.5), 80.0)
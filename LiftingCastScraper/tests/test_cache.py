@@ -0,0 +1,60 @@
+"""LookupCache: per-name lookup accounting, misses replacing profiles, the disk tier."""
+
+from liftingcastscraper.models import MeetResult
+from liftingcastscraper.opl_ipf.cache import LookupCache
+
+HISTORY = [MeetResult(place="1", federation="IPF", total=600.0)]
+
+
+def test_resolve_counts_one_lookup_per_name():
+    cache = LookupCache()
+    cache.put_profile("janedoe", "https://www.openipf.org/u/janedoe", HISTORY)
+
+    hit, rest = cache.resolve(["jdoe", "jane", "janedoe"])
+    assert hit.guess == "janedoe"
+    assert hit.meet_history == HISTORY
+    assert rest == []
+
+    hit, rest = cache.resolve(["nobody", "nobody1"])
+    assert hit is None
+    assert rest == ["nobody", "nobody1"]
+
+    stats = cache.stats()
+    assert stats["lookups"] == {"hits": 1, "misses": 1}
+    assert stats["memory"]["misses"] == 0  # probing guesses isn't a tier miss
+
+
+def test_resolve_orders_known_profiles_first_and_drops_misses():
+    cache = LookupCache(history_ttl=-1)  # history already expired
+    cache.put_profile("janedoe", "https://www.openipf.org/u/janedoe", HISTORY)
+    cache.put_miss("jdoe")
+
+    hit, rest = cache.resolve(["jdoe", "jane", "janedoe"])
+
+    assert hit is None
+    assert rest == ["janedoe", "jane"]
+
+
+def test_put_miss_drops_profile():
+    cache = LookupCache(history_ttl=-1)
+    cache.put_profile("janedoe", "https://www.openipf.org/u/janedoe", HISTORY)
+
+    cache.put_miss("janedoe")
+
+    assert cache.get_profile("janedoe") is None
+    assert cache.is_miss("janedoe")
+    assert cache.resolve(["janedoe", "jane"]) == (None, ["jane"])
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "lookup.sqlite")
+    cache = LookupCache(path=path)
+    cache.put_profile("janedoe", "https://www.openipf.org/u/janedoe", HISTORY)
+    cache.close()
+
+    cache = LookupCache(path=path)
+    hit, _ = cache.resolve(["janedoe"])
+    cache.close()
+
+    assert hit.profile_url == "https://www.openipf.org/u/janedoe"
+    assert hit.meet_history == HISTORY
@@ -0,0 +1,81 @@
+"""Accept-Encoding negotiation and the compression middleware."""
+
+import asyncio
+import zlib
+
+import pytest
+
+from liftingcastscraper.server import compression
+from liftingcastscraper.server.compression import GZIP, CompressionMiddleware, choose_encoding
+
+
+@pytest.fixture
+def gzip_only(monkeypatch):
+    monkeypatch.setattr(compression, "_brotli", None)
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip, deflate, br", GZIP),
+    ("GZIP;q=0.5", GZIP),
+    ("*", GZIP),
+    ("gzip;q=0, *", None),  # an explicit refusal beats the wildcard
+    ("identity", None),
+    ("gzip;q=oops", None),
+    ("", None),
+])
+def test_choose_encoding(gzip_only, header, expected):
+    assert choose_encoding(header) == expected
+
+
+def _app(*bodies, headers=()):
+    """An ASGI app sending `bodies` as one response, the last one closing it."""
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"application/json"), *headers]})
+        for i, body in enumerate(bodies):
+            await send({"type": "http.response.body", "body": body, "more_body": i < len(bodies) - 1})
+    return app
+
+
+def _call(app, accept="gzip", minimum_size=100):
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "headers": [(b"accept-encoding", accept.encode())]}
+    asyncio.run(CompressionMiddleware(app, minimum_size=minimum_size)(scope, None, send))
+    return dict(sent[0]["headers"]), [message["body"] for message in sent[1:]]
+
+
+def test_large_body_is_gzipped(gzip_only):
+    body = b'{"name": "Jane Doe"}' * 100
+
+    headers, (sent,) = _call(_app(body))
+
+    assert headers[b"content-encoding"] == b"gzip"
+    assert headers[b"content-length"] == str(len(sent)).encode()
+    assert b"accept-encoding" in headers[b"vary"].lower()
+    assert zlib.decompress(sent, 16 + zlib.MAX_WBITS) == body
+
+
+@pytest.mark.parametrize("body, headers, accept", [
+    (b"{}", (), "gzip"),  # too small to bother
+    (b"x" * 500, ((b"content-encoding", b"br"),), "gzip"),  # already encoded
+    (b"x" * 500, (), "identity"),  # the client takes nothing else
+])
+def test_passthrough(gzip_only, body, headers, accept):
+    sent_headers, bodies = _call(_app(body, headers=headers), accept=accept)
+
+    assert sent_headers.get(b"content-encoding") == dict(headers).get(b"content-encoding")
+    assert bodies == [body]
+
+
+def test_stream_chunks_decode_as_they_arrive(gzip_only):
+    events = [b'{"type":"roster"}\n', b'{"type":"lifter"}\n', b'{"type":"done"}\n']
+
+    headers, bodies = _call(_app(*events), minimum_size=10_000)
+
+    assert headers[b"content-encoding"] == b"gzip" and b"content-length" not in headers
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    assert [decoder.decompress(body) for body in bodies] == events  # each event flushed on its own
@@ -0,0 +1,63 @@
+"""Projection parameters, projected rows and the columnar encoding."""
+
+import re
+
+import pytest
+
+from liftingcastscraper.models import Lifter, LifterStats, MeetResult
+from liftingcastscraper.server.encoding import COLUMNS, FULL, Projection, encode_people
+
+JANE = Lifter(
+    name="Jane Doe",
+    liftingcast_href="/meets/m1/lifter/l1",
+    opl_summary=[
+        MeetResult(date="2023-03-01", total=550.0, points=80.1),
+        MeetResult(date="2024-03-01", total=600.0, points=85.2, squat=(210.0,)),
+    ],
+    analytics=LifterStats(best_total=600.0),
+)
+JOHN = Lifter(name="John Roe", liftingcast_href="/meets/m1/lifter/l2")
+
+
+@pytest.mark.parametrize("kwargs, message", [
+    ({"fields": ["name", "email"]}, "Unknown fields ['email']"),
+    ({"history_fields": ["Total", "Pts"]}, "Unknown history_fields ['Pts']"),
+    ({"history_limit": -1}, "history_limit must be >= 0"),
+    ({"encoding": "csv"}, "encoding must be one of"),
+])
+def test_parse_rejects_bad_parameters(kwargs, message):
+    with pytest.raises(ValueError, match=re.escape(message)):
+        Projection.parse(**kwargs)
+
+
+def test_parse_defaults_and_dedupes():
+    assert Projection.parse() == FULL and FULL.is_full
+    projection = Projection.parse(fields=["name", "name"], history_fields=["Total", "Total"])
+    assert (projection.fields, projection.history_fields) == (("name",), ("Total",))
+    assert not projection.is_full
+
+
+def test_full_projection_sends_people_as_they_are():
+    people = [JANE, JOHN]
+    assert encode_people(people) is people
+
+
+def test_rows_keep_the_newest_meets_and_requested_keys():
+    projection = Projection.parse(fields=["name", "opl_summary"], history_limit=1,
+                                  history_fields=["Date", "Squat", "GLP"])
+
+    assert encode_people([JANE, JOHN], projection) == [
+        {"name": "Jane Doe", "opl_summary": [{"Date": "2024-03-01", "Squat": (210.0,), "GLP": 85.2}]},
+        {"name": "John Roe", "opl_summary": None},
+    ]
+
+
+def test_columns():
+    projection = Projection.parse(fields=["name", "opl_summary", "analytics"],
+                                  history_fields=["Total"], encoding=COLUMNS)
+
+    out = encode_people([JANE, JOHN], projection)
+
+    assert (out["encoding"], out["count"], out["name"]) == (COLUMNS, 2, ["Jane Doe", "John Roe"])
+    assert out["opl_summary"] == {"offsets": [0, 2, 2], "Total": [550.0, 600.0]}
+    assert out["analytics"]["best_total"] == [600.0, None]
@@ -0,0 +1,31 @@
+"""The streamed HTML report is the same document as the one rendered in one piece."""
+
+import re
+
+from liftingcastscraper.models import Lifter, MeetResult
+from liftingcastscraper.reports.html_report import generate_html_report, generate_stream, write_html_report
+
+PEOPLE = [
+    Lifter(
+        name="Zoë <Ó'Connor>",
+        liftingcast_href="/meets/m1/lifter/l1",
+        opl_profile="https://www.openipf.org/u/zoeoconnor",
+        opl_summary=[MeetResult(date="2024-03-09", federation="IPF", total=400.0)],
+    ),
+    Lifter(name="No Profile", liftingcast_href="/meets/m1/lifter/l2"),
+]
+
+
+def _undated(html: str) -> str:
+    return re.sub(r"\d{4}-\d\d-\d\dT[\d:.]+Z", "<generated>", html)
+
+
+def test_stream_matches_whole_document(tmp_path):
+    html = _undated(generate_html_report(PEOPLE))
+
+    assert _undated("".join(generate_stream(PEOPLE))) == html
+    assert "Zoë &lt;Ó&#39;Connor&gt;" in html  # autoescaped
+
+    path = write_html_report(PEOPLE, str(tmp_path / "out" / "report.html"))
+    with open(path, encoding="utf-8") as f:
+        assert _undated(f.read()) == html
@@ -0,0 +1,48 @@
+"""HttpCache: validators, stored parses answered on 304, skipped responses and the byte budget."""
+
+from multidict import CIMultiDict
+
+from liftingcastscraper.models import MeetResult
+from liftingcastscraper.opl_ipf.http_cache import GZIP, HttpCache
+
+URL = "https://www.openipf.org/u/janedoe"
+HISTORY = [MeetResult(date="2024-03-01", federation="IPF", total=600.0, squat=(210.0, -215.0))]
+HTML = "<html>" + "x" * 5000 + "</html>"
+
+
+def test_revalidated_entry_returns_the_stored_parse(tmp_path):
+    path = str(tmp_path / "http.sqlite")
+    cache = HttpCache(path=path, codec=GZIP)
+    assert cache.put(URL, CIMultiDict({"etag": '"v1"', "last-modified": "Sat, 09 Mar 2024 10:00:00 GMT"}), HTML, HISTORY)
+    cache.close()
+
+    cache = HttpCache(path=path, codec=GZIP)
+    entry = cache.get(URL)
+
+    assert entry.validators() == {"If-None-Match": '"v1"', "If-Modified-Since": "Sat, 09 Mar 2024 10:00:00 GMT"}
+    assert cache.revalidated(entry) == HISTORY
+    stats = cache.stats()
+    assert (stats["entries"], stats["hits"], stats["bytes_saved"]) == (1, 1, len(HTML))
+
+
+def test_uncacheable_responses_are_skipped():
+    cache = HttpCache(codec=GZIP)
+
+    assert not cache.put(URL, CIMultiDict(), HTML, HISTORY)
+    assert not cache.put(URL, CIMultiDict({"ETag": '"v1"', "Cache-Control": "private, no-store"}), HTML, HISTORY)
+    assert cache.get(URL) is None and cache.stats()["misses"] == 2
+
+
+def test_least_recently_used_entries_are_evicted():
+    probe = HttpCache(codec=GZIP)
+    probe.put("probe", {"ETag": '"v1"'}, HTML, HISTORY)
+    size = probe.stats()["bytes"]
+
+    cache = HttpCache(max_bytes=2 * size, codec=GZIP)
+    for name in ("a", "b"):
+        cache.put(name, {"ETag": '"v1"'}, HTML, HISTORY)
+    cache.revalidated(cache.get("a"))  # "b" is now the oldest
+    cache.put("c", {"ETag": '"v1"'}, HTML, HISTORY)
+
+    assert cache.get("b") is None and cache.get("a") is not None and cache.get("c") is not None
+    assert cache.stats()["evictions"] == 1 and cache.stats()["bytes"] <= 2 * size
@@ -0,0 +1,49 @@
+"""HttpClient: keep-alive reuse across requests and the shared app-lifetime client."""
+
+import asyncio
+
+from aiohttp import web
+
+from liftingcastscraper.http_client import HttpClient, get_http_client, start_http_client, stop_http_client
+
+
+async def _profile(request: web.Request) -> web.Response:
+    return web.Response(text=request.match_info["name"])
+
+
+async def _serve() -> web.AppRunner:
+    app = web.Application()
+    app.router.add_get("/u/{name}", _profile)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    return runner
+
+
+def test_sequential_requests_reuse_one_connection():
+    async def run():
+        runner = await _serve()
+        port = runner.addresses[0][1]
+        try:
+            async with HttpClient() as client:
+                for name in ("a", "b", "c"):
+                    async with client.request("GET", f"http://127.0.0.1:{port}/u/{name}") as response:
+                        assert await response.text() == name
+            return client.metrics()
+        finally:
+            await runner.cleanup()
+
+    metrics = asyncio.run(run())
+    assert (metrics["requests"], metrics["connections_created"], metrics["connections_reused"]) == (3, 1, 2)
+    assert not metrics["open"]
+
+
+def test_shared_client_lives_until_stopped():
+    async def run():
+        client = await start_http_client()
+        same = await start_http_client()
+        await stop_http_client()
+        return client, same, get_http_client()
+
+    client, same, after = asyncio.run(run())
+    assert client is same and after is None
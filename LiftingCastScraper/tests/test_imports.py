@@ -0,0 +1,31 @@
+"""Cold start: the API imports without the modules only some requests need."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from liftingcastscraper import scraper
+
+DEFERRED = ("playwright", "selenium", "bs4", "jinja2")
+
+
+def test_server_import_defers_heavy_modules():
+    code = (
+        "import sys, liftingcastscraper.server.main; "
+        f"print(','.join(m for m in {DEFERRED!r} if m in sys.modules))"
+    )
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}  # a fresh interpreter, same src/
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env)
+
+    assert out.stdout.strip() == ""
+
+
+def test_lazy_exports_resolve_on_first_use():
+    from liftingcastscraper.scraper.utils import clean_lifter_name
+
+    assert "clean_lifter_name" in dir(scraper)
+    assert scraper.clean_lifter_name is clean_lifter_name
+    with pytest.raises(AttributeError):
+        scraper.not_exported
@@ -0,0 +1,24 @@
+"""Prometheus text export of the process-wide metrics."""
+
+from liftingcastscraper.instrumentation import inc, observe, render_prometheus
+
+
+def test_label_values_are_escaped():
+    inc("lcs_test_escape_total", flight='say "hi"\\now\nthen')
+
+    line = next(l for l in render_prometheus().splitlines() if l.startswith("lcs_test_escape_total{"))
+
+    assert line == 'lcs_test_escape_total{flight="say \\"hi\\"\\\\now\\nthen"} 1.0'
+
+
+def test_histogram_buckets_are_cumulative():
+    observe("lcs_test_duration_seconds", 0.02, stage="parse")
+    observe("lcs_test_duration_seconds", 3.0, stage="parse")
+
+    lines = [l for l in render_prometheus().splitlines() if l.startswith("lcs_test_duration_seconds")]
+
+    assert 'lcs_test_duration_seconds_bucket{stage="parse",le="0.01"} 0' in lines
+    assert 'lcs_test_duration_seconds_bucket{stage="parse",le="0.025"} 1' in lines
+    assert 'lcs_test_duration_seconds_bucket{stage="parse",le="5.0"} 2' in lines
+    assert 'lcs_test_duration_seconds_bucket{stage="parse",le="+Inf"} 2' in lines
+    assert 'lcs_test_duration_seconds_count{stage="parse"} 2' in lines
@@ -0,0 +1,79 @@
+"""Background jobs: stores, deduplication, and sharing a run with synchronous reports."""
+
+import asyncio
+
+import pytest
+
+from liftingcastscraper import config, pipeline
+from liftingcastscraper.server.jobs import DONE, QUEUED, InMemoryJobStore, Job, JobQueue, SQLiteJobStore
+
+MEET = "https://liftingcast.com/meets/m1/roster"
+ROSTER = [("Jane Doe", "/meets/m1/lifter/l1"), ("John Roe", "/meets/m1/lifter/l2")]
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return InMemoryJobStore()
+    return SQLiteJobStore(str(tmp_path / "jobs.sqlite"))
+
+
+def test_find_active_respects_full_refresh(store):
+    store.add(Job(job_id="a", meet_url=MEET, use_snapshot=True))
+
+    assert store.find_active(MEET, use_snapshot=True).job_id == "a"
+    assert store.find_active(MEET, use_snapshot=False) is None  # a full refresh needs its own run
+
+    store.add(Job(job_id="b", meet_url="other", use_snapshot=False))
+    assert store.find_active("other", use_snapshot=True).job_id == "b"
+    assert {job.job_id for job in store.unfinished()} == {"a", "b"}
+
+
+def test_prune_keeps_unfinished(store):
+    store.add(Job(job_id="old", meet_url=MEET, status=DONE, finished_at=1.0))
+    store.add(Job(job_id="running", meet_url=MEET, status=QUEUED))
+
+    assert store.prune(older_than=2.0) == 1
+    assert store.get("old") is None and store.get("running") is not None
+
+
+def test_job_shares_a_run_with_a_synchronous_report(monkeypatch):
+    rosters_read = []
+
+    async def no_profile(name, session):
+        return None
+
+    monkeypatch.setattr(config, "ANALYTICS_ENABLED", False)
+    monkeypatch.setattr(pipeline, "get_snapshot_store", lambda: None)
+    monkeypatch.setattr(pipeline, "get_bulk_index", lambda: None)
+    monkeypatch.setattr(pipeline, "try_fetch_openipf", no_profile)
+
+    async def run():
+        gate = asyncio.Event()
+
+        async def read_roster(meet_url, session):
+            rosters_read.append(meet_url)
+            await gate.wait()
+            return ROSTER
+
+        monkeypatch.setattr(pipeline, "read_roster", read_roster)
+        jobs = JobQueue(InMemoryJobStore(), workers=1)
+        await jobs.start()
+        try:
+            job = jobs.submit(MEET)
+            await asyncio.sleep(0.01)  # the worker starts the run
+            synchronous = asyncio.ensure_future(pipeline.build_people(MEET, session=object()))
+            await asyncio.sleep(0.01)
+            gate.set()
+            people = await synchronous
+            await jobs._queue.join()
+            return jobs.get(job.job_id), people
+        finally:
+            await jobs.stop()
+
+    job, people = asyncio.run(run())
+
+    assert rosters_read == [MEET]
+    assert job.status == DONE
+    assert job.people is people
+    assert (job.done, job.total) == (2, 2)
@@ -0,0 +1,170 @@
+"""Direct LiftingCast roster reads against recorded meet documents, and the browser fallback."""
+
+import asyncio
+import json
+import sys
+import types
+from pathlib import Path
+
+import pytest
+from aiohttp import web
+
+from liftingcastscraper import config
+from liftingcastscraper.opl_ipf import scheduler
+from liftingcastscraper.scraper import liftingcast_api
+from liftingcastscraper.scraper.liftingcast_api import RosterLifter, RosterUnavailable, get_roster, parse_meet_docs
+
+FIXTURES = Path(__file__).parent / "fixtures" / "liftingcast"
+MEET_URL = "https://liftingcast.com/meets/m42/roster"
+BROWSER_ROSTER = [("1 - From The Browser", "/meets/m42/lifter/lbrowser")]
+
+
+def _load(name: str):
+    return json.loads((FIXTURES / name).read_text(encoding="utf-8"))
+
+
+# ---------- parse_meet_docs ----------
+
+def test_parse_recorded_docs():
+    roster = parse_meet_docs("m42", _load("all_docs.json"))
+
+    assert [lifter.label for lifter in roster] == ["3 - Zoë Ó'Connor", "7 - John Smith", "12 - José García", "Late Entry"]
+    zoe, john, jose, late = roster
+    assert zoe[:2] == ("3 - Zoë Ó'Connor", "/meets/m42/lifter/l0001")
+    assert zoe.lifter_id == "l0001"
+    assert zoe.divisions == ({"division": "Women's Open", "weight_class": "63"},)
+    # an entry pointing at a division that no longer exists keeps its place, unnamed
+    assert john.divisions == (
+        {"division": "Men's Open", "weight_class": "83"},
+        {"division": None, "weight_class": None},
+    )
+    assert jose.label == "12 - José García"  # whitespace collapsed
+    assert late.divisions == ()
+
+
+def test_parse_accepts_bare_doc_list():
+    docs = [row["doc"] for row in _load("all_docs.json")["rows"]]
+
+    assert parse_meet_docs("m42", docs) == parse_meet_docs("m42", _load("all_docs.json"))
+
+
+def test_parse_typed_docs():
+    docs = [
+        {"_id": "x1", "type": "division", "name": "Open", "weightClasses": [{"_id": "w1", "name": "74"}]},
+        {"_id": "x2", "type": "lifter", "name": "Typed Lifter", "divisions": [{"divisionId": "x1", "weightClassId": "w1"}]},
+        {"_id": "l3", "type": "platform", "name": "Not A Lifter"},
+    ]
+
+    assert parse_meet_docs("m42", docs) == [
+        RosterLifter("Typed Lifter", "/meets/m42/lifter/x2", "x2", ({"division": "Open", "weight_class": "74"},))
+    ]
+
+
+def test_parse_skips_typed_docs_missing_fields():
+    docs = [
+        {"type": "division", "name": "Open", "weightClasses": "74"},
+        {"type": "lifter", "name": "No Id"},
+        {"_id": "x2", "type": "lifter"},
+        {"_id": ["x3"], "type": "lifter", "name": "Odd Id"},
+        {"_id": "x4", "type": "lifter", "name": "Kept", "divisions": [{"divisionId": ["x1"]}]},
+    ]
+
+    assert parse_meet_docs("m42", docs) == [
+        RosterLifter("Kept", "/meets/m42/lifter/x4", "x4", ({"division": None, "weight_class": None},))
+    ]
+
+
+@pytest.mark.parametrize("payload", [_load("not_found.json"), _load("no_lifters.json"), {"rows": "nope"}, "text", []])
+def test_parse_rejects_malformed_docs(payload):
+    with pytest.raises(RosterUnavailable):
+        parse_meet_docs("m42", payload)
+
+
+# ---------- get_roster over HTTP ----------
+
+@pytest.fixture
+def browser(monkeypatch):
+    """Replaces the Playwright scraper; records the meet URLs it was asked for."""
+    calls = []
+
+    async def scrape_liftingcast_roster(meet_url):
+        calls.append(meet_url)
+        return BROWSER_ROSTER
+
+    module = types.ModuleType("liftingcastscraper.scraper.playwright_scraper")
+    module.scrape_liftingcast_roster = scrape_liftingcast_roster
+    monkeypatch.setitem(sys.modules, module.__name__, module)
+    return calls
+
+
+@pytest.fixture(autouse=True)
+def fresh_scheduler(monkeypatch):
+    # no retries or backoff against the local server; restored after the test
+    monkeypatch.setattr(scheduler, "_default_scheduler", None)
+    scheduler.configure_fetch_scheduler(max_retries=0, deadline=5.0)
+
+
+def _serve(monkeypatch, handler):
+    """Run get_roster against a local server whose data endpoint is `handler`."""
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/{meet_id}/_all_docs", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        monkeypatch.setattr(config, "LIFTINGCAST_DATA_URL", f"http://127.0.0.1:{port}/{{meet_id}}/_all_docs")
+        try:
+            return await get_roster(MEET_URL)
+        finally:
+            await runner.cleanup()
+
+    return asyncio.run(run())
+
+
+def _json_handler(name: str, status: int = 200):
+    async def handler(request):
+        assert request.match_info["meet_id"] == "m42"
+        return web.Response(
+            text=(FIXTURES / name).read_text(encoding="utf-8"), status=status, content_type="application/json"
+        )
+    return handler
+
+
+def test_get_roster_reads_meet_data(monkeypatch, browser):
+    roster = _serve(monkeypatch, _json_handler("all_docs.json"))
+
+    assert roster == parse_meet_docs("m42", _load("all_docs.json"))
+    assert browser == []
+
+
+@pytest.mark.parametrize("handler", [
+    _json_handler("not_found.json", status=404),
+    _json_handler("all_docs.json", status=500),
+    _json_handler("no_lifters.json"),
+])
+def test_get_roster_falls_back_to_the_browser(monkeypatch, browser, handler):
+    assert _serve(monkeypatch, handler) == BROWSER_ROSTER
+    assert browser == [MEET_URL]
+
+
+def test_get_roster_falls_back_on_non_json(monkeypatch, browser):
+    async def handler(request):
+        return web.Response(text="<html>maintenance</html>", content_type="text/html")
+
+    assert _serve(monkeypatch, handler) == BROWSER_ROSTER
+
+
+def test_get_roster_falls_back_when_unreachable(monkeypatch, browser):
+    monkeypatch.setattr(config, "LIFTINGCAST_DATA_URL", "http://127.0.0.1:9/{meet_id}/_all_docs")
+
+    assert asyncio.run(get_roster(MEET_URL)) == BROWSER_ROSTER
+
+
+def test_direct_read_disabled(monkeypatch, browser):
+    monkeypatch.setattr(config, "LIFTINGCAST_DIRECT", False)
+    monkeypatch.setattr(liftingcast_api, "fetch_meet_roster", None)  # must not be called
+
+    assert asyncio.run(get_roster(MEET_URL)) == BROWSER_ROSTER
@@ -0,0 +1,70 @@
+"""Username probing: the top guess is fetched, the rest only checked for a status until needed."""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+from multidict import CIMultiDict, CIMultiDictProxy
+
+from liftingcastscraper import config
+from liftingcastscraper.opl_ipf import lookup
+from liftingcastscraper.opl_ipf.cache import LookupCache
+from liftingcastscraper.opl_ipf.fetcher import profile_url_for
+from liftingcastscraper.opl_ipf.scheduler import FetchScheduler
+
+NAME = "Mary Jane Watson"  # guesses: maryjanewatson, then marywatson
+
+
+class FakeResponse:
+    def __init__(self, status: int, text: str = "") -> None:
+        self.status = status
+        self.headers = CIMultiDictProxy(CIMultiDict())
+        self._text = text
+
+    async def text(self) -> str:
+        return self._text
+
+
+class FakeSession:
+    """Answers by URL; records (method, username) for every request."""
+
+    def __init__(self, pages) -> None:
+        self.pages = pages
+        self.requests = []
+
+    @asynccontextmanager
+    async def request(self, method, url, **kwargs):
+        username = url.rsplit("/", 1)[-1]
+        self.requests.append((method, username))
+        yield self.pages.get(username, FakeResponse(404))
+
+
+@pytest.fixture(autouse=True)
+def no_shared_state(monkeypatch):
+    monkeypatch.setattr(config, "HTTP_CACHE_ENABLED", False)
+    monkeypatch.setattr(config, "PARSE_POOL", "off")
+    monkeypatch.setattr(config, "FETCH_PROBE", True)
+    monkeypatch.setattr(lookup, "get_name_index", lambda: None)
+
+
+def _lookup(session, cache):
+    scheduler = FetchScheduler(max_retries=0, rate_per_host=1000, burst=100)
+    return asyncio.run(lookup.try_fetch_openipf(NAME, session, cache=cache, scheduler=scheduler))
+
+
+def test_probe_hit_is_then_fetched(fixture_text):
+    session = FakeSession({"marywatson": FakeResponse(200, fixture_text("openipf/profile.html"))})
+
+    found = _lookup(session, LookupCache())
+
+    assert found["profile_url"] == profile_url_for("marywatson") and found["meet_history"]
+    assert sorted(session.requests) == [("GET", "maryjanewatson"), ("GET", "marywatson"), ("HEAD", "marywatson")]
+
+
+def test_probe_miss_is_never_downloaded():
+    session = FakeSession({})
+    cache = LookupCache()
+
+    assert _lookup(session, cache) is None
+    assert sorted(session.requests) == [("GET", "maryjanewatson"), ("HEAD", "marywatson")]
+    assert cache.is_miss("maryjanewatson") and cache.is_miss("marywatson")
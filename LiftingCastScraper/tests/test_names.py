@@ -0,0 +1,38 @@
+"""Username guessing, the name index and which of its candidates a lookup may try."""
+
+from liftingcastscraper.opl_ipf.names import NameIndex, merge_guesses, username_candidates, username_matches
+
+
+def test_username_candidates():
+    assert username_candidates("José María García Jr.") == ["josemariagarciajr", "josemariagarcia", "josegarcia"]
+    assert username_candidates("Seán O'Brien") == ["seanobrien"]
+
+
+def test_username_matches_numbered_namesakes():
+    assert username_matches("johnsmith2", "John Smith")
+    assert not username_matches("johnasmith", "John Smith")
+
+
+def test_search_by_name_and_first_last():
+    index = NameIndex()
+    index.add("josegarcia", "José García")
+    index.add("johnasmith", "John A Smith")
+
+    assert [c.username for c in index.search("Jose Garcia")] == ["josegarcia"]
+    assert index.search("Jose Garcia")[0].score == 1.0
+    assert [c.username for c in index.search("John Smith")] == ["johnasmith"]
+    assert index.search("Jon Smith") == []
+
+
+def test_merge_trusts_only_exact_names():
+    index = NameIndex()
+    index.add("garciajose", "José García")  # username not derivable from the name
+    index.add("johnasmith", "John A Smith")
+    index.add("johnsmith2", "John Smith")
+
+    ranked, confident = merge_guesses("Jose Garcia", username_candidates("Jose Garcia"), index.search("Jose Garcia"))
+    assert (ranked[0], confident) == ("garciajose", True)
+
+    # a namesake with a middle name is not this lifter
+    ranked, confident = merge_guesses("John Smith", username_candidates("John Smith"), index.search("John Smith"))
+    assert (ranked, confident) == (["johnsmith2", "johnsmith"], True)
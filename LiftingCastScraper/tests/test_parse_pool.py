@@ -0,0 +1,27 @@
+"""The parse pool returns the same rows as parsing inline, with the text fields interned in this process."""
+
+import asyncio
+
+import pytest
+
+from liftingcastscraper import config
+from liftingcastscraper.opl_ipf import parse_pool
+from liftingcastscraper.opl_ipf.parsers import parse_profile_html
+
+
+@pytest.mark.parametrize("pool", ["off", "thread", "process"])
+def test_pool_matches_inline_parse(pool, monkeypatch, fixture_text):
+    html = fixture_text("openipf/profile.html")
+    monkeypatch.setattr(config, "PARSE_POOL", pool)
+    monkeypatch.setattr(config, "PARSE_POOL_SIZE", 1)
+    inline = parse_profile_html(html, "profile.html")  # interns the strings in this process first
+    parse_pool.shutdown_parse_executor()
+    try:
+        rows = asyncio.run(parse_pool.parse_profile_html_async(html, "profile.html"))
+    finally:
+        parse_pool.shutdown_parse_executor()
+
+    assert rows == inline
+    for row, expected in zip(rows, inline):
+        assert row.federation is expected.federation
+        assert row.equipment is expected.equipment
@@ -0,0 +1,59 @@
+"""Every profile parser backend must turn the same page into the same MeetResult list."""
+
+import pytest
+
+from liftingcastscraper.opl_ipf.parsers import BACKENDS, parse_bs4, parse_display_name, parse_lxml, parse_selectolax
+
+PAGES = ["profile.html", "profile_empty_history.html", "profile_missing_columns.html"]
+ALL_BACKENDS = {"bs4": parse_bs4, "lxml": parse_lxml, "selectolax": parse_selectolax}
+
+
+@pytest.fixture(params=sorted(ALL_BACKENDS))
+def backend(request):
+    if request.param not in BACKENDS:
+        pytest.skip(f"{request.param} is not installed")
+    return ALL_BACKENDS[request.param]
+
+
+@pytest.mark.parametrize("page", PAGES)
+def test_backends_match_bs4(page, backend, fixture_text):
+    html = fixture_text(f"openipf/{page}")
+    assert backend(html, page) == parse_bs4(html, page)
+
+
+def test_profile_rows(fixture_text):
+    rows = parse_bs4(fixture_text("openipf/profile.html"))
+
+    assert [row.date for row in rows] == ["2024-03-09", "2023-06-11", "2022-11-20"]
+    first = rows[0]
+    assert first.competition == "NSW State Championships & Open"
+    assert (first.squat, first.bench, first.deadlift) == ((140.0,), (80.0,), (180.0,))
+    assert (first.total, first.points, first.points_label) == (400.0, 88.12, "GLP")
+    bombed = rows[1]
+    assert bombed.place == "DQ"
+    assert (bombed.squat, bombed.bench, bombed.total) == ((-130.0,), (), None)
+
+
+def test_empty_history(fixture_text):
+    assert parse_bs4(fixture_text("openipf/profile_empty_history.html")) == []
+
+
+def test_missing_columns(fixture_text):
+    rows = parse_bs4(fixture_text("openipf/profile_missing_columns.html"))
+
+    assert [row.bench for row in rows] == [(140.0,), (145.0,)]
+    assert rows[0].squat == rows[0].deadlift == ()
+    assert rows[0].bodyweight is None and rows[0].location == ""
+    assert (rows[0].points_label, rows[0].extra) == ("Dots", {"Tested": "Yes"})
+    # a short row simply lacks the trailing cells
+    assert rows[1].points is None and rows[1].extra is None
+
+
+def test_page_without_tables(backend, fixture_text):
+    with pytest.raises(ValueError, match="No data table"):
+        backend(fixture_text("openipf/no_table.html"), "https://www.openipf.org/u/nobody")
+
+
+def test_display_name(fixture_text):
+    assert parse_display_name(fixture_text("openipf/profile.html")) == "Zoë Ó'Connor-Håkansson"
+    assert parse_display_name(fixture_text("openipf/no_table.html")) is None
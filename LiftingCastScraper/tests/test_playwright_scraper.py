@@ -0,0 +1,77 @@
+"""Roster extraction: one in-page evaluation, its rows mapped to RosterLifter, heavy requests blocked."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from liftingcastscraper import config
+from liftingcastscraper.scraper.liftingcast_api import RosterLifter
+from liftingcastscraper.scraper.playwright_scraper import EXTRACT_ROSTER_JS, _block_heavy, _scrape_in_context
+
+
+class FakePage:
+    def __init__(self, result) -> None:
+        self.result = result
+        self.evaluated = []
+        self.closed = False
+
+    async def route(self, pattern, handler) -> None:
+        pass
+
+    async def goto(self, url, **kwargs) -> None:
+        pass
+
+    async def wait_for_selector(self, selector, **kwargs) -> None:
+        pass
+
+    async def evaluate(self, script, arg):
+        self.evaluated.append((script, arg))
+        return self.result
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+def test_rows_come_from_a_single_evaluation(monkeypatch):
+    monkeypatch.setattr(config, "ROSTER_SETTLE_MS", 50)
+    page = FakePage({"rows": [["12 - Jane Doe", "/meets/m1/lifter/l1", "Open Women"],
+                              ["John Roe", "/meets/m1/lifter/l2", None]],
+                     "polls": 3, "settled": True})
+
+    async def new_page():
+        return page
+
+    rows = asyncio.run(_scrape_in_context(SimpleNamespace(new_page=new_page), "https://liftingcast.com/meets/m1/roster", 30000))
+
+    assert rows == [
+        RosterLifter("12 - Jane Doe", "/meets/m1/lifter/l1", divisions=({"division": "Open Women", "weight_class": None},)),
+        RosterLifter("John Roe", "/meets/m1/lifter/l2"),
+    ]
+    ((script, arg),) = page.evaluated
+    assert script == EXTRACT_ROSTER_JS and arg["settleMs"] == 50 and arg["maxMs"] > 29000
+    assert page.closed
+
+
+class FakeRoute:
+    def __init__(self, resource_type: str, url: str) -> None:
+        self.request = SimpleNamespace(resource_type=resource_type, url=url)
+        self.outcome = None
+
+    async def abort(self) -> None:
+        self.outcome = "abort"
+
+    async def continue_(self) -> None:
+        self.outcome = "continue"
+
+
+@pytest.mark.parametrize("resource_type, url, outcome", [
+    ("image", "https://liftingcast.com/logo.png", "abort"),
+    ("script", "https://www.googletagmanager.com/gtm.js", "abort"),
+    ("script", "https://liftingcast.com/static/app.js", "continue"),
+    ("xhr", "https://couchdb.liftingcast.com/m1/_all_docs", "continue"),
+])
+def test_heavy_requests_are_blocked(resource_type, url, outcome):
+    route = FakeRoute(resource_type, url)
+    asyncio.run(_block_heavy(route))
+    assert route.outcome == outcome
@@ -0,0 +1,71 @@
+"""FetchScheduler: Retry-After handling and per-host rate limiting versus the concurrency cap."""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+from multidict import CIMultiDict, CIMultiDictProxy
+
+from liftingcastscraper.opl_ipf.scheduler import FetchScheduler
+
+
+class FakeResponse:
+    def __init__(self, status: int, headers=None, text: str = "") -> None:
+        self.status = status
+        self.headers = CIMultiDictProxy(CIMultiDict(headers or {}))
+        self._text = text
+
+    async def text(self) -> str:
+        return self._text
+
+
+class FakeSession:
+    """Answers each request with the next queued response; records the URLs asked for."""
+
+    def __init__(self, *responses: FakeResponse) -> None:
+        self.responses = list(responses)
+        self.urls = []
+
+    @asynccontextmanager
+    async def request(self, method, url, **kwargs):
+        self.urls.append(url)
+        yield self.responses.pop(0) if self.responses else FakeResponse(200)
+
+
+def test_headers_are_case_insensitive():
+    session = FakeSession(FakeResponse(200, {"etag": '"abc"'}, "ok"))
+
+    result = asyncio.run(FetchScheduler(max_retries=0).fetch(session, "http://a.example/u/x"))
+
+    assert (result.status, result.text) == (200, "ok")
+    assert result.headers.get("ETag") == '"abc"'
+
+
+def test_lowercase_retry_after_is_honoured(monkeypatch):
+    session = FakeSession(FakeResponse(503, {"retry-after": "0"}), FakeResponse(200))
+    scheduler = FetchScheduler(max_retries=1, rate_per_host=1000, burst=10)
+
+    def backoff(attempt):
+        raise AssertionError("Retry-After was ignored")
+
+    monkeypatch.setattr(scheduler, "_backoff", backoff)
+
+    assert asyncio.run(scheduler.fetch(session, "http://a.example/u/x")).status == 200
+    assert len(session.urls) == 2
+
+
+def test_rate_limited_host_does_not_hold_slots():
+    # one slot; host a has used its only token, so its next request waits ~2 s for a refill
+    scheduler = FetchScheduler(max_concurrency=1, rate_per_host=0.5, burst=1, max_retries=0)
+    session = FakeSession()
+
+    async def run():
+        await scheduler.fetch(session, "http://a.example/1")
+        throttled = asyncio.ensure_future(scheduler.fetch(session, "http://a.example/2"))
+        await asyncio.sleep(0.01)
+        other = await asyncio.wait_for(scheduler.fetch(session, "http://b.example/1"), timeout=1.0)
+        assert not throttled.done()
+        throttled.cancel()
+        return other
+
+    assert asyncio.run(run()).status == 200
+    assert session.urls == ["http://a.example/1", "http://b.example/1"]
@@ -0,0 +1,84 @@
+"""SingleFlight: sharing one task, and cancelling it only with its last waiter."""
+
+import asyncio
+
+import pytest
+
+from liftingcastscraper.singleflight import SingleFlight
+
+
+def test_concurrent_callers_share_one_call():
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "people"
+
+    async def run():
+        flight = SingleFlight("test")
+        results = await asyncio.gather(*(flight.do("meet", work) for _ in range(3)))
+        return results, flight.stats()
+
+    results, stats = asyncio.run(run())
+    assert results == ["people"] * 3 and calls == [1]
+    assert stats == {"in_flight": 0, "started": 1, "shared": 2}
+
+
+def test_exception_reaches_every_waiter():
+    async def work():
+        await asyncio.sleep(0.01)
+        raise ValueError("no roster")
+
+    async def run():
+        flight = SingleFlight("test")
+        return await asyncio.gather(flight.do("meet", work), flight.do("meet", work), return_exceptions=True)
+
+    assert [str(error) for error in asyncio.run(run())] == ["no roster", "no roster"]
+
+
+def test_cancelled_waiter_leaves_the_work_to_the_others():
+    async def run():
+        flight = SingleFlight("test")
+        gate = asyncio.Event()
+
+        async def work():
+            await gate.wait()
+            return "people"
+
+        leaving = asyncio.ensure_future(flight.do("meet", work))
+        staying = asyncio.ensure_future(flight.do("meet", work))
+        await asyncio.sleep(0)
+        leaving.cancel()
+        await asyncio.sleep(0)
+        gate.set()
+        return leaving, await staying
+
+    leaving, result = asyncio.run(run())
+    assert leaving.cancelled() and result == "people"
+
+
+def test_last_waiter_cancels_the_work_and_a_new_caller_starts_afresh():
+    async def run():
+        flight = SingleFlight("test")
+        started = []
+
+        async def work():
+            started.append(1)
+            await asyncio.sleep(10)
+
+        only = asyncio.ensure_future(flight.do("meet", work))
+        await asyncio.sleep(0)
+        only.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await only
+        in_flight = "meet" in flight
+
+        async def quick():
+            return "fresh"
+
+        return in_flight, await flight.do("meet", quick), started
+
+    in_flight, result, started = asyncio.run(run())
+    assert not in_flight
+    assert (result, started) == ("fresh", [1])
@@ -0,0 +1,54 @@
+"""SnapshotStore round trips and the incremental refresh in iter_people."""
+
+import asyncio
+
+from liftingcastscraper import config, pipeline
+from liftingcastscraper.models import Lifter, MeetResult
+from liftingcastscraper.snapshots import REFRESHED, REUSED, SnapshotStore, reusable
+
+MEET = "https://liftingcast.com/meets/m1/roster"
+JANE = Lifter(
+    name="Jane Doe",
+    liftingcast_href="https://liftingcast.com/meets/m1/lifters/l1/info",
+    opl_profile="https://www.openipf.org/u/janedoe",
+    opl_summary=[MeetResult(place="1", total=600.0)],
+)
+
+
+def test_snapshot_survives_restart(tmp_path):
+    path = str(tmp_path / "snapshots.sqlite")
+    store = SnapshotStore(path=path)
+    store.put(MEET, [JANE, None])
+    store.close()
+
+    snapshot = SnapshotStore(path=path).get(MEET)
+
+    assert reusable(snapshot, "Jane Doe", JANE.liftingcast_href) == JANE
+    assert reusable(snapshot, "Jane Smith", JANE.liftingcast_href) is None  # renamed
+
+
+def test_iter_people_reuses_unchanged_lifters(monkeypatch):
+    store = SnapshotStore()
+    store.put(MEET, [JANE])
+    looked_up = []
+
+    async def fake_lookup(name, session):
+        looked_up.append(name)
+        return None
+
+    monkeypatch.setattr(pipeline, "get_snapshot_store", lambda: store)
+    monkeypatch.setattr(pipeline, "get_bulk_index", lambda: None)
+    monkeypatch.setattr(pipeline, "try_fetch_openipf", fake_lookup)
+    monkeypatch.setattr(config, "ANALYTICS_ENABLED", False)
+    roster = [("Jane Doe", JANE.liftingcast_href), ("John Roe", "https://liftingcast.com/meets/m1/lifters/l2/info")]
+
+    async def run():
+        return [event async for event in pipeline.iter_people(MEET, roster=roster, session=object())]
+
+    events = asyncio.run(run())
+
+    people = {e["index"]: e["person"] for e in events if e["type"] == "lifter"}
+    assert looked_up == ["John Roe"]
+    assert (people[0].lookup, people[1].lookup) == (REUSED, REFRESHED)
+    assert events[-1] == {"type": "done", "total": 2, "reused": 1, "refreshed": 1}
+    assert set(store.get(MEET)) == {JANE.liftingcast_href, roster[1][1]}
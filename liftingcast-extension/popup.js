@@ -2,6 +2,9 @@ const API_BASE = "https://liftingcastscraper.onrender.com";
 
 const STORAGE_KEY = "liftingcast_state_v1";
 
+// meet-row keys the history table and the latest-meet line read
+const HISTORY_FIELDS = ["Competition", "Date", "Class", "Weight", "Total", "GLP", "Squat", "Bench", "Deadlift"];
+
 const FEMALE_CLASSES = ["47", "52", "57", "63", "69", "76", "84", "84+"];
 const MALE_CLASSES   = ["59", "66", "74", "83", "93", "105", "120", "120+"];
 
@@ -154,6 +157,7 @@ function loadStateFromStorage() {
 
 const validClasses = [...FEMALE_CLASSES, ...MALE_CLASSES];
 
+function getWeightClass(meet) {
   const raw =
     meet.Class ||
     meet.WeightClassKg ||
@@ -167,6 +171,7 @@ const validClasses = [...FEMALE_CLASSES, ...MALE_CLASSES];
   if (!validClasses.includes(cls)) return null; 
 
   return cls;
+}
 
 function getBodyweight(meet) {
   const w =
@@ -201,6 +206,11 @@ function guessGenderFromClass(cls) {
 
 function annotateGenderForPeople() {
   state.people.forEach((p) => {
+    // the server already inferred it (division name, then classes)
+    if (p.analytics && p.analytics.sex) {
+      p.gender = p.analytics.sex.toLowerCase();
+      return;
+    }
     let gender = null;
     (p.opl_summary || []).some((meet) => {
       const g = guessGenderFromClass(getWeightClass(meet));
@@ -237,15 +247,21 @@ function sortWeightClasses(classes, gender) {
 /* ---------- API & state ---------- */
 
 async function fetchReport(meetUrl) {
-  setStatus("Fetching data…");
+  setStatus("Fetching roster…");
   document.getElementById("controls").classList.add("hidden");
   document.getElementById("results").innerHTML = "";
 
   try {
-    const resp = await fetch(`${API_BASE}/api/report`, {
+    // NDJSON stream: roster first, then one "lifter" event per lookup as it resolves
+    const resp = await fetch(`${API_BASE}/api/report/stream`, {
       method: "POST",
       headers: { "Content-Type": "application/json" },
-      body: JSON.stringify({ meet_url: meetUrl })
+      // only what the popup shows: smaller lifter events over the venue's mobile data
+      body: JSON.stringify({
+        meet_url: meetUrl,
+        fields: ["name", "liftingcast_href", "opl_profile", "opl_summary", "analytics"],
+        history_fields: HISTORY_FIELDS
+      })
     });
 
     if (!resp.ok) {
@@ -253,8 +269,23 @@ async function fetchReport(meetUrl) {
       throw new Error(`Backend error (${resp.status}): ${text}`);
     }
 
-    const data = await resp.json();
-    state.people = data.people || [];
+    state.people = [];
+    const reader = resp.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = "";
+
+    while (true) {
+      const { value, done } = await reader.read();
+      if (done) break;
+
+      buffer += decoder.decode(value, { stream: true });
+      const lines = buffer.split("\n");
+      buffer = lines.pop();
+
+      for (const line of lines) {
+        if (line.trim()) handleReportEvent(JSON.parse(line));
+      }
+    }
 
     annotateGenderForPeople();
 
@@ -275,6 +306,38 @@ async function fetchReport(meetUrl) {
   }
 }
 
+function handleReportEvent(event) {
+  switch (event.type) {
+    case "roster":
+      // placeholders so lifters keep roster order while lookups finish out of order
+      state.people = event.lifters.map((l) => ({
+        name: l.name,
+        liftingcast_href: l.liftingcast_href,
+        opl_profile: null,
+        opl_summary: null,
+        pending: true
+      }));
+      renderRoster();
+      setStatus(`Found ${event.total} athletes, looking them up…`);
+      break;
+    case "lifter":
+      state.people[event.index] = event.person;
+      renderStreamedCard(event.index);
+      break;
+    case "progress":
+      setStatus(`Looked up ${event.done}/${event.total} athletes…`);
+      break;
+    case "analytics":
+      // bests, points and class ranks, computed server-side once everyone is in
+      for (const entry of event.lifters) {
+        if (state.people[entry.index]) state.people[entry.index].analytics = entry.analytics;
+      }
+      break;
+    case "error":
+      throw new Error(event.detail);
+  }
+}
+
 /* ---------- filters & rendering ---------- */
 
 function rebuildWeightFilter() {
@@ -367,6 +430,39 @@ function buildLatestSummary(meets) {
   return div;
 }
 
+function buildStatsLine(a) {
+  const parts = [
+    `Best: ${a.best_squat ?? "–"} / ${a.best_bench ?? "–"} / ${a.best_deadlift ?? "–"} (${a.best_total ?? "–"})`
+  ];
+  if (a.recent_total != null) parts.push(`Recent: ${a.recent_total}`);
+  if (a.ipf_gl != null) parts.push(`GL: ${a.ipf_gl}`);
+  if (a.dots != null) parts.push(`DOTS: ${a.dots}`);
+  if (a.trend_kg_per_year != null) {
+    parts.push(`Trend: ${a.trend_kg_per_year > 0 ? "+" : ""}${a.trend_kg_per_year} kg/yr`);
+  }
+  if (a.class_rank) parts.push(`#${a.class_rank}/${a.class_size} at ${a.weight_class}`);
+
+  const div = document.createElement("div");
+  div.className = "latest-meet";
+  div.textContent = parts.join(" | ");
+  return div;
+}
+
+// While the stream runs the filters are hidden: every roster entry gets a card in
+// roster order, and each one is swapped in place as its lookup resolves.
+function renderRoster() {
+  const container = document.getElementById("results");
+  container.innerHTML = "";
+  state.people.forEach((p, idx) => {
+    container.appendChild(renderPersonCard(p, idx));
+  });
+}
+
+function renderStreamedCard(index) {
+  const card = document.getElementById("results").children[index];
+  if (card) card.replaceWith(renderPersonCard(state.people[index], index));
+}
+
 function renderPersonCard(person, index) {
   const div = document.createElement("div");
   div.className = "person";
@@ -406,9 +502,13 @@ function renderPersonCard(person, index) {
     if (summary) div.appendChild(summary);
   }
 
+  if (person.analytics) {
+    div.appendChild(buildStatsLine(person.analytics));
+  }
+
   if (!hasSummary) {
     const noData = document.createElement("div");
-    noData.textContent = "No OpenIPF data found.";
+    noData.textContent = person.pending ? "Looking up…" : "No OpenIPF data found.";
     noData.style.fontSize = "12px";
     noData.style.marginTop = "4px";
     div.appendChild(noData);